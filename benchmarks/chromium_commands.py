@@ -0,0 +1,55 @@
+"""
+Chromium driver command throughput benchmark.
+
+It sends a burst of `ping` commands using Chromium driver with and without command batching
+and prints commands per second for each mode.
+
+Usage::
+
+    python benchmarks/chromium_commands.py [COMMAND_COUNT]
+
+"""
+import sys
+from asyncio import gather, get_event_loop, sleep
+from os import path
+from time import perf_counter
+
+from whalesong import Whalesong
+from whalesong.driver_chromium import WhalesongDriver
+
+PROFILE_DIR = path.join(path.dirname(__file__), 'profile-chromium')
+
+
+async def run_benchmark(batch_commands: bool, count: int, loop=None):
+    driver = WhalesongDriver(profile=PROFILE_DIR,
+                             headless=True,
+                             batch_commands=batch_commands,
+                             loop=loop)
+    whalesong = Whalesong(driver=driver, loop=loop)
+
+    await whalesong.start()
+
+    try:
+        # Warming up
+        await sleep(2)
+        await gather(*[driver.execute_command('ping') for _ in range(10)])
+
+        start = perf_counter()
+        await gather(*[driver.execute_command('ping') for _ in range(count)])
+        elapsed = perf_counter() - start
+    finally:
+        await whalesong.stop()
+
+    print('Batch commands: {:<5} | {} commands in {:.3f} seconds | {:.1f} commands/second'.format(
+        str(batch_commands), count, elapsed, count / elapsed
+    ))
+
+
+async def main(count: int, loop=None):
+    await run_benchmark(False, count, loop=loop)
+    await run_benchmark(True, count, loop=loop)
+
+
+if __name__ == '__main__':
+    loop = get_event_loop()
+    loop.run_until_complete(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000, loop=loop))
@@ -0,0 +1,77 @@
+"""
+Message class dispatch benchmark.
+
+It decodes a stream of mixed-type messages and prints messages per second for:
+
+* Class dispatch only, using legacy lookup (raw value, then enum) and current table lookup.
+* Full decoding using regular models and fast models.
+
+It does not need a browser.
+
+Usage::
+
+    python benchmarks/message_dispatch.py [MESSAGE_COUNT]
+
+"""
+import sys
+from itertools import cycle, islice
+from time import perf_counter
+
+from whalesong.fast_models import map_fast_model
+from whalesong.managers.message import BaseMessage, MessageTypes
+
+MESSAGE_SAMPLES = [
+    {'id': 'true_34600000000@c.us_3EB0000000000001', 'type': 'chat', 'body': 'Hello', 't': 1546300800},
+    {'id': 'true_34600000000@c.us_3EB0000000000002', 'type': 'image', 'caption': 'Photo', 't': 1546300801,
+     'mimetype': 'image/jpeg', 'size': 102400},
+    {'id': 'true_34600000000@c.us_3EB0000000000003', 'type': 'ptt', 't': 1546300802, 'duration': '5'},
+    {'id': 'true_34600000000@c.us_3EB0000000000004', 'type': 'sticker', 't': 1546300803},
+    {'id': 'true_34600000000@c.us_3EB0000000000005', 'type': 'location', 't': 1546300804,
+     'lat': 40.4, 'lng': -3.7},
+    {'id': 'true_34600000000@c.us_3EB0000000000006', 'type': 'document', 't': 1546300805,
+     'filename': 'file.pdf'},
+    {'id': 'true_34600000000@c.us_3EB0000000000007', 'type': 'gp2', 't': 1546300806, 'subtype': 'add'},
+]
+
+
+def legacy_message_class(message_type):
+    message_classes = BaseMessage.__message_classes__
+    try:
+        return message_classes[message_type]
+    except KeyError:
+        try:
+            return message_classes[MessageTypes(message_type)]
+        except KeyError:
+            return BaseMessage
+
+
+def run(name, fn, messages):
+    start = perf_counter()
+    for msg in messages:
+        fn(msg)
+    elapsed = perf_counter() - start
+
+    print('{:<16} | {} messages in {:.3f} seconds | {:.0f} messages/second'.format(
+        name, len(messages), elapsed, len(messages) / elapsed
+    ))
+
+
+def main(count: int):
+    messages = [dict(msg) for msg in islice(cycle(MESSAGE_SAMPLES), count)]
+
+    # Legacy registry was keyed only by enum, so raw lookups always missed.
+    enum_only = {k: v for k, v in BaseMessage.__message_classes__.items() if isinstance(k, MessageTypes)}
+    legacy_classes = BaseMessage.__message_classes__
+    BaseMessage.__message_classes__ = enum_only
+    try:
+        run('legacy dispatch', lambda msg: legacy_message_class(msg['type']), messages)
+    finally:
+        BaseMessage.__message_classes__ = legacy_classes
+
+    run('table dispatch', lambda msg: BaseMessage.get_message_class(msg['type']), messages)
+    run('regular models', BaseMessage, messages)
+    run('fast models', lambda msg: map_fast_model(BaseMessage, msg), messages)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
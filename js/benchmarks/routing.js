@@ -0,0 +1,146 @@
+/**
+ * Command routing benchmark.
+ *
+ * It compares legacy recursive routing (split, shift and join on each level, and item
+ * lookup after a failed static submanager lookup) with current routing (a single split, and
+ * item lookup without a failed lookup first), using deep command paths like the ones Whalesong
+ * sends. Every command has unique item identifiers, like real traffic does.
+ *
+ * Most of the difference comes from collection managers, which do not build and throw
+ * a `ManagerNotFound` error before looking for an item anymore.
+ *
+ * Usage:
+ *
+ *    npm run benchmark -- [ITERATIONS]
+ */
+import {
+  CommandManager,
+  COMMAND_SEPARATOR
+} from '../src/manager.js';
+import {
+  CommandNotFound,
+  ManagerNotFound
+} from '../src/errors.js';
+
+
+class MessageManager extends CommandManager {
+  constructor(id) {
+    super();
+    this.id = id;
+    this.commands = {
+      'star': {
+        'type': 'command'
+      }
+    };
+  }
+
+  async star() {
+    return this.id;
+  }
+}
+
+class ItemsManager extends CommandManager {
+  constructor(buildFn) {
+    super();
+    this.items = {};
+    this.buildFn = buildFn;
+  }
+
+  getSubmanager(name) {
+    if (name in this.submanagers) {
+      return super.getSubmanager(name);
+    }
+    return this.getItemManager(name);
+  }
+
+  getItemManager(id) {
+    // Items are not kept, so every command resolves a new one.
+    return this.buildFn(id);
+  }
+}
+
+function legacyGetSubmanager(manager, name) {
+  if (!(manager instanceof ItemsManager)) {
+    return manager.getSubmanager(name);
+  }
+
+  try {
+    let submanager = manager.submanagers[name];
+    if (!submanager) {
+      throw new ManagerNotFound(name);
+    }
+    return submanager;
+  } catch (err) {
+    return manager.getItemManager(name);
+  }
+}
+
+class ChatManager extends CommandManager {
+  constructor(id) {
+    super();
+    this.id = id;
+    this.addSubmanager('msgs', new ItemsManager((msgId) => new MessageManager(msgId)));
+  }
+}
+
+async function legacyExecuteCommand(manager, command, params) {
+  if (command.indexOf(COMMAND_SEPARATOR) >= 0) {
+    let deco = command.split(COMMAND_SEPARATOR);
+    let submanager = deco.shift(),
+      cmd = deco.join(COMMAND_SEPARATOR);
+
+    return await legacyExecuteCommand(legacyGetSubmanager(manager, submanager), cmd, params);
+  }
+
+  if (!(command in manager.commands)) {
+    throw new CommandNotFound(command);
+  }
+
+  return await manager[command](params);
+}
+
+function buildCommands(chatCount, msgCount, seed) {
+  let commands = [];
+  for (let i = 0; i < chatCount; i++) {
+    let chatId = `34${String(seed).padStart(5, '0')}${String(i).padStart(4, '0')}@c.us`;
+    for (let j = 0; j < msgCount; j++) {
+      let msgId = `true_${chatId}_3EB0${(i * msgCount + j).toString(16).toUpperCase().padStart(16, '0')}`;
+      commands.push(['chats', chatId, 'msgs', msgId, 'star'].join(COMMAND_SEPARATOR));
+    }
+  }
+  return commands;
+}
+
+async function run(name, fn, iterations) {
+  let count = 0;
+  let elapsed = 0;
+
+  for (let it = 0; it < iterations; it++) {
+    // Commands are built out of timing, and they are never repeated.
+    let commands = buildCommands(20, 40, it);
+    let start = process.hrtime.bigint();
+
+    for (let i = 0; i < commands.length; i++) {
+      await fn(commands[i]);
+    }
+
+    elapsed += Number(process.hrtime.bigint() - start) / 1e9;
+    count += commands.length;
+  }
+
+  console.log(`${name.padEnd(10)} | ${count} commands in ${elapsed.toFixed(3)} seconds | ` +
+    `${(count / elapsed).toFixed(0)} commands/second`);
+}
+
+async function main(iterations) {
+  let root = new CommandManager();
+  root.addSubmanager('chats', new ItemsManager((chatId) => new ChatManager(chatId)));
+
+  // Warming up
+  await run('warmup', (cmd) => root.executeCommand(cmd, {}), 1);
+
+  await run('legacy', (cmd) => legacyExecuteCommand(root, cmd, {}), iterations);
+  await run('current', (cmd) => root.executeCommand(cmd, {}), iterations);
+}
+
+main(parseInt(process.argv[2] || '100', 10));
@@ -9,15 +9,119 @@ import {
 export const ResultTypes = {
   ERROR: 'ERROR',
   FINAL: 'FINAL',
-  PARTIAL: 'PARTIAL'
+  PARTIAL: 'PARTIAL',
+  RELATED: 'RELATED',
+  DROPPED: 'DROPPED'
 }
 
 export const COMMAND_SEPARATOR = '|';
 
+export const RESULTS_BATCH_SIZE = 500;
+
+/**
+ * Maximum number of partial results held for a paused execution. When it is reached,
+ * oldest partial results are dropped.
+ */
+export const HELD_RESULTS_LIMIT = 1000;
+
+/**
+ * Parse a command path once: submanager path and command name.
+ */
+export function parseRoute(command) {
+  let path = command.split(COMMAND_SEPARATOR);
+  let name = path.pop();
+
+  return {
+    'path': path,
+    'command': name
+  };
+}
+
 export class ResultManager {
 
   constructor() {
     this._results = [];
+    this._waiters = [];
+    this._buffer = [];
+    this._flushScheduled = false;
+    this._related = null;
+    this._held = new Map();
+    this._running = new Set();
+  }
+
+  /**
+   * Register a running execution. Only running executions could be paused.
+   */
+  start(exId) {
+    this._running.add(exId);
+  }
+
+  /**
+   * Hold results of an execution until it is resumed (flow control).
+   */
+  pause(exId) {
+    if (this._running.has(exId) && !this._held.has(exId)) {
+      this._held.set(exId, {
+        'results': [],
+        'dropped': 0
+      });
+    }
+  }
+
+  /**
+   * Release held results of an execution. Number of dropped results is sent before them.
+   */
+  resume(exId) {
+    let held = this._held.get(exId);
+    if (!held) {
+      return;
+    }
+
+    this._held.delete(exId);
+    if (held.dropped) {
+      this._pushResult({
+        'exId': exId,
+        'type': ResultTypes.DROPPED,
+        'params': {
+          'count': held.dropped
+        }
+      });
+    }
+    held.results.forEach((data) => this._pushResult(data));
+  }
+
+  /**
+   * Register a related object (on normalized payloads). Each object is sent once per results batch,
+   * before results which reference it. Object is only mapped the first time it is registered.
+   */
+  addRelated(kind, id, mapFn) {
+    if (!this._related) {
+      this._related = {};
+    }
+
+    let items = this._related[kind];
+    if (!items) {
+      items = this._related[kind] = {};
+    }
+
+    if (!(id in items)) {
+      items[id] = mapFn();
+    }
+  }
+
+  _drainRelated(results) {
+    if (!this._related) {
+      return results;
+    }
+
+    let related = this._related;
+    this._related = null;
+
+    return [{
+      'exId': null,
+      'type': ResultTypes.RELATED,
+      'params': related
+    }].concat(results);
   }
 
   setResult(exId, type, params) {
@@ -27,11 +131,87 @@ export class ResultManager {
       'params': params || {}
     }
 
-    if (window.whalesongPushResult !== undefined) {
-      window.whalesongPushResult(data);
+    if (type !== ResultTypes.PARTIAL) {
+      this._running.delete(exId);
+    }
+
+    let held = this._held.get(exId);
+    if (held) {
+      if (type === ResultTypes.PARTIAL) {
+        held.results.push(data);
+        if (held.results.length > HELD_RESULTS_LIMIT) {
+          held.results.shift();
+          held.dropped++;
+        }
+        return;
+      }
+
+      // Execution finished: held results and final one are released, so consumer always gets end.
+      held.results.push(data);
+      this.resume(exId);
+      return;
+    }
+
+    this._pushResult(data);
+  }
+
+  _pushResult(data) {
+    if (window.whalesongPushResults !== undefined) {
+      this._buffer.push(data);
+
+      if (this._buffer.length >= RESULTS_BATCH_SIZE) {
+        this.flush();
+      } else if (!this._flushScheduled) {
+        this._flushScheduled = true;
+        Promise.resolve().then(() => this.flush());
+      }
     } else {
       this._results.push(data);
+      this._wakeWaiters();
+    }
+  }
+
+  flush() {
+    this._flushScheduled = false;
+
+    if (!this._buffer.length) {
+      return;
     }
+
+    let results = this._drainRelated(this._buffer);
+    this._buffer = [];
+    window.whalesongPushResults(results);
+  }
+
+  _wakeWaiters() {
+    if (!this._waiters.length) {
+      return;
+    }
+
+    let waiters = this._waiters;
+    this._waiters = [];
+    // Wait until end of current task in order to collect results produced at same time.
+    setTimeout(() => waiters.forEach((resolve) => resolve()), 0);
+  }
+
+  waitResults(timeout) {
+    if (this._results.length) {
+      return Promise.resolve();
+    }
+
+    return new Promise((resolve) => {
+      let timer = setTimeout(() => {
+        this._waiters = this._waiters.filter((item) => item !== wake);
+        resolve();
+      }, timeout);
+
+      let wake = () => {
+        clearTimeout(timer);
+        resolve();
+      };
+
+      this._waiters.push(wake);
+    });
   }
 
   setFinalResult(exId, params) {
@@ -47,7 +227,12 @@ export class ResultManager {
   }
 
   getResults() {
-    let results = this._results;
+    if (!this._results.length) {
+      // Related objects are sent with results which reference them (pushed results are flushed later).
+      return [];
+    }
+
+    let results = this._drainRelated(this._results);
     this._results = [];
     return results;
   }
@@ -58,9 +243,18 @@ export class Monitor {
     this.obj = obj;
     this.evt = evt;
     this.mapFn = mapFn;
+    this.predicate = null;
     this.promise = new Promise(resolve => this._resolveFunc = resolve);
   }
 
+  /**
+   * Set a predicate on event's first argument. Events which do not match are discarded before mapping.
+   */
+  where(predicate) {
+    this.predicate = predicate;
+    return this;
+  }
+
   mapEventResult(...args) {
     if (this.mapFn) {
       return this.mapFn(...args);
@@ -71,6 +265,10 @@ export class Monitor {
   }
 
   handler(partialResult, ...args) {
+    if (this.predicate && !this.predicate(args[0])) {
+      return;
+    }
+
     let result = this.mapEventResult(...args);
 
     if (result) {
@@ -106,8 +304,9 @@ export class Monitor {
 
 
 export class MonitorManager {
-  constructor() {
+  constructor(resultManager) {
     this.monitors = {};
+    this.resultManager = resultManager;
   }
 
   addMonitor(exId, monitor) {
@@ -121,6 +320,9 @@ export class MonitorManager {
 
     this.monitors[exId].stopMonitor();
     delete this.monitors[exId];
+    if (this.resultManager) {
+      this.resultManager.resume(exId);
+    }
     return true;
   }
 }
@@ -130,6 +332,9 @@ export class Iterator {
 
   constructor(fn) {
     this.fn = fn;
+
+    // Cursor to resume iteration. It is sent after last item when it is set.
+    this.cursor = null;
   }
 
   static fromArray(arr, mapFn) {
@@ -146,6 +351,11 @@ export class Iterator {
     await Promise.resolve(this.fn((item) => partialResult({
       'item': item
     })));
+    if (this.cursor) {
+      partialResult({
+        'cursor': this.cursor
+      });
+    }
     throw new StopIterator();
   }
 }
@@ -206,22 +416,18 @@ export class CommandManager {
   }
 
   async executeCommand(command, params) {
+    let route = parseRoute(command);
+    let manager = this;
 
-    if (command.indexOf(COMMAND_SEPARATOR) >= 0) {
-      let deco = command.split(COMMAND_SEPARATOR);
-      let manager = deco.shift(),
-        cmd = deco.join(COMMAND_SEPARATOR);
-
-      manager = this.getSubmanager(manager);
-
-      return await manager.executeCommand(cmd, params);
+    for (let i = 0; i < route.path.length; i++) {
+      manager = manager.getSubmanager(route.path[i]);
     }
 
-    if (!(command in this.commands)) {
-      throw new CommandNotFound(command);
+    if (!(route.command in manager.commands)) {
+      throw new CommandNotFound(route.command);
     }
 
-    return await this[command](params);
+    return await manager[route.command](params);
   }
 
   @command
@@ -245,9 +451,32 @@ export default class MainManager extends CommandManager {
     super();
     this.resultManager = new ResultManager();
     this.monitorManager = new MonitorManager(this.resultManager);
+    this.normalized = false;
   }
 
   poll(newExecutions) {
+    let errors = this.runExecutions(newExecutions);
+
+    return {
+      'results': this.resultManager.getResults(),
+      'errors': errors
+    }
+  }
+
+  async longPoll(newExecutions, holdTime) {
+    let errors = this.runExecutions(newExecutions);
+
+    if (!errors.length) {
+      await this.resultManager.waitResults(holdTime);
+    }
+
+    return {
+      'results': this.resultManager.getResults(),
+      'errors': errors
+    }
+  }
+
+  runExecutions(newExecutions) {
     let errors = [];
     if (newExecutions) {
       for (let idx in newExecutions) {
@@ -280,13 +509,11 @@ export default class MainManager extends CommandManager {
       }
     }
 
-    return {
-      'results': this.resultManager.getResults(),
-      'errors': errors
-    }
+    return errors;
   }
 
   async executeCommand(exId, command, params) {
+    this.resultManager.start(exId);
     try {
       console.log(exId, command, params);
       let result = await super.executeCommand(
@@ -328,6 +555,27 @@ export default class MainManager extends CommandManager {
     return this.monitorManager.removeMonitor(monitorId);
   }
 
+  @command
+  async pauseResult({
+    exId
+  }) {
+    this.resultManager.pause(exId);
+  }
+
+  @command
+  async resumeResult({
+    exId
+  }) {
+    this.resultManager.resume(exId);
+  }
+
+  @command
+  async setNormalizedPayloads({
+    enabled
+  }) {
+    this.normalized = !!enabled;
+  }
+
   @command
   async ping() {
     return 'pong';
@@ -3,7 +3,8 @@ import {
 } from '../manager.js';
 import {
   CollectionManager,
-  ModelManager
+  ModelManager,
+  mapFields
 } from './common.js';
 import {
   MessageManager,
@@ -33,20 +34,22 @@ import b64toblob from 'b64-to-blob';
 
 export class MsgLoadStateManager extends ModelManager {}
 
+const CHAT_FIELDS = {
+  id: (item) => item.id._serialized,
+  kind: (item) => item.kind,
+  isGroup: (item) => item.isGroup,
+  contact: (item) => item.contact ? ContactManager.mapModel(item.contact) : null,
+  groupMetadata: (item) => item.groupMetadata ? GroupMetadataManager.mapModel(item.groupMetadata) : null,
+  lastReceivedKey: (item) => item.lastReceivedKey ? item.lastReceivedKey._serialized : null,
+  msgs: () => null,
+  mute: (item) => MuteManager.mapModel(item.mute),
+  liveLocationQueried: (item) => item.liveLocationQueried
+};
+
 export class ChatManager extends ModelManager {
 
-  static mapModel(item) {
-    return Object.assign(ModelManager.mapModel(item), {
-      id: item.id._serialized,
-      kind: item.kind,
-      isGroup: item.isGroup,
-      contact: item.contact ? ContactManager.mapModel(item.contact) : null,
-      groupMetadata: item.groupMetadata ? GroupMetadataManager.mapModel(item.groupMetadata) : null,
-      lastReceivedKey: item.lastReceivedKey ? item.lastReceivedKey._serialized : null,
-      msgs: null,
-      mute: MuteManager.mapModel(item.mute),
-      liveLocationQueried: item.liveLocationQueried
-    });
+  static mapModel(item, fields) {
+    return mapFields(ModelManager.mapModel(item, fields), item, fields, CHAT_FIELDS);
   }
 
   constructor(model, sendTextMsgToChat, seenManagement) {
@@ -57,17 +60,21 @@ export class ChatManager extends ModelManager {
 
     this.addSubmanager('msgs', new MessageCollectionManager(model.msgs));
     this.addSubmanager('msgLoadState', new MsgLoadStateManager(model.msgs.msgLoadState));
-    try {
-      this.addSubmanager('metadata', new GroupMetadataManager(this.model.groupMetadata));
-    } catch (err) {}
 
     this.addSubmanager('presence', new PresenceManager(this.model.presence));
     this.addSubmanager('contact', new ContactManager(this.model.contact));
     this.addSubmanager('mute', new MuteManager(this.model.mute));
+  }
 
-    if (this.model.liveLocation) {
-      this.addSubmanager('liveLocation', new LiveLocationManager(this.model.liveLocation));
+  getSubmanager(name) {
+    // Chat managers are cached, so these related models could change after manager was built.
+    if (name === 'metadata') {
+      this.syncSubmanager(name, this.model.groupMetadata, (model) => new GroupMetadataManager(model));
+    } else if (name === 'liveLocation') {
+      this.syncSubmanager(name, this.model.liveLocation, (model) => new LiveLocationManager(model));
     }
+
+    return super.getSubmanager(name);
   }
 
   async _sendMessage(send_fn, check_fn) {
@@ -187,13 +194,20 @@ export class ChatManager extends ModelManager {
   @command
   async sendMedia({
     mediaData,
+    uploadId,
     contentType,
     filename,
     caption,
     quotedMsgId,
     mentions
   }) {
-    let mediaBlob = b64toblob(mediaData, contentType);
+    let mediaBlob;
+
+    if (uploadId) {
+      mediaBlob = manager.getSubmanager('uploads').popBlob(uploadId, contentType);
+    } else {
+      mediaBlob = b64toblob(mediaData, contentType);
+    }
 
     if (filename) {
       mediaBlob = new File([mediaBlob], filename, {
@@ -376,7 +390,6 @@ export class ChatManager extends ModelManager {
   async findLiveLocation() {
     if (!this.model.liveLocation) {
       await manager.getSubmanager('liveLocations').findItem(this.model.id);
-      this.addSubmanager('liveLocation', new LiveLocationManager(this.model.liveLocation));
     }
 
     return LiveLocationManager.mapModel(this.model.liveLocation);
@@ -5,10 +5,49 @@ import {
   Iterator,
   Monitor
 } from '../manager.js';
+import {
+  ManagerNotFound
+} from '../errors.js';
 import {
   ModelNotFound
 } from './errors.js';
+import {
+  paginate
+} from './pagination.js';
+import {
+  compileFilter
+} from './filters.js';
+
+
+/**
+ * Keep only projected fields of mapped data. If there is no projection, data is returned as is.
+ */
+export function selectFields(data, fields) {
+  if (!fields || !data) {
+    return data;
+  }
+
+  let result = {};
+  for (let i = 0; i < fields.length; i++) {
+    if (fields[i] in data) {
+      result[fields[i]] = data[fields[i]];
+    }
+  }
+  return result;
+}
 
+/**
+ * Set computed fields on mapped data. If there is a projection, fields which are not
+ * projected are not computed, so expensive nested objects are not mapped.
+ */
+export function mapFields(data, item, fields, mappers) {
+  for (let key in mappers) {
+    if (!fields || fields.indexOf(key) >= 0) {
+      data[key] = mappers[key](item);
+    }
+  }
+  return data;
+}
 
 export class BaseFieldMonitor extends Monitor {
 
@@ -76,18 +115,57 @@ export class ModelManager extends CommandManager {
     this.model = model;
   }
 
-  static mapModel(item) {
-    return item.toJSON();
+  static mapModel(item, fields) {
+    return selectFields(item.toJSON(), fields);
+  }
+
+  /**
+   * Map a model applying a field projection.
+   */
+  static mapModelFields(item, fields) {
+    if (!fields) {
+      return this.mapModel(item);
+    }
+
+    fields = this.expandFields(fields);
+    return selectFields(this.mapModel(item, fields), fields);
+  }
+
+  /**
+   * Fields needed to build a projection, besides projected ones.
+   */
+  static expandFields(fields) {
+    return fields;
+  }
+
+  /**
+   * Keep a submanager in sync with a related model, which could be loaded or replaced
+   * after manager was built.
+   */
+  syncSubmanager(name, model, buildFn) {
+    if (!model) {
+      delete this.submanagers[name];
+      return;
+    }
+
+    let submanager = this.submanagers[name];
+    if (!submanager || submanager.model !== model) {
+      this.addSubmanager(name, buildFn(model));
+    }
   }
 
   @command
-  async getModel() {
-    return this.constructor.mapModel(this.model);
+  async getModel({
+    fields
+  } = {}) {
+    return this.constructor.mapModelFields(this.model, fields);
   }
 
   @monitor
-  async monitorModel() {
-    return new ModelMonitor(this.model, 'change', (item) => this.constructor.mapModel(item));
+  async monitorModel({
+    fields
+  } = {}) {
+    return new ModelMonitor(this.model, 'change', (item) => this.constructor.mapModelFields(item, fields));
   }
 
   @monitor
@@ -107,10 +185,16 @@ export class CollectionManager extends CommandManager {
   constructor(collection) {
     super();
     this.collection = collection;
+
+    // Model managers are reused while their models are alive.
+    this._modelManagers = new WeakMap();
+    if (collection && collection.on) {
+      collection.on('remove', (item) => this._modelManagers.delete(item));
+    }
   }
 
-  mapItem(item) {
-    return this.constructor.getModelManagerClass().mapModel(item);
+  mapItem(item, fields) {
+    return this.constructor.getModelManagerClass().mapModelFields(item, fields);
   }
 
   loadItem(id) {
@@ -133,27 +217,64 @@ export class CollectionManager extends CommandManager {
     return new(this.constructor.getModelManagerClass())(item);
   }
 
+  getModelManager(item) {
+    let modelManager = this._modelManagers.get(item);
+
+    if (!modelManager) {
+      modelManager = this.buildModelManager(item);
+      this._modelManagers.set(item, modelManager);
+    }
+
+    return modelManager;
+  }
+
   getSubmanager(name) {
-    try {
+    if (name in this.submanagers) {
       return super.getSubmanager(name);
+    }
+    return this.getItemManager(name);
+  }
+
+  getItemManager(id) {
+    try {
+      return this.getModelManager(this.loadItem(id));
     } catch (err) {
-      try {
-        return this.buildModelManager(this.loadItem(name));
-      } catch (err2) {
-        throw err;
-      }
+      throw new ManagerNotFound(id);
     }
   }
 
   @command
-  async getItems() {
-    return new Iterator(
-      (partialResult) => this.collection.forEach(
-        (item) => partialResult(
-          this.mapItem(item)
+  async getItems({
+    fields,
+    where,
+    limit,
+    offset,
+    orderBy,
+    afterCursor
+  } = {}) {
+    let predicate = compileFilter(where);
+
+    if (!limit && !offset && !orderBy && !afterCursor) {
+      return new Iterator(
+        (partialResult) => this.collection.forEach(
+          (item) => (!predicate || predicate(item)) && partialResult(
+            this.mapItem(item, fields)
+          )
         )
-      )
-    );
+      );
+    }
+
+    let models = predicate ? this.collection.models.filter(predicate) : this.collection.models;
+    let page = paginate(models, {
+      limit,
+      offset,
+      orderBy,
+      afterCursor
+    });
+
+    let iterator = Iterator.fromArray(page.items, (item) => this.mapItem(item, fields));
+    iterator.cursor = page.cursor;
+    return iterator;
   }
 
   @command
@@ -163,16 +284,18 @@ export class CollectionManager extends CommandManager {
 
   @command
   async getItemById({
-    id
+    id,
+    fields
   }) {
-    return this.mapItem(this.loadItem(id));
+    return this.mapItem(this.loadItem(id), fields);
   }
 
   @command
   async findItemById({
-    id
+    id,
+    fields
   }) {
-    return this.mapItem(await this.findItem(id));
+    return this.mapItem(await this.findItem(id), fields);
   }
 
   @command
@@ -183,28 +306,44 @@ export class CollectionManager extends CommandManager {
   }
 
   @command
-  async getFirst() {
-    return this.mapItem(this.collection.models[0]);
+  async getFirst({
+    fields
+  } = {}) {
+    return this.mapItem(this.collection.models[0], fields);
   }
 
   @command
-  async getLast() {
-    return this.mapItem(this.collection.last());
+  async getLast({
+    fields
+  } = {}) {
+    return this.mapItem(this.collection.last(), fields);
   }
 
   @monitor
-  async monitorAdd() {
-    return new CollectionItemMonitor(this.collection, 'add', (item) => this.mapItem(item));
+  async monitorAdd({
+    fields,
+    where
+  } = {}) {
+    return new CollectionItemMonitor(this.collection, 'add', (item) => this.mapItem(item, fields))
+      .where(compileFilter(where));
   }
 
   @monitor
-  async monitorRemove() {
-    return new CollectionItemMonitor(this.collection, 'remove', (item) => this.mapItem(item));
+  async monitorRemove({
+    fields,
+    where
+  } = {}) {
+    return new CollectionItemMonitor(this.collection, 'remove', (item) => this.mapItem(item, fields))
+      .where(compileFilter(where));
   }
 
   @monitor
-  async monitorChange() {
-    return new CollectionItemMonitor(this.collection, 'change', (item) => this.mapItem(item));
+  async monitorChange({
+    fields,
+    where
+  } = {}) {
+    return new CollectionItemMonitor(this.collection, 'change', (item) => this.mapItem(item, fields))
+      .where(compileFilter(where));
   }
 
   @monitor
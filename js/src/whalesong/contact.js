@@ -3,7 +3,8 @@ import {
 } from '../manager.js';
 import {
   CollectionManager,
-  ModelManager
+  ModelManager,
+  mapFields
 } from './common.js';
 import {
   ProfilePicThumbManager
@@ -12,38 +13,38 @@ import {
   StatusManager
 } from './status.js';
 
+const CONTACT_FIELDS = {
+  id: (item) => item.id._serialized,
+  formattedName: (item) => item.formattedName,
+  isHighLevelVerified: (item) => item.isHighLevelVerified,
+  isMe: (item) => item.isMe,
+  isMyContact: (item) => item.isMyContact,
+  isPSA: (item) => item.isPSA,
+  isUser: (item) => item.isUser,
+  isVerified: (item) => item.isVerified,
+  isWAContact: (item) => item.isWAContact,
+  profilePicThumbObj: (item) => item.profilePicThumb ? ProfilePicThumbManager.mapModel(item.profilePicThumb) : null,
+  statusMute: (item) => item.statusMute,
+  userhash: (item) => item.userhash,
+  userid: (item) => item.userid,
+  status: (item) => item.status ? StatusManager.mapModel(item.status) : null
+};
+
 export class ContactManager extends ModelManager {
 
-  static mapModel(item) {
-    return Object.assign(ModelManager.mapModel(item), {
-      id: item.id._serialized,
-      formattedName: item.formattedName,
-      isHighLevelVerified: item.isHighLevelVerified,
-      isMe: item.isMe,
-      isMyContact: item.isMyContact,
-      isPSA: item.isPSA,
-      isUser: item.isUser,
-      isVerified: item.isVerified,
-      isWAContact: item.isWAContact,
-      profilePicThumbObj: item.profilePicThumb ? ProfilePicThumbManager.mapModel(item.profilePicThumb) : null,
-      statusMute: item.statusMute,
-      userhash: item.userhash,
-      userid: item.userid,
-      status: item.status ? StatusManager.mapModel(item.status) : null
-    });
+  static mapModel(item, fields) {
+    return mapFields(ModelManager.mapModel(item, fields), item, fields, CONTACT_FIELDS);
   }
 
-  constructor(model) {
-    super(model);
-
-    if (model.profilePicThumb) {
-      this.addSubmanager(
-        'profilePicThumb',
-        manager.getSubmanager('profilePicThumbs').getSubmanager(
-          this.model.id._serialized
-        )
+  getSubmanager(name) {
+    // Profile picture could be loaded after manager was built.
+    if ((name === 'profilePicThumb') && this.model.profilePicThumb) {
+      return manager.getSubmanager('profilePicThumbs').getSubmanager(
+        this.model.id._serialized
       );
     }
+
+    return super.getSubmanager(name);
   }
 
   @command
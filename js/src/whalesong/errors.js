@@ -4,4 +4,10 @@ import {
 
 export class ModelNotFound extends BaseError {};
 
-export class SendMessageFail extends BaseError {};
\ No newline at end of file
+export class SendMessageFail extends BaseError {};
+
+export class UploadNotFound extends BaseError {};
+
+export class InvalidCursor extends BaseError {};
+
+export class InvalidFilter extends BaseError {};
\ No newline at end of file
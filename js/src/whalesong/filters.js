@@ -0,0 +1,95 @@
+import {
+  InvalidFilter
+} from './errors.js';
+
+/**
+ * Build a field getter. Paths are dotted and identifiers are compared using their serialized form.
+ */
+function compileGetter(field) {
+  let path = field.split('.');
+
+  return (item) => {
+    let value = item;
+    for (let i = 0; i < path.length; i++) {
+      if (value === undefined || value === null) {
+        return null;
+      }
+      value = value[path[i]];
+    }
+
+    if (value === undefined || value === null) {
+      return null;
+    }
+    if (value._serialized !== undefined) {
+      return value._serialized;
+    }
+    return value;
+  };
+}
+
+const COMPARATORS = {
+  'eq': (a, b) => a === b,
+  'ne': (a, b) => a !== b,
+  'gt': (a, b) => a !== null && a > b,
+  'gte': (a, b) => a !== null && a >= b,
+  'lt': (a, b) => a !== null && a < b,
+  'lte': (a, b) => a !== null && a <= b
+};
+
+/**
+ * Compile a filter built by Python side to a predicate. It returns null when there is no filter.
+ */
+export function compileFilter(where) {
+  if (!where) {
+    return null;
+  }
+
+  let op = where[0];
+
+  switch (op) {
+    case 'and':
+      {
+        let filters = where[1].map(compileFilter);
+        return (item) => {
+          for (let i = 0; i < filters.length; i++) {
+            if (!filters[i](item)) {
+              return false;
+            }
+          }
+          return true;
+        };
+      }
+    case 'or':
+      {
+        let filters = where[1].map(compileFilter);
+        return (item) => {
+          for (let i = 0; i < filters.length; i++) {
+            if (filters[i](item)) {
+              return true;
+            }
+          }
+          return false;
+        };
+      }
+    case 'not':
+      {
+        let filter = compileFilter(where[1]);
+        return (item) => !filter(item);
+      }
+    case 'in':
+      {
+        let getter = compileGetter(where[1]);
+        let values = new Set(where[2]);
+        return (item) => values.has(getter(item));
+      }
+  }
+
+  let comparator = COMPARATORS[op];
+  if (!comparator) {
+    throw new InvalidFilter(`Unknown filter operator "${op}"`);
+  }
+
+  let getter = compileGetter(where[1]);
+  let value = where[2];
+  return (item) => comparator(getter(item), value);
+}
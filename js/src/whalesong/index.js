@@ -52,6 +52,9 @@ import {
 import {
   StatusV3CollectionManager
 } from './statusV3.js';
+import {
+  UploadManager
+} from './upload.js';
 
 
 function getArtifactsDefs() {
@@ -178,6 +181,13 @@ function getRequirementsDefs() {
         return manager;
       }
     },
+    'uploadManager': {
+      'build': function(mainManager) {
+        let manager = new UploadManager();
+        mainManager.addSubmanager('uploads', manager);
+        return manager;
+      }
+    },
     'stickerManager': {
       'requirements': ['store'],
       'build': function(mainManager, artifacts) {
@@ -248,12 +258,52 @@ function getRequirementsDefs() {
   }
 }
 
+const ARTIFACTS_CACHE_KEY = 'whalesongArtifacts';
+
+function getBuildVersion() {
+  return (window.Debug && window.Debug.VERSION) || null;
+}
+
+function loadArtifactsCache(version) {
+  if (!version) {
+    return {};
+  }
+
+  try {
+    let cache = JSON.parse(window.localStorage.getItem(ARTIFACTS_CACHE_KEY));
+    if (cache && cache.version === version) {
+      return cache.modules;
+    }
+  } catch (err) {
+    console.warn(err);
+  }
+  return {};
+}
+
+function saveArtifactsCache(version, moduleIds) {
+  if (!version) {
+    return;
+  }
+
+  try {
+    window.localStorage.setItem(ARTIFACTS_CACHE_KEY, JSON.stringify({
+      'version': version,
+      'modules': moduleIds
+    }));
+  } catch (err) {
+    console.warn(err);
+  }
+}
+
 export default function createManagers(mainManager) {
   function discoveryModules(modules) {
     const artifactsDefs = getArtifactsDefs();
     const requirementsDefs = getRequirementsDefs();
+    const version = getBuildVersion();
+    const cachedModuleIds = loadArtifactsCache(version);
 
     const artifacts = {};
+    const moduleIds = {};
 
     function checkRequirements() {
       let recheck = true;
@@ -280,19 +330,51 @@ export default function createManagers(mainManager) {
       }
     }
 
+    function setArtifact(art, artifact, moduleId) {
+      artifacts[art] = artifact;
+      moduleIds[art] = moduleId;
+      delete artifactsDefs[art];
+      console.log("Got artifact: " + art);
+    }
 
-    function checkArtifacts(module) {
+    function checkArtifacts(module, moduleId) {
       for (let art in artifactsDefs) {
         let artifact = artifactsDefs[art](module);
         if (artifact) {
-          artifacts[art] = artifact;
-          console.log("Got artifact: " + art);
+          setArtifact(art, artifact, moduleId);
           return true;
         }
       }
     }
 
-    for (let idx in modules) {
+    function loadModule(moduleId) {
+      try {
+        return modules(moduleId);
+      } catch (err) {
+        return null;
+      }
+    }
+
+    // Modules found on previous loads of same WhatsappWeb build
+    for (let art in cachedModuleIds) {
+      if (!(art in artifactsDefs)) {
+        continue;
+      }
+
+      let module = loadModule(cachedModuleIds[art]);
+      let artifact = module ? artifactsDefs[art](module) : null;
+
+      if (artifact) {
+        setArtifact(art, artifact, cachedModuleIds[art]);
+      }
+    }
+
+    // Scan modules only looking for artifacts not found yet
+    scan: for (let idx in modules) {
+      if (Object.keys(artifactsDefs).length == 0) {
+        break;
+      }
+
       if ((typeof modules[idx] === "object") && modules[idx]) {
         let first = Object.values(modules[idx])[0];
         if ((typeof first === "object") && (first.exports)) {
@@ -303,20 +385,19 @@ export default function createManagers(mainManager) {
               continue;
             }
 
-            if (checkArtifacts(module)) {
-              checkRequirements();
-            }
-
-            if ((artifactsDefs.length == 0) || (requirementsDefs.length == 0)) {
-              return;
+            if (checkArtifacts(module, idx2) && (Object.keys(artifactsDefs).length == 0)) {
+              break scan;
             }
           }
         }
       }
     }
+
+    checkRequirements();
+    saveArtifactsCache(version, moduleIds);
   }
 
   webpackJsonp([], {
     'whalesong': (x, y, z) => discoveryModules(z)
   }, ['whalesong']);
-}
\ No newline at end of file
+}
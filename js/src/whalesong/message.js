@@ -1,12 +1,16 @@
 import {
   CollectionManager,
   ModelManager,
-  CollectionItemMonitor
+  CollectionItemMonitor,
+  mapFields
 } from './common.js';
 import {
   monitor,
   command
 } from '../manager.js';
+import {
+  compileFilter
+} from './filters.js';
 import {
   ContactManager
 } from './contact.js';
@@ -15,24 +19,73 @@ import {
 } from './chat.js';
 
 
+const MESSAGE_FIELDS = {
+  id: (item) => item.id._serialized,
+  senderObj: (item) => item.senderObj ? ContactManager.mapModel(item.senderObj) : null,
+  chat: (item) => item.chat ? ChatManager.mapModel(item.chat) : null,
+
+  isGroupMsg: (item) => item.isGroupMsg,
+  isLink: (item) => item.isLink,
+  isMMS: (item) => item.isMMS,
+  isMedia: (item) => item.isMedia,
+  isNotification: (item) => item.isNotification,
+  isPSA: (item) => item.isPSA,
+  hasPromises: (item) => item.promises.length ? true : false,
+
+  streamingSidecar: () => null
+};
+
+/**
+ * Messages reference their chat and sender by id. They are sent once per results batch.
+ */
+const NORMALIZED_MESSAGE_FIELDS = Object.assign({}, MESSAGE_FIELDS, {
+  senderObj: () => null,
+  senderId: (item) => {
+    if (!item.senderObj) {
+      return null;
+    }
+
+    let senderId = item.senderObj.id._serialized;
+    manager.resultManager.addRelated('contacts', senderId, () => ContactManager.mapModel(item.senderObj));
+    return senderId;
+  },
+  chat: () => null,
+  chatId: (item) => {
+    if (!item.chat) {
+      return null;
+    }
+
+    let chatId = item.chat.id._serialized;
+    manager.resultManager.addRelated('chats', chatId, () => ChatManager.mapModel(item.chat));
+    return chatId;
+  }
+});
+
 export class MessageManager extends ModelManager {
 
-  static mapModel(item) {
-    return Object.assign(ModelManager.mapModel(item), {
-      id: item.id._serialized,
-      senderObj: item.senderObj ? ContactManager.mapModel(item.senderObj) : null,
-      chat: item.chat ? ChatManager.mapModel(item.chat) : null,
-
-      isGroupMsg: item.isGroupMsg,
-      isLink: item.isLink,
-      isMMS: item.isMMS,
-      isMedia: item.isMedia,
-      isNotification: item.isNotification,
-      isPSA: item.isPSA,
-      hasPromises: item.promises.length ? true : false,
-
-      streamingSidecar: null
-    });
+  static mapModel(item, fields) {
+    return mapFields(
+      ModelManager.mapModel(item, fields),
+      item,
+      fields,
+      manager.normalized ? NORMALIZED_MESSAGE_FIELDS : MESSAGE_FIELDS
+    );
+  }
+
+  static expandFields(fields) {
+    if (!manager.normalized) {
+      return fields;
+    }
+
+    // Related objects are resolved using their ids.
+    let expanded = fields.slice();
+    if (fields.indexOf('chat') >= 0 && fields.indexOf('chatId') < 0) {
+      expanded.push('chatId');
+    }
+    if (fields.indexOf('senderObj') >= 0 && fields.indexOf('senderId') < 0) {
+      expanded.push('senderId');
+    }
+    return expanded;
   }
 
   @command
@@ -85,10 +138,13 @@ export class MessageCollectionManager extends CollectionManager {
   }
 
   @monitor
-  async monitorNew() {
+  async monitorNew({
+    fields,
+    where
+  } = {}) {
     return new CollectionItemMonitor(
       this.collection,
-      'add', (item) => item.isNewMsg && !item.isSentByMeFromWeb ? this.mapItem(item) : null
-    );
+      'add', (item) => item.isNewMsg && !item.isSentByMeFromWeb ? this.mapItem(item, fields) : null
+    ).where(compileFilter(where));
   }
 }
\ No newline at end of file
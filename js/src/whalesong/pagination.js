@@ -0,0 +1,144 @@
+import {
+  InvalidCursor
+} from './errors.js';
+
+/**
+ * Get a sortable value of a model field. Identifiers are compared using their serialized form.
+ */
+function getSortValue(item, field) {
+  let value = item[field];
+
+  if (value === undefined || value === null) {
+    return null;
+  }
+  if (value._serialized !== undefined) {
+    return value._serialized;
+  }
+  return value;
+}
+
+function compareValues(a, b) {
+  if (a === b) {
+    return 0;
+  }
+  // Items without value are always last.
+  if (a === null) {
+    return 1;
+  }
+  if (b === null) {
+    return -1;
+  }
+  return a < b ? -1 : 1;
+}
+
+/**
+ * Parse order fields. Descending fields start with `-`.
+ */
+function parseOrder(orderBy) {
+  return (orderBy || []).map((field) => field.startsWith('-') ? {
+    'field': field.slice(1),
+    'desc': true
+  } : {
+    'field': field,
+    'desc': false
+  });
+}
+
+/**
+ * Get item sort key. Item identifier is always last key, so order is stable.
+ */
+function getSortKey(item, order) {
+  let key = order.map((o) => getSortValue(item, o.field));
+  key.push(item.id._serialized);
+  return key;
+}
+
+function compareKeys(a, b, order) {
+  for (let i = 0; i < a.length; i++) {
+    let result = compareValues(a[i], b[i]);
+    if (result !== 0) {
+      return (i < order.length && order[i].desc) ? -result : result;
+    }
+  }
+  return 0;
+}
+
+export function encodeCursor(orderBy, key) {
+  return btoa(unescape(encodeURIComponent(JSON.stringify({
+    'o': orderBy || [],
+    'k': key
+  }))));
+}
+
+export function decodeCursor(cursor, orderBy) {
+  let data;
+  try {
+    data = JSON.parse(decodeURIComponent(escape(atob(cursor))));
+  } catch (err) {
+    throw new InvalidCursor('Cursor is not valid');
+  }
+
+  if (JSON.stringify(data.o) !== JSON.stringify(orderBy || [])) {
+    throw new InvalidCursor('Cursor was built using a different order');
+  }
+
+  return data.k;
+}
+
+/**
+ * Sort and slice collection models. It returns page items and a cursor to get next page,
+ * which is null when there are no more items.
+ */
+export function paginate(models, {
+  limit,
+  offset,
+  orderBy,
+  afterCursor
+}) {
+  let order = parseOrder(orderBy);
+  let keys = null;
+  let start = 0;
+
+  if (order.length) {
+    let entries = models.map((item) => ({
+      'item': item,
+      'key': getSortKey(item, order)
+    }));
+    entries.sort((a, b) => compareKeys(a.key, b.key, order));
+
+    models = entries.map((entry) => entry.item);
+    keys = entries.map((entry) => entry.key);
+  }
+
+  if (afterCursor) {
+    let cursorKey = decodeCursor(afterCursor, orderBy);
+
+    if (keys) {
+      start = keys.findIndex((key) => compareKeys(key, cursorKey, order) > 0);
+      if (start < 0) {
+        start = models.length;
+      }
+    } else {
+      // Collection order: cursor item must still be in collection.
+      start = models.findIndex((item) => item.id._serialized === cursorKey[0]);
+      if (start < 0) {
+        throw new InvalidCursor('Cursor item is not in collection');
+      }
+      start++;
+    }
+  }
+
+  start += offset || 0;
+  let end = limit ? Math.min(start + limit, models.length) : models.length;
+  let items = models.slice(start, end);
+  let cursor = null;
+
+  if (end < models.length && items.length) {
+    cursor = encodeCursor(orderBy, keys ? keys[end - 1] : getSortKey(models[end - 1], order));
+  }
+
+  return {
+    'items': items,
+    'cursor': cursor
+  };
+}
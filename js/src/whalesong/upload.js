@@ -0,0 +1,66 @@
+import {
+  command,
+  CommandManager
+} from '../manager.js';
+import {
+  UploadNotFound
+} from './errors.js';
+import b64toblob from 'b64-to-blob';
+
+
+export class UploadManager extends CommandManager {
+
+  constructor() {
+    super();
+    this.uploads = {};
+    this._nextId = 1;
+  }
+
+  getUpload(uploadId) {
+    let upload = this.uploads[uploadId];
+    if (!upload) {
+      throw new UploadNotFound(`Upload with ID "${uploadId}" not found`);
+    }
+    return upload;
+  }
+
+  popBlob(uploadId, contentType) {
+    let upload = this.getUpload(uploadId);
+    delete this.uploads[uploadId];
+
+    return new Blob(upload.parts, {
+      'type': contentType || ''
+    });
+  }
+
+  @command
+  async createUpload() {
+    let uploadId = String(this._nextId++);
+    this.uploads[uploadId] = {
+      'parts': [],
+      'size': 0
+    };
+    return uploadId;
+  }
+
+  @command
+  async appendChunk({
+    uploadId,
+    data
+  }) {
+    let upload = this.getUpload(uploadId);
+    let part = b64toblob(data);
+
+    upload.parts.push(part);
+    upload.size += part.size;
+
+    return upload.size;
+  }
+
+  @command
+  async cancelUpload({
+    uploadId
+  }) {
+    delete this.uploads[uploadId];
+  }
+}
@@ -0,0 +1,36 @@
+from base64 import b64encode
+from hashlib import sha256
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes, hmac, padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from whalesong.managers.message import ImageMessage, MEDIA_MAC_SIZE, MessageTypes, derive_media_keys
+
+MEDIA_KEY = b64encode(bytes(range(32))).decode()
+
+
+def encrypt_media(media_key: str, media_type: MessageTypes, data: bytes) -> bytes:
+    """
+    Encrypt a media file like Whatsapp does: AES-CBC with PKCS7 padding, followed by a truncated HMAC.
+    """
+    iv, cipher_key, mac_key = derive_media_keys(media_key, media_type)
+
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    encryptor = Cipher(algorithms.AES(cipher_key), modes.CBC(iv), backend=default_backend()).encryptor()
+    encrypted = encryptor.update(padder.update(data) + padder.finalize()) + encryptor.finalize()
+
+    mac = hmac.HMAC(mac_key, hashes.SHA256(), backend=default_backend())
+    mac.update(iv + encrypted)
+    return encrypted + mac.finalize()[:MEDIA_MAC_SIZE]
+
+
+def build_image(driver, data: bytes, url: str = 'https://mmg.whatsapp.net/image') -> ImageMessage:
+    """
+    Build an image message and register its encrypted file on stub driver.
+    """
+    driver.files[url] = encrypt_media(MEDIA_KEY, MessageTypes.IMAGE, data)
+    return ImageMessage({'id': 'msg_{}'.format(url),
+                         'mediaKey': MEDIA_KEY,
+                         'clientUrl': url,
+                         'filehash': b64encode(sha256(data).digest()).decode()})
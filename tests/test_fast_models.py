@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from whalesong.fast_models import FastModel, fast_model_class, is_model_instance, map_fast_model
+from whalesong.managers.chat import Chat
+from whalesong.managers.contact import Contact
+from whalesong.managers.message import BaseMessage, ImageMessage, MessageTypes, TextMessage
+
+DATA = {'id': 'msg_1',
+        'type': 'chat',
+        'body': 'Hello',
+        't': 1577836800,
+        'ack': 2,
+        'star': True,
+        'links': ['https://example.com'],
+        'chat': {'id': 'chat_1@c.us', 'name': 'Chat 1'},
+        'senderObj': {'id': 'contact_1@c.us', 'name': 'Contact 1'}}
+
+FIELDS = ('id', 'type', 'body', 'timestamp', 'ack', 'star', 'is_forwarded', 'is_new_msg')
+
+
+class FastModelTests(TestCase):
+
+    def test_same_values(self):
+        model = BaseMessage(DATA)
+        fast = map_fast_model(BaseMessage, DATA)
+
+        for name in FIELDS:
+            self.assertEqual(getattr(fast, name), getattr(model, name), name)
+
+        self.assertEqual(fast.links, model.links.export_data())
+
+    def test_model_class(self):
+        fast = map_fast_model(BaseMessage, DATA)
+
+        self.assertIsInstance(fast, FastModel)
+        self.assertIs(fast.get_model_class(), TextMessage)
+        self.assertIs(type(fast), fast_model_class(TextMessage))
+        self.assertIs(map_fast_model(BaseMessage, {'type': 'image'}).get_model_class(), ImageMessage)
+
+    def test_nested_models(self):
+        fast = map_fast_model(BaseMessage, DATA)
+
+        self.assertIsInstance(fast.chat, FastModel)
+        self.assertEqual(fast.chat.name, 'Chat 1')
+        self.assertIs(fast.chat, fast.chat)
+        self.assertTrue(is_model_instance(fast.sender_obj, Contact))
+
+    def test_alias(self):
+        fast = map_fast_model(BaseMessage, DATA)
+
+        self.assertEqual(fast.t, fast.timestamp)
+
+    def test_read_only(self):
+        fast = map_fast_model(BaseMessage, DATA)
+
+        with self.assertRaises(AttributeError):
+            fast.body = 'Bye'
+
+    def test_to_model(self):
+        model = map_fast_model(BaseMessage, DATA).to_model()
+
+        self.assertIsInstance(model, TextMessage)
+        self.assertIsInstance(model.chat, Chat)
+        self.assertEqual(model.export_data(), BaseMessage(DATA).export_data())
+
+    def test_is_model_instance(self):
+        fast = map_fast_model(BaseMessage, DATA)
+
+        self.assertFalse(isinstance(fast, TextMessage))
+        self.assertTrue(is_model_instance(fast, TextMessage))
+        self.assertTrue(is_model_instance(fast, (ImageMessage, BaseMessage)))
+        self.assertFalse(is_model_instance(fast, ImageMessage))
+        self.assertTrue(is_model_instance(BaseMessage(DATA), TextMessage))
+
+    def test_none(self):
+        self.assertIsNone(map_fast_model(BaseMessage, None))
+
+        fast = map_fast_model(BaseMessage, {'id': 'msg_1', 'type': MessageTypes.CHAT.value, 'chat': None})
+        self.assertIsNone(fast.chat)
+        self.assertFalse(fast.star)
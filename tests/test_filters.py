@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from unittest import TestCase
+
+from whalesong.filters import And, Eq, Filter, Gte, In, Lt, Ne, Not, Or, get_field_path
+from whalesong.managers.message import MessageManager, MessageTypes
+
+
+class GetFieldPathTests(TestCase):
+
+    def test_field_name(self):
+        self.assertEqual(get_field_path(MessageManager, 'is_forwarded'), 'isForwarded')
+
+    def test_field_alias(self):
+        self.assertEqual(get_field_path(MessageManager, 'timestamp'), 't')
+
+    def test_dotted_path(self):
+        self.assertEqual(get_field_path(MessageManager, 'sender_obj.is_my_contact'), 'senderObj.isMyContact')
+
+    def test_unknown_field(self):
+        self.assertEqual(get_field_path(MessageManager, 'some_field'), 'someField')
+
+
+class FilterTests(TestCase):
+
+    def test_field_filter(self):
+        self.assertEqual(Eq('chat.id', 'chat_1@c.us').to_data(MessageManager), ['eq', 'chat.id', 'chat_1@c.us'])
+        self.assertEqual(Ne('star', True).to_data(MessageManager), ['ne', 'star', True])
+
+    def test_convert_values(self):
+        since = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+        self.assertEqual(Gte('timestamp', since).to_data(MessageManager), ['gte', 't', 1577836800])
+        self.assertEqual(In('type', (t for t in [MessageTypes.CHAT, 'image'])).to_data(MessageManager),
+                         ['in', 'type', ['chat', 'image']])
+
+    def test_and(self):
+        where = Eq('type', 'chat') & Eq('star', True) & Lt('timestamp', 10)
+
+        self.assertIsInstance(where, And)
+        self.assertEqual(where.to_data(MessageManager),
+                         ['and', [['eq', 'type', 'chat'], ['eq', 'star', True], ['lt', 't', 10]]])
+
+    def test_or(self):
+        where = Eq('type', 'chat') | Eq('type', 'image') | Eq('type', 'video')
+
+        self.assertIsInstance(where, Or)
+        self.assertNotIsInstance(where, And)
+        self.assertEqual(len(where.filters), 3)
+
+    def test_mixed(self):
+        where = (Eq('type', 'chat') | Eq('type', 'image')) & Eq('star', True)
+
+        self.assertEqual(where.to_data(MessageManager),
+                         ['and', [['or', [['eq', 'type', 'chat'], ['eq', 'type', 'image']]], ['eq', 'star', True]]])
+
+        where = Eq('star', True) & Eq('type', 'chat') | Eq('type', 'image')
+        self.assertIsInstance(where, Or)
+        self.assertIsInstance(where.filters[0], And)
+
+    def test_not(self):
+        where = ~Eq('star', True)
+
+        self.assertIsInstance(where, Not)
+        self.assertEqual(where.to_data(MessageManager), ['not', ['eq', 'star', True]])
+
+    def test_abstract_filter(self):
+        with self.assertRaises(TypeError):
+            Filter()
+
+    def test_build_read_params(self):
+        self.assertEqual(MessageManager.build_read_params(where=Eq('type', MessageTypes.IMAGE)),
+                         {'where': ['eq', 'type', 'image']})
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from whalesong.managers.message import MEDIA_MAC_SIZE, MessageTypes, decrypt_media, derive_media_keys, \
+    download_media
+from .media import MEDIA_KEY, build_image, encrypt_media
+from .utils import AsyncTestCase, StubDriver
+
+DATA = bytes(range(256)) * 4 + b'tail'
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+
+    def __init__(self):
+        super(RecordingExecutor, self).__init__(max_workers=1)
+        self.calls = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.calls.append(fn)
+        return super(RecordingExecutor, self).submit(fn, *args, **kwargs)
+
+
+class DeriveMediaKeysTests(AsyncTestCase):
+
+    def test_cached(self):
+        keys = derive_media_keys(MEDIA_KEY, MessageTypes.IMAGE)
+        hits = derive_media_keys.cache_info().hits
+
+        self.assertIs(derive_media_keys(MEDIA_KEY, MessageTypes.IMAGE), keys)
+        self.assertEqual(derive_media_keys.cache_info().hits, hits + 1)
+
+    def test_keys_by_type(self):
+        iv, cipher_key, mac_key = derive_media_keys(MEDIA_KEY, MessageTypes.IMAGE)
+
+        self.assertEqual((len(iv), len(cipher_key), len(mac_key)), (16, 32, 32))
+        self.assertNotEqual(derive_media_keys(MEDIA_KEY, MessageTypes.VIDEO), (iv, cipher_key, mac_key))
+
+    def test_invalid_type(self):
+        with self.assertRaises(ValueError):
+            derive_media_keys(MEDIA_KEY, MessageTypes.CHAT)
+
+    def test_decrypt_media(self):
+        iv, cipher_key, _ = derive_media_keys(MEDIA_KEY, MessageTypes.IMAGE)
+        encrypted = encrypt_media(MEDIA_KEY, MessageTypes.IMAGE, DATA)
+
+        self.assertEqual(decrypt_media(iv, cipher_key, encrypted[:-MEDIA_MAC_SIZE]), DATA)
+
+
+class DownloadMediaTests(AsyncTestCase):
+
+    def setUp(self):
+        super(DownloadMediaTests, self).setUp()
+        self.executor = RecordingExecutor()
+        self.driver = StubDriver(crypto_executor=self.executor, loop=self.loop)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        super(DownloadMediaTests, self).tearDown()
+
+    def test_download_media(self):
+        model = build_image(self.driver, DATA)
+
+        self.assertEqual(self.run_async(download_media(self.driver, model)).read(), DATA)
+        self.assertEqual(self.executor.calls, [decrypt_media])
@@ -0,0 +1,149 @@
+from base64 import b64encode
+from hashlib import sha256
+from os import listdir
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from whalesong.errors import MediaIntegrityError
+from whalesong.managers.message import download_media, download_media_stream
+from whalesong.media_cache import INDEX_FILENAME, MediaCache
+from .media import build_image
+from .utils import AsyncTestCase, StubDriver
+
+
+def get_filehash(data: bytes) -> str:
+    return b64encode(sha256(data).digest()).decode()
+
+
+class MediaCacheTests(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.cache = MediaCache(self.tmp_dir.name, max_size=100)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_put_get(self):
+        data = b'a' * 10
+
+        self.assertIsNone(self.cache.get(get_filehash(data)))
+        self.assertTrue(self.cache.put(get_filehash(data), data))
+        self.assertIn(get_filehash(data), self.cache)
+        self.assertEqual(self.cache.get(get_filehash(data)), data)
+        self.assertEqual(self.cache.size, 10)
+
+    def test_hash_mismatch(self):
+        self.assertFalse(self.cache.put(get_filehash(b'a'), b'b'))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(listdir(self.tmp_dir.name), [INDEX_FILENAME])
+
+    def test_writer(self):
+        data = b'a' * 10
+        writer = self.cache.open_writer(get_filehash(data))
+        writer.write(data[:4])
+        writer.write(data[4:])
+
+        self.assertNotIn(get_filehash(data), self.cache)
+        self.assertTrue(writer.commit())
+
+        with self.cache.open(get_filehash(data)) as f:
+            self.assertEqual(f.read(), data)
+
+    def test_writer_abort(self):
+        writer = self.cache.open_writer(get_filehash(b'a'))
+        writer.write(b'a')
+        writer.abort()
+
+        self.assertNotIn(get_filehash(b'a'), self.cache)
+        self.assertEqual(listdir(self.tmp_dir.name), [INDEX_FILENAME])
+
+    def test_evict_least_recently_used(self):
+        items = [bytes([i]) * 40 for i in range(3)]
+        self.cache.put(get_filehash(items[0]), items[0])
+        self.cache.put(get_filehash(items[1]), items[1])
+        self.cache.get(get_filehash(items[0]))
+        self.cache.put(get_filehash(items[2]), items[2])
+
+        self.assertIn(get_filehash(items[0]), self.cache)
+        self.assertNotIn(get_filehash(items[1]), self.cache)
+        self.assertIn(get_filehash(items[2]), self.cache)
+        self.assertEqual(self.cache.size, 80)
+
+    def test_too_big(self):
+        data = b'a' * 101
+
+        self.assertFalse(self.cache.put(get_filehash(data), data))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_remove_and_clear(self):
+        items = [bytes([i]) * 10 for i in range(3)]
+        for data in items:
+            self.cache.put(get_filehash(data), data)
+
+        self.cache.remove(get_filehash(items[0]))
+        self.assertNotIn(get_filehash(items[0]), self.cache)
+        self.assertEqual(self.cache.size, 20)
+
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
+        self.assertEqual(listdir(self.tmp_dir.name), [INDEX_FILENAME])
+
+    def test_reload_index(self):
+        items = [bytes([i]) * 10 for i in range(2)]
+        for data in items:
+            self.cache.put(get_filehash(data), data)
+
+        cache = MediaCache(self.tmp_dir.name, max_size=100)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(get_filehash(items[1])), items[1])
+        self.assertEqual(cache.size, 20)
+
+    def test_reload_removes_temp_files(self):
+        writer = self.cache.open_writer(get_filehash(b'a'))
+        writer.write(b'a')
+        writer._file.close()
+
+        MediaCache(self.tmp_dir.name, max_size=100)
+
+        self.assertEqual(listdir(self.tmp_dir.name), [INDEX_FILENAME])
+
+
+class DownloadMediaCacheTests(AsyncTestCase):
+
+    def setUp(self):
+        super(DownloadMediaCacheTests, self).setUp()
+        self.tmp_dir = TemporaryDirectory()
+        self.driver = StubDriver(media_cache=MediaCache(self.tmp_dir.name), loop=self.loop)
+        self.data = bytes(range(256)) * 4 + b'tail'
+        self.model = build_image(self.driver, self.data)
+
+    def tearDown(self):
+        super(DownloadMediaCacheTests, self).tearDown()
+        self.tmp_dir.cleanup()
+
+    async def collect(self):
+        return b''.join([chunk async for chunk in download_media_stream(self.driver, self.model, chunk_size=100)])
+
+    def test_download_media(self):
+        self.assertEqual(self.run_async(download_media(self.driver, self.model)).read(), self.data)
+        self.assertEqual(self.run_async(download_media(self.driver, self.model)).read(), self.data)
+        self.assertEqual(self.driver.downloads, {self.model.client_url: 1})
+
+    def test_download_media_stream(self):
+        self.assertEqual(self.run_async(self.collect()), self.data)
+        self.assertIn(self.model.filehash, self.driver.media_cache)
+        self.assertEqual(self.run_async(self.collect()), self.data)
+        self.assertEqual(self.run_async(download_media(self.driver, self.model)).read(), self.data)
+        self.assertEqual(self.driver.downloads, {self.model.client_url: 1})
+
+    def test_not_cached_on_error(self):
+        url = self.model.client_url
+        self.driver.files[url] = self.driver.files[url][:-1]
+
+        with self.assertRaises(MediaIntegrityError):
+            self.run_async(self.collect())
+
+        self.assertEqual(len(self.driver.media_cache), 0)
@@ -0,0 +1,61 @@
+from io import BytesIO
+from os import path
+from tempfile import TemporaryDirectory
+
+from whalesong.errors import MediaIntegrityError
+from whalesong.managers.message import download_media_stream, download_media_to_file
+from .media import build_image
+from .utils import AsyncTestCase, StubDriver
+
+DATA = bytes(range(256)) * 40 + b'tail'
+
+
+class DownloadMediaStreamTests(AsyncTestCase):
+
+    def setUp(self):
+        super(DownloadMediaStreamTests, self).setUp()
+        self.driver = StubDriver(loop=self.loop)
+        self.model = build_image(self.driver, DATA)
+
+    async def collect(self, chunk_size):
+        return [chunk async for chunk in download_media_stream(self.driver, self.model, chunk_size=chunk_size)]
+
+    def test_decrypt_chunks(self):
+        for chunk_size in (7, 16, 1000, 64 * 1024, len(DATA) * 2):
+            chunks = self.run_async(self.collect(chunk_size))
+            self.assertEqual(b''.join(chunks), DATA, chunk_size)
+
+    def test_mac_mismatch(self):
+        url = self.model.client_url
+        self.driver.files[url] = self.driver.files[url][:-1] + bytes([self.driver.files[url][-1] ^ 1])
+
+        with self.assertRaises(MediaIntegrityError):
+            self.run_async(self.collect(1000))
+
+    def test_download_to_stream(self):
+        stream = BytesIO()
+
+        self.assertEqual(self.run_async(download_media_to_file(self.driver, self.model, stream, chunk_size=1000)),
+                         len(DATA))
+        self.assertEqual(stream.getvalue(), DATA)
+
+    def test_download_to_path(self):
+        with TemporaryDirectory() as tmp_dir:
+            filename = path.join(tmp_dir, 'media.jpg')
+
+            self.assertEqual(self.run_async(download_media_to_file(self.driver, self.model, filename)), len(DATA))
+
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read(), DATA)
+
+    def test_download_to_path_removed_on_error(self):
+        url = self.model.client_url
+        self.driver.files[url] = self.driver.files[url][:-1]
+
+        with TemporaryDirectory() as tmp_dir:
+            filename = path.join(tmp_dir, 'media.jpg')
+
+            with self.assertRaises(MediaIntegrityError):
+                self.run_async(download_media_to_file(self.driver, self.model, filename))
+
+            self.assertFalse(path.exists(filename))
@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from whalesong.managers.message import AudioMessage, BaseMessage, ImageMessage, MessageTypes, PTTMessage, \
+    StickerMessage, TextMessage
+
+
+class MessageClassTests(TestCase):
+
+    def test_get_message_class(self):
+        self.assertIs(BaseMessage.get_message_class(MessageTypes.IMAGE), ImageMessage)
+        self.assertIs(BaseMessage.get_message_class('image'), ImageMessage)
+        self.assertIs(BaseMessage.get_message_class(MessageTypes.STICKER), StickerMessage)
+        self.assertIs(BaseMessage.get_message_class(MessageTypes.PTT), PTTMessage)
+
+    def test_get_message_class_unknown(self):
+        self.assertIs(BaseMessage.get_message_class(MessageTypes.REVOKED), BaseMessage)
+        self.assertIs(BaseMessage.get_message_class('new_type'), BaseMessage)
+
+    def test_build_message(self):
+        msg = BaseMessage({'id': 'msg_1', 'type': 'ptt'})
+
+        self.assertIsInstance(msg, PTTMessage)
+        self.assertIsInstance(msg, AudioMessage)
+        self.assertEqual(msg.type, MessageTypes.PTT)
+
+    def test_build_message_type_kwarg(self):
+        self.assertIsInstance(BaseMessage(type=MessageTypes.CHAT), TextMessage)
+
+    def test_build_unknown_message(self):
+        msg = BaseMessage({'id': 'msg_1', 'type': 'revoked'})
+
+        self.assertIs(type(msg), BaseMessage)
+        self.assertEqual(msg.type, MessageTypes.REVOKED)
+
+    def test_build_message_without_type(self):
+        with self.assertRaises(RuntimeError):
+            BaseMessage({'id': 'msg_1'})
+
+    def test_build_message_class(self):
+        msg = ImageMessage({'id': 'msg_1'})
+
+        self.assertIs(type(msg), ImageMessage)
+        self.assertEqual(msg.type, MessageTypes.IMAGE)
+
+    def test_resolve_model_class(self):
+        self.assertIs(BaseMessage.resolve_model_class({'type': 'sticker'}), StickerMessage)
+        self.assertIs(ImageMessage.resolve_model_class({'type': 'chat'}), ImageMessage)
+
+        with self.assertRaises(RuntimeError):
+            BaseMessage.resolve_model_class({})
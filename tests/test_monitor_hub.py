@@ -0,0 +1,75 @@
+from whalesong.managers.message import MessageCollectionManager
+from whalesong.monitor_hub import is_monitor_result_class
+from whalesong.results import IteratorResult, MonitorResult
+from .utils import AsyncTestCase, StubDriver
+
+
+class IsMonitorResultClassTests(AsyncTestCase):
+
+    def test_collection_monitor(self):
+        self.assertTrue(is_monitor_result_class(MessageCollectionManager.get_monitor_result_class()))
+
+    def test_generic_monitor(self):
+        self.assertTrue(is_monitor_result_class(MonitorResult[dict]))
+
+    def test_iterator(self):
+        self.assertFalse(is_monitor_result_class(MessageCollectionManager.get_iterator_result_class()))
+        self.assertFalse(is_monitor_result_class(IteratorResult))
+
+
+class MonitorHubTests(AsyncTestCase):
+
+    def setUp(self):
+        super(MonitorHubTests, self).setUp()
+        self.driver = StubDriver(share_monitors=True, loop=self.loop)
+        self.messages = MessageCollectionManager(self.driver, manager_path='messages')
+
+    def test_share_collection_monitor(self):
+        monitor_1 = self.messages.monitor_new()
+        monitor_2 = self.messages.monitor_new()
+        self.run_pending()
+
+        commands = self.driver.get_commands('messages|monitorNew')
+        self.assertEqual(len(commands), 1)
+        self.assertEqual(len(self.driver.monitor_hub), 1)
+
+        self.run_async(self.driver.process_result({'exId': commands[0]['exId'],
+                                                   'type': 'PARTIAL',
+                                                   'params': {'item': {'id': 'msg_1', 'type': 'chat'}}}))
+
+        self.assertEqual(self.run_async(monitor_1.__anext__()).id, 'msg_1')
+        self.assertEqual(self.run_async(monitor_2.__anext__()).id, 'msg_1')
+
+    def test_different_params_not_shared(self):
+        self.messages.monitor_new()
+        self.messages.monitor_new(fields=['id'])
+        self.run_pending()
+
+        self.assertEqual(len(self.driver.get_commands('messages|monitorNew')), 2)
+        self.assertEqual(len(self.driver.monitor_hub), 2)
+
+    def test_unsubscribe(self):
+        monitor_1 = self.messages.monitor_new()
+        monitor_2 = self.messages.monitor_new()
+        self.run_pending()
+        ex_id = self.driver.get_commands('messages|monitorNew')[0]['exId']
+
+        self.assertTrue(self.run_async(self.driver.stop_monitor(monitor_1)))
+        self.run_pending()
+        self.assertEqual(self.driver.get_commands('stopMonitor'), [])
+
+        with self.assertRaises(StopAsyncIteration):
+            self.run_async(monitor_1.__anext__())
+
+        self.driver.stop_monitor(monitor_2)
+        self.run_pending()
+
+        self.assertEqual([cmd['params'] for cmd in self.driver.get_commands('stopMonitor')],
+                         [{'monitorId': ex_id}])
+        self.assertNotIn(monitor_2, self.driver.monitor_hub)
+        self.assertEqual(len(self.driver.monitor_hub), 0)
+
+        # New subscriber registers a new browser monitor.
+        self.messages.monitor_new()
+        self.run_pending()
+        self.assertEqual(len(self.driver.get_commands('messages|monitorNew')), 2)
@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+from whalesong.managers.chat import Chat
+from whalesong.managers.message import BaseMessage, MessageCollectionManager
+from whalesong.models import bind_related
+from .utils import AsyncTestCase, StubDriver
+
+RELATED = {'chats': {'chat_1@c.us': {'id': 'chat_1@c.us', 'name': 'Chat 1'}},
+           'contacts': {'contact_1@c.us': {'id': 'contact_1@c.us', 'name': 'Contact 1'}}}
+
+
+def build_message(msg_id):
+    return {'item': {'id': msg_id,
+                     'type': 'chat',
+                     'chat': None,
+                     'chatId': 'chat_1@c.us',
+                     'senderObj': None,
+                     'senderId': 'contact_1@c.us'}}
+
+
+class RelatedTests(AsyncTestCase):
+
+    def setUp(self):
+        super(RelatedTests, self).setUp()
+        self.driver = StubDriver(normalized_payloads=True, loop=self.loop)
+        self.messages = MessageCollectionManager(self.driver, manager_path='messages')
+
+    def receive_messages(self, fast=False):
+        monitor = self.messages.monitor_new(fast=fast)
+        self.run_pending()
+        ex_id = self.driver.get_commands('messages|monitorNew')[-1]['exId']
+
+        self.run_async(self.driver.process_result({'exId': ex_id, 'type': 'RELATED', 'params': RELATED}))
+        for msg_id in ('msg_1', 'msg_2'):
+            self.run_async(self.driver.process_result({'exId': ex_id,
+                                                       'type': 'PARTIAL',
+                                                       'params': build_message(msg_id)}))
+
+        return self.run_async(monitor.__anext__()), self.run_async(monitor.__anext__())
+
+    def test_share_related_objects(self):
+        msg_1, msg_2 = self.receive_messages()
+
+        self.assertIsInstance(msg_1.chat, Chat)
+        self.assertIs(msg_1.chat, msg_2.chat)
+        self.assertIs(msg_1.chat, self.driver.related['chats']['chat_1@c.us'])
+        self.assertIs(msg_1.sender_obj, msg_2.sender_obj)
+        self.assertEqual(msg_1.sender_obj.name, 'Contact 1')
+
+    def test_related_objects_not_on_message_data(self):
+        msg_1, msg_2 = self.receive_messages()
+
+        self.assertNotIn('chat', msg_1.export_data())
+        self.assertIsNone(msg_1.chat.get_parent())
+
+        msg_1.flat_data()
+        msg_2.flat_data()
+        msg_1.chat.name = 'Other name'
+
+        self.assertFalse(msg_1.is_modified())
+        self.assertFalse(msg_2.is_modified())
+        self.assertEqual(msg_2.chat.name, 'Other name')
+
+    def test_update_related_objects_in_place(self):
+        msg_1, msg_2 = self.receive_messages()
+        chat = msg_1.chat
+
+        self.driver.process_related({'chats': {'chat_1@c.us': {'name': 'New name'}}})
+
+        self.assertIs(self.driver.related['chats']['chat_1@c.us'], chat)
+        self.assertEqual(msg_2.chat.name, 'New name')
+
+    def test_embedded_objects_first(self):
+        self.driver.process_related(RELATED)
+        msg = BaseMessage({'id': 'msg_1', 'type': 'chat', 'chat': {'id': 'chat_2@c.us'}, 'chatId': 'chat_1@c.us'})
+        bind_related(msg, self.driver.get_related)
+
+        self.assertEqual(msg.chat.id, 'chat_2@c.us')
+
+    def test_fast_models(self):
+        msg_1, msg_2 = self.receive_messages(fast=True)
+
+        self.assertIs(msg_1.chat, msg_2.chat)
+        self.assertIs(msg_1.sender_obj, self.driver.related['contacts']['contact_1@c.us'])
+
+    def test_evict_least_recently_used(self):
+        with patch('whalesong.driver.RELATED_CACHE_SIZE', 2):
+            self.driver.process_related({'chats': {'chat_1': {'id': 'chat_1'}, 'chat_2': {'id': 'chat_2'}}})
+            self.driver.get_related('chats', 'chat_1')
+            self.driver.process_related({'chats': {'chat_3': {'id': 'chat_3'}}})
+
+        self.assertEqual(list(self.driver.related['chats']), ['chat_1', 'chat_3'])
+        self.assertIsNone(self.driver.get_related('chats', 'chat_2'))
+
+    def test_not_normalized(self):
+        self.driver.normalized_payloads = False
+        msg_1, msg_2 = self.receive_messages()
+
+        self.assertIsNone(msg_1.chat)
@@ -0,0 +1,217 @@
+from asyncio import sleep
+
+from whalesong.results import CallbackWorkers, MonitorResult, OverflowPolicy, ResultManager
+from .utils import AsyncTestCase, StubDriver
+
+
+class OverflowPolicyTests(AsyncTestCase):
+
+    def setUp(self):
+        super(OverflowPolicyTests, self).setUp()
+        self.flow_control_calls = []
+        self.result_manager = ResultManager(max_size=4,
+                                            flow_control=lambda result_id, paused: self.flow_control_calls.append(
+                                                (result_id, paused)))
+
+    def fill(self, result, values):
+        for value in values:
+            self.run_async(result.set_partial_result(value))
+
+    def get_items(self, result, count):
+        return [self.run_async(result.__anext__()) for _ in range(count)]
+
+    async def collect(self, result):
+        return [item async for item in result]
+
+    def test_drop_oldest(self):
+        monitor = self.result_manager.request_result(MonitorResult).configure(
+            overflow_policy=OverflowPolicy.DROP_OLDEST)
+        self.fill(monitor, range(6))
+
+        self.assertEqual(self.get_items(monitor, 4), [2, 3, 4, 5])
+        self.assertEqual(monitor.dropped, 2)
+        self.assertEqual(self.flow_control_calls, [])
+
+    def test_drop_newest(self):
+        monitor = self.result_manager.request_result(MonitorResult).configure(
+            overflow_policy=OverflowPolicy.DROP_NEWEST)
+        self.fill(monitor, range(6))
+
+        self.assertEqual(self.get_items(monitor, 4), [0, 1, 2, 3])
+        self.assertEqual(monitor.dropped, 2)
+
+    def test_coalesce(self):
+        monitor = self.result_manager.request_result(MonitorResult).configure(
+            overflow_policy=OverflowPolicy.COALESCE,
+            coalesce_key=lambda evt: evt['id'])
+        self.fill(monitor, [{'id': i % 3, 'value': i} for i in range(10)])
+
+        self.assertEqual(self.get_items(monitor, 3), [{'id': 0, 'value': 9},
+                                                      {'id': 1, 'value': 7},
+                                                      {'id': 2, 'value': 8}])
+        self.assertEqual(monitor.coalesced, 7)
+        self.assertEqual(monitor.dropped, 0)
+
+    def test_coalesce_needs_key(self):
+        monitor = self.result_manager.request_result(MonitorResult)
+
+        with self.assertRaises(ValueError):
+            monitor.configure(overflow_policy=OverflowPolicy.COALESCE)
+
+    def test_errors_never_dropped(self):
+        monitor = self.result_manager.request_result(MonitorResult).configure(
+            overflow_policy=OverflowPolicy.DROP_NEWEST)
+        self.fill(monitor, range(6))
+        self.run_async(monitor.set_error_result({'name': 'StopMonitor'}))
+
+        self.assertEqual(self.run_async(self.collect(monitor)), [0, 1, 2, 3])
+
+    def test_block_pauses_and_resumes(self):
+        monitor = self.result_manager.request_result(MonitorResult)
+        self.fill(monitor, range(6))
+
+        self.assertEqual(self.flow_control_calls, [(monitor.result_id, True)])
+        self.assertEqual(monitor.dropped, 0)
+
+        # It resumes when queue is half empty.
+        self.assertEqual(self.get_items(monitor, 3), [0, 1, 2])
+        self.assertEqual(self.flow_control_calls, [(monitor.result_id, True)])
+        self.assertEqual(self.get_items(monitor, 1), [3])
+        self.assertEqual(self.flow_control_calls, [(monitor.result_id, True), (monitor.result_id, False)])
+
+    def test_block_bounded_while_paused(self):
+        monitor = self.result_manager.request_result(MonitorResult)
+        self.fill(monitor, range(20))
+
+        self.assertEqual(self.get_items(monitor, 8), list(range(12, 20)))
+        self.assertEqual(monitor.dropped, 12)
+
+    def test_block_without_flow_control(self):
+        result_manager = ResultManager(max_size=4)
+        monitor = result_manager.request_result(MonitorResult)
+        self.fill(monitor, range(6))
+
+        self.assertEqual(self.get_items(monitor, 4), [2, 3, 4, 5])
+        self.assertEqual(monitor.dropped, 2)
+
+    def test_cancel_resumes(self):
+        monitor = self.result_manager.request_result(MonitorResult)
+        self.fill(monitor, range(6))
+        monitor.cancel()
+
+        self.assertEqual(self.flow_control_calls, [(monitor.result_id, True), (monitor.result_id, False)])
+
+
+class DriverFlowControlTests(AsyncTestCase):
+
+    def setUp(self):
+        super(DriverFlowControlTests, self).setUp()
+        self.driver = StubDriver(result_max_size=2, loop=self.loop)
+
+    def test_pause_and_browser_drops(self):
+        monitor = self.driver.execute_command('monitorTest', result_class=MonitorResult)
+        for i in range(3):
+            self.run_async(self.driver.process_result({'exId': monitor.result_id,
+                                                       'type': 'PARTIAL',
+                                                       'params': i}))
+        self.run_pending()
+
+        self.assertEqual([cmd['params'] for cmd in self.driver.get_commands('pauseResult')],
+                         [{'exId': monitor.result_id}])
+
+        self.run_async(self.driver.process_result({'exId': monitor.result_id,
+                                                   'type': 'DROPPED',
+                                                   'params': {'count': 5}}))
+        self.assertEqual(monitor.dropped, 5)
+
+    def test_stop_monitor_resumes(self):
+        monitor = self.driver.execute_command('monitorTest', result_class=MonitorResult)
+        for i in range(3):
+            self.run_async(self.driver.process_result({'exId': monitor.result_id,
+                                                       'type': 'PARTIAL',
+                                                       'params': i}))
+        self.driver.stop_monitor(monitor)
+        self.run_pending()
+
+        self.assertEqual([cmd['command'] for cmd in self.driver.commands[1:]],
+                         ['pauseResult', 'resumeResult', 'stopMonitor'])
+
+
+class CallbackWorkersTests(AsyncTestCase):
+
+    def setUp(self):
+        super(CallbackWorkersTests, self).setUp()
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def callback(self, arg):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await sleep(0.001)
+            if arg == 'error':
+                raise RuntimeError('Callback error')
+            self.calls.append(arg)
+        finally:
+            self.active -= 1
+
+    def submit(self, workers, events):
+        for evt in events:
+            self.run_async(workers.submit(evt))
+        self.run_async(workers.close())
+
+    def test_concurrency(self):
+        workers = CallbackWorkers(self.callback, concurrency=3)
+        self.submit(workers, range(20))
+
+        self.assertEqual(sorted(self.calls), list(range(20)))
+        self.assertEqual(self.max_active, 3)
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            CallbackWorkers(self.callback, concurrency=0)
+
+    def test_key_order(self):
+        workers = CallbackWorkers(self.callback, concurrency=4, key=lambda evt: evt[0])
+        self.submit(workers, [(i % 5, i) for i in range(40)])
+
+        self.assertEqual(len(self.calls), 40)
+        for key in range(5):
+            values = [value for evt_key, value in self.calls if evt_key == key]
+            self.assertEqual(values, sorted(values))
+
+    def test_errors_do_not_stop_workers(self):
+        workers = CallbackWorkers(self.callback, concurrency=1)
+        self.submit(workers, [1, 'error', 2])
+
+        self.assertEqual(self.calls, [1, 2])
+        self.assertEqual(workers.errors, 1)
+
+    def test_batch_size(self):
+        workers = CallbackWorkers(self.callback, concurrency=1, batch_size=4)
+        self.submit(workers, range(10))
+
+        self.assertEqual(self.calls, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+
+    def test_batch_timeout(self):
+        workers = CallbackWorkers(self.callback, concurrency=1, batch_size=10, batch_timeout=0.01)
+        self.run_async(workers.submit(0))
+        self.run_async(workers.submit(1))
+        self.run_async(sleep(0.05))
+        self.submit(workers, [2])
+
+        self.assertEqual(self.calls, [[0, 1], [2]])
+
+    def test_monitor_callback(self):
+        monitor = ResultManager().request_result(MonitorResult)
+        workers = monitor.add_callback(self.callback, concurrency=2)
+        monitor.start_monitor()
+
+        for value in range(5):
+            self.run_async(monitor.set_partial_result(value))
+        self.run_async(monitor.set_error_result({'name': 'StopMonitor'}))
+        self.run_async(sleep(0.05))
+
+        self.assertEqual(sorted(self.calls), list(range(5)))
+        self.assertEqual(workers._workers, [])
@@ -0,0 +1,98 @@
+from asyncio import Task, gather, new_event_loop, set_event_loop, sleep, wait_for
+from io import BytesIO
+from typing import Any, AsyncIterator, Dict, List
+from unittest import TestCase
+
+from whalesong.driver import BaseWhalesongDriver
+
+try:
+    from asyncio import all_tasks
+except ImportError:  # pragma: no cover
+    all_tasks = Task.all_tasks
+
+
+class StubDriver(BaseWhalesongDriver):
+    """
+    Driver which keeps sent commands instead of sending them to a browser.
+    """
+
+    def __init__(self, **kwargs):
+        super(StubDriver, self).__init__(autostart=False, **kwargs)
+
+        #: Sent commands.
+        self.commands: List[Dict[str, Any]] = []
+
+        #: Files to download by URL.
+        self.files: Dict[str, bytes] = {}
+
+        #: Number of downloads by URL.
+        self.downloads: Dict[str, int] = {}
+
+    def get_commands(self, command: str) -> List[Dict[str, Any]]:
+        return [cmd for cmd in self.commands if cmd['command'] == command]
+
+    async def _internal_start_driver(self):
+        pass
+
+    async def connect(self):
+        pass
+
+    async def refresh(self):
+        pass
+
+    async def _internal_run_scriptlet(self, script):
+        pass
+
+    async def _internal_screenshot(self):
+        pass
+
+    async def _internal_element_screenshot(self, element) -> bytes:
+        pass
+
+    async def _internal_get_element(self, css_selector: str):
+        pass
+
+    async def _execute_command(self, result_id, command, params):
+        self.commands.append({'exId': result_id,
+                              'command': command,
+                              'params': params})
+
+    async def _internal_close(self):
+        pass
+
+    def _get_file(self, url) -> bytes:
+        self.downloads[url] = self.downloads.get(url, 0) + 1
+        return self.files[url]
+
+    async def download_file(self, url) -> BytesIO:
+        return BytesIO(self._get_file(url))
+
+    async def download_file_stream(self, url, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        data = self._get_file(url)
+        for idx in range(0, len(data), chunk_size):
+            yield data[idx:idx + chunk_size]
+
+
+class AsyncTestCase(TestCase):
+
+    def setUp(self):
+        self.loop = new_event_loop()
+        set_event_loop(self.loop)
+
+    def tearDown(self):
+        tasks = all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(gather(*tasks, return_exceptions=True))
+        self.loop.close()
+        set_event_loop(None)
+
+    def run_async(self, coro, timeout: float = 5):
+        return self.loop.run_until_complete(wait_for(coro, timeout))
+
+    def run_pending(self):
+        """
+        Run pending callbacks and tasks.
+        """
+        for _ in range(5):
+            self.loop.run_until_complete(sleep(0))
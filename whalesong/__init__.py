@@ -15,6 +15,7 @@ from .managers.sticker_pack import StickerPackCollectionManager
 from .managers.storage import StorageManager
 from .managers.stream import StreamManager
 from .managers.status_v3 import StatusV3CollectionManager
+from .managers.upload import UploadManager
 from .managers.wap import WapManager
 from .results import MonitorResult, Result
 
@@ -46,10 +47,39 @@ class Whalesong(BaseManager):
         :param extra_options: Extra parametres for browser commandline.
         :param loop: Event loop.
 
+        :param http_connector: HTTP connector used to download files. It could be shared between drivers.
+        :type http_connector: aiohttp.BaseConnector
+        :param connector_options: Options used to build HTTP connector when `http_connector` is not set.
+                                  See :class:`aiohttp.TCPConnector`.
+        :type connector_options: dict
+        :param crypto_executor: Executor used to decrypt media files. By default, loop's default executor.
+        :type crypto_executor: concurrent.futures.Executor
+        :param media_cache: Decrypted media cache. By default, media files are not cached.
+        :type media_cache: whalesong.media_cache.MediaCache
+        :param normalized_payloads: Whether messages must reference their chat and sender by identifier. Related
+                                    objects are sent once per results batch and shared between messages.
+        :type normalized_payloads: bool
+        :param share_monitors: Whether identical monitors must share a browser monitor.
+                               See :mod:`whalesong.monitor_hub`.
+        :type share_monitors: bool
+        :param result_max_size: Default maximum number of pending items of iterators and monitors.
+                                By default, they are unbounded.
+        :type result_max_size: int
+        :param overflow_policy: Default policy when iterator's or monitor's pending items queue is full.
+                                See :class:`~whalesong.results.OverflowPolicy`.
+        :type overflow_policy: whalesong.results.OverflowPolicy
+
         :param loadstyles: Whether CSS styles must be loaded. It is need in order to get QR image. (Only for Firefox)
         :type loadstyles: bool
         :param interval: Polling responses interval in seconds. Default 0.5 seconds. (Only for Firefox)
         :type interval: float
+        :param long_polling: Whether responses must be polled using long polling. (Only for Firefox)
+        :type long_polling: bool
+        :param hold_time: Maximum time in seconds a long polling request waits for new results. Commands
+                          issued while a request is waiting are delayed until it finishes, so long polling
+                          reduces results latency but not commands latency. By default, same as `interval`.
+                          (Only for Firefox)
+        :type hold_time: float
         """
 
         if driver is None:
@@ -76,6 +106,7 @@ class Whalesong(BaseManager):
         self._submanagers['live_locations'] = LiveLocationCollectionManager(self._driver, manager_path='liveLocations')
         self._submanagers['mutes'] = MuteCollectionManager(self._driver, manager_path='mutes')
         self._submanagers['status_v3'] = StatusV3CollectionManager(self._driver, manager_path='statusV3')
+        self._submanagers['uploads'] = UploadManager(self._driver, manager_path='uploads')
         self._fut_running = None
 
     @property
@@ -129,7 +160,7 @@ class Whalesong(BaseManager):
 
         :param monitor: Monitor object to stop.
         """
-        return self._driver.execute_command('stopMonitor', {'monitorId': monitor.result_id})
+        return self._driver.stop_monitor(monitor)
 
     async def cancel_iterators(self):
         """
@@ -1,13 +1,30 @@
 from abc import ABC, abstractmethod
 from asyncio import AbstractEventLoop, Future, ensure_future, get_event_loop
+from collections import OrderedDict
+from concurrent.futures import Executor
 from io import BytesIO
 from logging import Logger, getLogger
 from pathlib import Path
-from typing import Any, Dict, Optional, Type, overload
+from typing import Any, AsyncIterator, Dict, Optional, Type, overload
 
-from aiohttp import ClientSession
+from aiohttp import BaseConnector, ClientSession, TCPConnector
 
-from .results import IteratorResult, MonitorResult, Result, ResultManager
+from .media_cache import MediaCache
+from .monitor_hub import MonitorHub, is_monitor_result_class
+from .models import BaseModel, bind_related
+from .results import IteratorResult, MonitorResult, OverflowPolicy, Result, ResultManager
+
+
+#: Maximum number of related objects of each kind kept by identity map.
+RELATED_CACHE_SIZE = 10000
+
+#: Default HTTP connector options used to download files.
+DEFAULT_CONNECTOR_OPTIONS = {
+    'limit': 100,
+    'limit_per_host': 10,
+    'keepalive_timeout': 30,
+    'ttl_dns_cache': 300
+}
 
 
 class BaseWhalesongDriver(ABC):
@@ -17,6 +34,14 @@ class BaseWhalesongDriver(ABC):
                  autostart: bool = True,
                  headless: bool = False,
                  extra_options: Optional[Dict[str, Any]] = None,
+                 http_connector: Optional[BaseConnector] = None,
+                 connector_options: Optional[Dict[str, Any]] = None,
+                 crypto_executor: Optional[Executor] = None,
+                 media_cache: Optional[MediaCache] = None,
+                 normalized_payloads: bool = False,
+                 share_monitors: bool = False,
+                 result_max_size: int = 0,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
                  logger: Optional[Logger] = None,
                  loop: Optional[AbstractEventLoop] = None):
         self._fut_start: Future = None
@@ -24,7 +49,31 @@ class BaseWhalesongDriver(ABC):
         self._fut_running: Future = None
         self.loop = loop or get_event_loop()
         self.logger = logger or getLogger('whalesong.driver')
-        self.result_manager = ResultManager()
+        self.result_manager = ResultManager(max_size=result_max_size,
+                                            overflow_policy=overflow_policy,
+                                            flow_control=self._flow_control)
+
+        self.connector_options = DEFAULT_CONNECTOR_OPTIONS.copy()
+        self.connector_options.update(connector_options or {})
+        self._http_connector = http_connector
+        self._http_session: ClientSession = None
+
+        #: Executor used to decrypt media files. If it is `None` default loop executor will be used.
+        self.crypto_executor = crypto_executor
+
+        #: Decrypted media cache. If it is `None` media files are not cached.
+        self.media_cache = media_cache
+
+        #: Whether messages reference their chat and sender by identifier. Related objects
+        #: are sent once per results batch and they are shared using identity map.
+        self.normalized_payloads = normalized_payloads
+
+        #: Identity map of related objects by kind and identifier. Least recently used objects are
+        #: evicted, and it is cleared when scriptlet is run again.
+        self.related: Dict[str, 'OrderedDict[str, BaseModel]'] = {}
+
+        #: Shared monitor subscriptions. If it is `None` each monitor is registered on browser.
+        self.monitor_hub: Optional[MonitorHub] = MonitorHub(self) if share_monitors else None
 
         self.options = {
             'headless': headless
@@ -65,9 +114,16 @@ class BaseWhalesongDriver(ABC):
         pass
 
     async def run_scriptlet(self):
+        # Scriptlet sends related objects again after a refresh.
+        self.related.clear()
+
         with open(Path(Path(__file__).parent, "js", "whalesong.js"), "r") as script:
             await self._internal_run_scriptlet(script.read())
 
+        if self.normalized_payloads:
+            # It is the first command, so it is executed before any other.
+            self.execute_command('setNormalizedPayloads', {'enabled': True})
+
     @abstractmethod
     async def _internal_run_scriptlet(self, script):
         pass
@@ -116,8 +172,11 @@ class BaseWhalesongDriver(ABC):
     def execute_command(self, command, params=None, *, result_class=None):
         if result_class is None:
             result_class = Result
+        elif self.monitor_hub is not None and is_monitor_result_class(result_class):
+            return self.monitor_hub.subscribe(command, params, result_class)
 
         result = self.result_manager.request_result(result_class)
+        self.configure_related(result)
 
         ensure_future(self._execute_command(result_id=result.result_id,
                                             command=command,
@@ -125,6 +184,22 @@ class BaseWhalesongDriver(ABC):
                       loop=self.loop)
         return result
 
+    def _flow_control(self, result_id: str, paused: bool):
+        self.execute_command('pauseResult' if paused else 'resumeResult', {'exId': result_id})
+
+    def stop_monitor(self, monitor: MonitorResult) -> Result:
+        """
+        Stop a monitor. Shared monitors are only stopped on browser when they have no more subscribers.
+
+        :param monitor: Monitor to stop.
+        """
+        if self.monitor_hub is not None and monitor in self.monitor_hub:
+            return self.monitor_hub.unsubscribe(monitor)
+
+        # Held results must reach monitor, so it gets its end.
+        monitor.resume()
+        return self.execute_command('stopMonitor', {'monitorId': monitor.result_id})
+
     @abstractmethod
     async def _execute_command(self, result_id, command, params):
         pass
@@ -133,14 +208,102 @@ class BaseWhalesongDriver(ABC):
         ensure_future(self.process_result(result), loop=self.loop)
         return True
 
+    def process_results_sync(self, results):
+        ensure_future(self.process_results(results), loop=self.loop)
+        return True
+
+    async def process_results(self, results):
+        for result in results:
+            await self.process_result(result)
+
+    async def process_execution_errors(self, errors):
+        for err in errors:
+            self.logger.error(err)
+            try:
+                await self.result_manager.set_error_result(err['executionsObj']['exId'], err)
+            except KeyError:
+                pass
+
+    def _get_related_model_class(self, kind: str) -> Type[BaseModel]:
+        from .managers.chat import Chat
+        from .managers.contact import Contact
+
+        return {'chats': Chat, 'contacts': Contact}[kind]
+
+    def process_related(self, related: Dict[str, Dict[str, Any]]):
+        """
+        Update identity map using related objects. Known objects are updated in place, so
+        every model referencing them gets new data.
+
+        :param related: Related objects data by kind and identifier.
+        """
+        for kind, items in related.items():
+            try:
+                model_class = self._get_related_model_class(kind)
+            except KeyError:
+                self.logger.warning('Unknown related kind: {}'.format(kind))
+                continue
+
+            models = self.related.setdefault(kind, OrderedDict())
+            for item_id, data in items.items():
+                try:
+                    models[item_id].import_data(data)
+                    models.move_to_end(item_id)
+                except KeyError:
+                    models[item_id] = model_class(data)
+
+            while len(models) > RELATED_CACHE_SIZE:
+                models.popitem(last=False)
+
+    def get_related(self, kind: str, related_id: str) -> Optional[BaseModel]:
+        """
+        Get a related object from identity map.
+
+        :param kind: Related object kind.
+        :param related_id: Related object identifier.
+        :return: Related object or `None` if it is unknown.
+        """
+        try:
+            models = self.related[kind]
+            model = models[related_id]
+        except KeyError:
+            return None
+
+        models.move_to_end(related_id)
+        return model
+
+    def configure_related(self, result: Result):
+        """
+        Bind related objects to models mapped by a result on normalized payloads. Related objects
+        are not set on model data, so models which share them are not modified by them.
+
+        :param result: Result object.
+        """
+        fn_map = result.fn_map
+        if not self.normalized_payloads or fn_map is None:
+            return
+
+        def map_related(data):
+            obj = fn_map(data)
+            bind_related(obj, self.get_related)
+            return obj
+
+        result.fn_map = map_related
+
     async def process_result(self, result):
         try:
+            if result['type'] == 'RELATED':
+                self.process_related(result['params'])
+                return
+
             if result['type'] == 'FINAL':
                 await self.result_manager.set_final_result(result['exId'], result['params'])
             elif result['type'] == 'PARTIAL':
                 await self.result_manager.set_partial_result(result['exId'], result['params'])
             elif result['type'] == 'ERROR':
                 await self.result_manager.set_error_result(result['exId'], result['params'])
+            elif result['type'] == 'DROPPED':
+                self.result_manager.add_dropped(result['exId'], result['params']['count'])
         except Exception as ex:
             self.logger.exception(ex)
 
@@ -156,6 +319,7 @@ class BaseWhalesongDriver(ABC):
 
         self._fut_stop = ensure_future(self._internal_close())
         await self._fut_stop
+        await self.close_http_session()
         self._fut_start = None
         self._fut_running.set_result(None)
 
@@ -171,10 +335,42 @@ class BaseWhalesongDriver(ABC):
         for it in self.result_manager.get_monitors():
             await it.set_error_result({'name': 'StopIterator'})
 
+    def get_http_session(self) -> ClientSession:
+        """
+        Get HTTP client session used to download files. It is created on first use and it is
+        reused in order to keep connections alive. If a connector was set on constructor it will
+        be used (and it will not be closed with driver); otherwise a connector is built
+        using `connector_options`.
+        """
+        if self._http_session is None or self._http_session.closed:
+            if self._http_connector is not None:
+                self._http_session = ClientSession(connector=self._http_connector, connector_owner=False)
+            else:
+                self._http_session = ClientSession(connector=TCPConnector(**self.connector_options))
+
+        return self._http_session
+
+    async def close_http_session(self):
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+
     async def download_file(self, url) -> BytesIO:
-        async with ClientSession() as session:
-            async with session.get(url) as resp:
-                return BytesIO(await resp.read())
+        """
+        Download a file. It raises :class:`aiohttp.ClientResponseError` on HTTP error statuses.
+        """
+        async with self.get_http_session().get(url) as resp:
+            resp.raise_for_status()
+            return BytesIO(await resp.read())
+
+    async def download_file_stream(self, url, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """
+        Download a file in chunks. It raises :class:`aiohttp.ClientResponseError` on HTTP error statuses.
+        """
+        async with self.get_http_session().get(url) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                yield chunk
 
     async def wait_until_stop(self):
         if self._fut_running is None:
@@ -1,11 +1,12 @@
-from asyncio import AbstractEventLoop, Future, Task, ensure_future, sleep
-from json import dumps
+import json
+from asyncio import AbstractEventLoop, Future, Handle, Lock, Task, ensure_future, sleep
 from logging import Logger
+from os import makedirs, replace
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pyppeteer import launch
-from pyppeteer.browser import Browser
+from pyppeteer.browser import Browser, BrowserContext
 from pyppeteer.page import Page
 
 from .driver import BaseWhalesongDriver
@@ -37,23 +38,129 @@ DEFAULT_CHROMIUM_ARGS = [
 ]
 
 
+EXECUTE_COMMANDS_SCRIPT = '(executions) => window.manager.poll(executions)'
+
+DUMP_STORAGE_SCRIPT = '() => JSON.stringify(Object.assign({}, window.localStorage))'
+
+# Storage is restored only once per tab, so it does not overwrite newer data on refresh.
+RESTORE_STORAGE_SCRIPT = '''(data) => {
+    if (window.location.origin !== 'https://web.whatsapp.com' || window.sessionStorage.getItem('whalesongRestored')) {
+        return;
+    }
+    for (const key of Object.keys(data)) {
+        window.localStorage.setItem(key, data[key]);
+    }
+    window.sessionStorage.setItem('whalesongRestored', '1');
+}'''
+
+STORAGE_FILENAME = 'local_storage.json'
+
+
+class SharedBrowser:
+    """
+    Chromium browser shared by many drivers. Each driver uses its own incognito browser context,
+    so sessions are isolated. Browser is launched when first driver starts and it is closed
+    when last driver stops.
+
+    .. code-block:: python
+
+        browser = SharedBrowser(headless=True)
+
+        whalesong_1 = Whalesong(driver=WhalesongDriver(profile='/path/to/profile_1', shared_browser=browser))
+        whalesong_2 = Whalesong(driver=WhalesongDriver(profile='/path/to/profile_2', shared_browser=browser))
+
+    .. warning::
+
+        Only local storage is saved on profile directory (see :meth:`WhalesongDriver.save_storage`).
+        IndexedDB databases and cookies of incognito contexts are lost when driver stops, so sessions
+        which depend on them must be logged again.
+
+    :param headless: Whether browser must be started with headless flag.
+    :param extra_options: Extra launch options.
+    :param loop: Event loop.
+    """
+
+    def __init__(self, *,
+                 headless: bool = False,
+                 extra_options: Optional[Dict[str, Any]] = None,
+                 loop: Optional[AbstractEventLoop] = None):
+        self.options = {
+            'headless': headless,
+            # Browser contexts could not live in a single process browser.
+            'args': [arg for arg in DEFAULT_CHROMIUM_ARGS if arg != '--single-process']
+        }
+
+        try:
+            self.options.update(extra_options)
+        except TypeError:
+            pass
+
+        if loop is not None:
+            self.options['loop'] = loop
+
+        self.browser: Browser = None
+        self._refs = 0
+        self._lock = Lock()
+
+    @property
+    def refs(self) -> int:
+        """
+        Number of drivers using browser.
+        """
+        return self._refs
+
+    async def acquire(self) -> Browser:
+        """
+        Get browser. It will be launched if it is not running.
+
+        :return: Browser.
+        """
+        async with self._lock:
+            if self.browser is None:
+                self.browser = await launch(**self.options)
+            self._refs += 1
+            return self.browser
+
+    async def release(self):
+        """
+        Release browser. It will be closed if no driver is using it.
+        """
+        async with self._lock:
+            self._refs -= 1
+            if self._refs <= 0 and self.browser is not None:
+                self._refs = 0
+                browser = self.browser
+                self.browser = None
+                await browser.close()
+
+
 class WhalesongDriver(BaseWhalesongDriver):
 
     def __init__(self, profile: str = None, *,
                  autostart: bool = True,
                  headless: bool = False,
+                 batch_commands: bool = True,
+                 batch_window: float = 0,
+                 shared_browser: Optional[SharedBrowser] = None,
                  extra_options: Optional[Dict[str, Any]] = None,
                  logger: Optional[Logger] = None,
-                 loop: Optional[AbstractEventLoop] = None):
+                 loop: Optional[AbstractEventLoop] = None,
+                 **kwargs):
         super(WhalesongDriver, self).__init__(autostart=autostart,
                                               headless=headless,
                                               extra_options=extra_options,
                                               logger=logger,
-                                              loop=loop)
+                                              loop=loop,
+                                              **kwargs)
 
         self.driver: Browser = None
         self.page: Page = None
 
+        self.profile = Path(profile).resolve() if profile else None
+        self.shared_browser = shared_browser
+        self.context: BrowserContext = None
+        self._storage_dump: str = None
+
         self.options.update({
             'userDataDir': Path(profile).resolve() if profile else None,
             'loop': self.loop
@@ -66,17 +173,39 @@ class WhalesongDriver(BaseWhalesongDriver):
 
         self._fut_keep_alive: Future = None
 
+        self.batch_commands = batch_commands
+        self.batch_window = batch_window
+        self._pendant: List[Dict[str, Any]] = []
+        self._flush_handle: Handle = None
+
     async def _internal_start_driver(self):
-        self.driver = await launch(
-            **self.options)
-        pages = await self.driver.pages()
-        self.page = pages[0]
+        if self.shared_browser is not None:
+            self.driver = await self.shared_browser.acquire()
+            try:
+                self.context = await self.driver.createIncognitoBrowserContext()
+                self.page = await self.context.newPage()
+                await self._restore_storage()
+            except BaseException:
+                # Browser must not be kept alive by a driver which did not start.
+                try:
+                    if self.context is not None:
+                        await self.context.close()
+                finally:
+                    self.context = None
+                    await self.shared_browser.release()
+                raise
+        else:
+            self.driver = await launch(
+                **self.options)
+            pages = await self.driver.pages()
+            self.page = pages[0]
+
         await self.page.setUserAgent(
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_12_6) AppleWebKit/537.36 '
             '(KHTML, like Gecko) Chrome/65.0.3312.0 Safari/537.36'
         )
         await self.page.setViewport({'width': 800, 'height': 600})
-        await self.page.exposeFunction('whalesongPushResult', self.process_result_sync)
+        await self.page.exposeFunction('whalesongPushResults', self.process_results_sync)
 
     async def connect(self):
         await self.start_driver()
@@ -104,9 +233,97 @@ class WhalesongDriver(BaseWhalesongDriver):
         return await self.page.querySelector(css_selector)
 
     async def _execute_command(self, result_id, command, params):
-        await self.page.evaluate(
-            f'(function() {{window.manager.executeCommand("{result_id}", "{command}", {dumps(params)})}})()'
-        )
+        execution = {'exId': result_id,
+                     'command': command,
+                     'params': params or {}}
+
+        if not self.batch_commands:
+            await self._send_executions([execution])
+            return
+
+        self._pendant.append(execution)
+
+        if self._flush_handle is None:
+            if self.batch_window:
+                self._flush_handle = self.loop.call_later(self.batch_window, self._flush_executions)
+            else:
+                self._flush_handle = self.loop.call_soon(self._flush_executions)
+
+    def _flush_executions(self):
+        self._flush_handle = None
+        pendant = self._pendant
+        self._pendant = []
+        ensure_future(self._send_executions(pendant), loop=self.loop)
+
+    async def _send_executions(self, executions: List[Dict[str, Any]]):
+        try:
+            response = await self.page.evaluate(EXECUTE_COMMANDS_SCRIPT, executions)
+        except Exception as ex:
+            self.logger.warning(ex)
+            for execution in executions:
+                await self.result_manager.set_error_result(execution['exId'], {'name': 'UnknownError',
+                                                                               'message': str(ex)})
+            return
+
+        try:
+            await self.process_execution_errors(response['errors'])
+        except (KeyError, TypeError):
+            pass
+
+        # Results are pushed, but any result returned by poll (like related objects of
+        # commands mapped synchronously) must not be lost.
+        try:
+            await self.process_results(response['results'])
+        except (KeyError, TypeError):
+            pass
+
+    def _get_storage_path(self) -> Optional[Path]:
+        if self.profile is None:
+            return None
+        return Path(self.profile, STORAGE_FILENAME)
+
+    def _read_storage(self) -> Dict[str, str]:
+        try:
+            with open(self._get_storage_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_storage(self, dump: str):
+        storage_path = self._get_storage_path()
+        makedirs(storage_path.parent, exist_ok=True)
+
+        temp_path = storage_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            f.write(dump)
+
+        replace(temp_path, storage_path)
+
+    async def _restore_storage(self):
+        """
+        Incognito browser contexts are not persisted, so local storage is restored from profile directory.
+        IndexedDB databases and cookies are not persisted.
+        """
+        if self._get_storage_path() is None:
+            return
+
+        data = await self.loop.run_in_executor(None, self._read_storage)
+        self._storage_dump = json.dumps(data)
+        await self.page.evaluateOnNewDocument(RESTORE_STORAGE_SCRIPT, data)
+
+    async def save_storage(self):
+        """
+        Save page local storage on profile directory. It is only used with shared browsers.
+        """
+        if self.context is None or self._get_storage_path() is None:
+            return
+
+        dump = await self.page.evaluate(DUMP_STORAGE_SCRIPT)
+        if dump == self._storage_dump:
+            return
+
+        await self.loop.run_in_executor(None, self._write_storage, dump)
+        self._storage_dump = dump
 
     async def _keep_alive(self, interval=10):
         while not Task.current_task().cancelled():
@@ -115,9 +332,25 @@ class WhalesongDriver(BaseWhalesongDriver):
                 if await self.execute_command('ping') != 'pong':
                     # TODO
                     break
+                await self.save_storage()
             except Exception as ex:
                 self.logger.warning(ex)
 
     async def _internal_close(self):
-        self._fut_keep_alive.cancel()
-        await self.driver.close()
+        if self._fut_keep_alive is not None:
+            self._fut_keep_alive.cancel()
+
+        if self.context is None:
+            await self.driver.close()
+            return
+
+        try:
+            await self.save_storage()
+        except Exception as ex:
+            self.logger.warning(ex)
+
+        try:
+            await self.context.close()
+        finally:
+            self.context = None
+            await self.shared_browser.release()
@@ -14,22 +14,41 @@ from selenium.webdriver.firefox.options import Options
 from .driver import BaseWhalesongDriver
 from .firefox_profile import FirefoxProfile
 
+LONG_POLL_SCRIPT = """
+var done = arguments[arguments.length - 1];
+window.manager.longPoll(arguments[0], arguments[1]).then(done, function (err) {
+    done({'results': [], 'errors': [{'name': 'UnknownError', 'message': String(err)}]});
+});
+"""
+
 
 class WhalesongDriver(BaseWhalesongDriver):
+    MIN_HOLD_TIME = 0.05
+
+    #: Execution lane used to poll results.
+    POLL_LANE = 'poll'
+    #: Execution lane used for slow operations: screenshots, element queries and scriptlet injection.
+    BULK_LANE = 'bulk'
+    #: Execution lane used for browser control: start, navigation and close.
+    CONTROL_LANE = 'control'
 
     def __init__(self, profile: str = None, *,
                  autostart: bool = True,
                  headless: bool = False,
                  interval: float = 0.5,
+                 long_polling: bool = False,
+                 hold_time: Optional[float] = None,
                  loadstyles: bool = False,
                  extra_options: Optional[Dict[str, Any]] = None,
                  logger: Optional[Logger] = None,
-                 loop: Optional[AbstractEventLoop] = None):
+                 loop: Optional[AbstractEventLoop] = None,
+                 **kwargs):
         super(WhalesongDriver, self).__init__(autostart=autostart,
                                               headless=headless,
                                               extra_options=extra_options,
                                               logger=logger,
-                                              loop=loop)
+                                              loop=loop,
+                                              **kwargs)
 
         self._profile = FirefoxProfile(profile_directory=str(Path(profile).resolve()) if profile else None)
 
@@ -48,14 +67,20 @@ class WhalesongDriver(BaseWhalesongDriver):
             'extra_params': extra_options or {},
         })
 
-        self._pool_executor = ThreadPoolExecutor(max_workers=1)
+        self._lane_executors: Dict[str, ThreadPoolExecutor] = {}
         self._pendant: List[Dict[str, Any]] = []
+        # Number of operations running or waiting on bulk and control lanes.
+        self._lane_operations = 0
 
         self.driver: webdriver.Firefox = None
         self._fut_running: Future = None
         self._fut_polling: Future = None
 
         self.interval = interval
+        self.long_polling = long_polling
+        # Waiting requests delay new commands, so by default commands are not delayed more than polling does.
+        self.hold_time = interval if hold_time is None else hold_time
+        self._current_hold_time = self.MIN_HOLD_TIME
 
     def free_port(self):
         """
@@ -69,10 +94,33 @@ class WhalesongDriver(BaseWhalesongDriver):
         return port
 
     async def _run_async(self, method: Callable, *args, **kwargs) -> Any:
-        self.logger.debug('Running async method {}'.format(method.__name__))
-        return await self.loop.run_in_executor(self._pool_executor, partial(method, *args, **kwargs))
+        return await self._run_in_lane(self.CONTROL_LANE, method, *args, **kwargs)
+
+    async def _run_in_lane(self, lane: str, method: Callable, *args, **kwargs) -> Any:
+        self.logger.debug('Running async method {} on lane {}'.format(method.__name__, lane))
+        if lane == self.POLL_LANE:
+            return await self.loop.run_in_executor(self._lane_executors[lane], partial(method, *args, **kwargs))
+
+        self._lane_operations += 1
+        try:
+            return await self.loop.run_in_executor(self._lane_executors[lane], partial(method, *args, **kwargs))
+        finally:
+            self._lane_operations -= 1
+
+    def _start_lanes(self):
+        # Each lane has its own thread, so slow operations do not delay result polling.
+        self._lane_executors = {lane: ThreadPoolExecutor(max_workers=1,
+                                                         thread_name_prefix='whalesong-{}'.format(lane))
+                                for lane in (self.POLL_LANE, self.BULK_LANE, self.CONTROL_LANE)}
+
+    def _stop_lanes(self):
+        # Lane threads must not outlive driver (pools start and stop many drivers).
+        for executor in self._lane_executors.values():
+            executor.shutdown(wait=False)
+        self._lane_executors = {}
 
     async def _internal_start_driver(self):
+        self._start_lanes()
         self.driver = await self._run_async(self._internal_start_driver_sync)
 
     def _internal_start_driver_sync(self):
@@ -116,71 +164,93 @@ class WhalesongDriver(BaseWhalesongDriver):
         await self.run_scriptlet()
 
     async def _internal_run_scriptlet(self, script):
-        await self._run_async(self.driver.execute_script, script)
+        await self._run_in_lane(self.BULK_LANE, self.driver.execute_script, script)
 
     async def _internal_screenshot(self):
-        return await self._run_async(self.driver.get_screenshot_as_png)
+        return await self._run_in_lane(self.BULK_LANE, self.driver.get_screenshot_as_png)
 
     async def _internal_element_screenshot(self, element) -> bytes:
         def take_screenshot():
             return element.screenshot_as_png
 
-        return await self._run_async(take_screenshot)
+        return await self._run_in_lane(self.BULK_LANE, take_screenshot)
 
     async def _internal_get_element(self, css_selector: str):
-        return await self._run_async(self.driver.find_element_by_css_selector, css_selector)
+        return await self._run_in_lane(self.BULK_LANE, self.driver.find_element_by_css_selector, css_selector)
 
     async def _execute_command(self, result_id, command, params):
         self._pendant.append({'exId': result_id,
                               'command': command,
                               'params': params or {}})
+        # A waiting long polling request could not be woken up (WebDriver runs one command at a time
+        # for each session), so next one must be short in order to get command results quickly.
+        self._current_hold_time = self.MIN_HOLD_TIME
 
-    async def poll(self):
+    async def poll(self) -> bool:
         pendant = self._pendant
         self._pendant = []
         try:
-            results = await self._run_async(self.driver.execute_script,
-                                            "return window.manager.poll({});".format(dumps(pendant)))
+            if self.long_polling:
+                if self._lane_operations:
+                    # Browser session runs one command at a time, so other lanes' operations
+                    # must not wait behind a long hold.
+                    self._current_hold_time = self.MIN_HOLD_TIME
+                results = await self._run_in_lane(self.POLL_LANE,
+                                                  self.driver.execute_async_script,
+                                                  LONG_POLL_SCRIPT,
+                                                  pendant,
+                                                  int(self._current_hold_time * 1000))
+            else:
+                results = await self._run_in_lane(self.POLL_LANE,
+                                                  self.driver.execute_script,
+                                                  "return window.manager.poll({});".format(dumps(pendant)))
         except Exception as ex:
             self.logger.warning(ex)
-            return
+            return False
+
+        if self.long_polling:
+            self._update_hold_time(busy=bool(pendant or self._lane_operations or
+                                             results.get('results') or results.get('errors')))
 
         try:
-            for err in results['errors']:
-                self.logger.error(err)
-                try:
-                    await self.result_manager.set_error_result(err['executionsObj']['exId'], err)
-                except KeyError:
-                    pass
+            await self.process_execution_errors(results['errors'])
         except KeyError:
             pass
 
         try:
-            for result in results['results']:
-                try:
-                    if result['type'] == 'FINAL':
-                        await self.result_manager.set_final_result(result['exId'], result['params'])
-                    elif result['type'] == 'PARTIAL':
-                        await self.result_manager.set_partial_result(result['exId'], result['params'])
-                    elif result['type'] == 'ERROR':
-                        await self.result_manager.set_error_result(result['exId'], result['params'])
-                except Exception as ex:
-                    self.logger.exception(ex)
+            await self.process_results(results['results'])
         except KeyError:
             pass
 
+        return True
+
+    def _update_hold_time(self, busy: bool):
+        """
+        Adapts long polling hold time. Active sessions use short hold times in order to send
+        new commands quickly; idle sessions grow hold time until `hold_time` in order to avoid
+        useless WebDriver requests. So, `hold_time` is the maximum delay of a command issued
+        on an idle session.
+        """
+        if busy:
+            self._current_hold_time = self.MIN_HOLD_TIME
+        else:
+            self._current_hold_time = min(self._current_hold_time * 2, self.hold_time)
+
     async def _internal_close(self):
         if not self._fut_running.done():
             self._fut_running.set_result(None)
             await self._fut_polling
 
-        await self._run_async(self.driver.close)
+        try:
+            await self._run_async(self.driver.close)
+        finally:
+            self._stop_lanes()
 
     async def _polling(self):
         try:
             while not self._fut_running.done():
-                await self.poll()
-                await sleep(self.interval)
+                if not await self.poll() or not self.long_polling:
+                    await sleep(self.interval)
         finally:
             if not self._fut_running.done():
                 self._fut_running.set_result(None)
@@ -36,3 +36,19 @@ class RequiredCommandName(WhalesongException):
 
 class ModelNotFound(WhalesongException):
     pass
+
+
+class UploadNotFound(WhalesongException):
+    pass
+
+
+class MediaIntegrityError(WhalesongException):
+    pass
+
+
+class InvalidCursor(WhalesongException):
+    pass
+
+
+class InvalidFilter(WhalesongException):
+    pass
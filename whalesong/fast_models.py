@@ -0,0 +1,232 @@
+"""
+Fast models. They are lightweight read-only views of model data, generated from model field
+declarations. Fields are converted on first access (and only once), so reading many items is
+much cheaper than building full models.
+
+Fast models keep same attribute names and value types than regular models. They could be
+converted to regular models using :meth:`~whalesong.fast_models.FastModel.to_model`.
+
+.. warning::
+
+    Fast models (and related models on their fields, like ``msg.chat``) are not instances of their
+    model classes, so ``isinstance(msg, TextMessage)`` is ``False``. Use :func:`is_model_instance`
+    in order to check model class of regular and fast models.
+
+.. code-block:: python
+
+    async for msg in whalesong.chats[chat_id].msgs.get_items(fast=True):
+        print(msg.timestamp, msg.sender_obj.formatted_name)
+
+"""
+from typing import Any, Callable, Dict, Optional, Type
+
+from dirty_models.fields import ArrayField, BaseField, ModelField
+
+from .models import BaseModel, RelatedModelField, get_bound_related
+
+_FAST_MODEL_CLASSES: Dict[Type[BaseModel], Type['FastModel']] = {}
+
+
+class FastModel:
+    """
+    Base fast model.
+    """
+
+    __slots__ = ('_data', '_related')
+
+    __model_class__: Type[BaseModel] = None
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def to_model(self) -> BaseModel:
+        """
+        Build regular model.
+
+        :return: Model object.
+        """
+        return self.__model_class__(self._data)
+
+    @classmethod
+    def get_model_class(cls) -> Type[BaseModel]:
+        """
+        Get regular model class.
+
+        :return: Model class.
+        """
+        return cls.__model_class__
+
+    def export_data(self) -> Dict[str, Any]:
+        """
+        Get raw model data.
+
+        :return: Model data.
+        """
+        return self._data
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, self._data.get('id'))
+
+
+class LazyField:
+    """
+    Fast model field descriptor. Raw value is converted on first access and it is stored on a slot.
+    """
+
+    __slots__ = ('keys', 'default', 'convert', 'slot')
+
+    def __init__(self, keys, default, convert: Callable[[Any], Any], slot):
+        self.keys = keys
+        self.default = default
+        self.convert = convert
+        self.slot = slot
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+
+        try:
+            return self.slot.__get__(obj, cls)
+        except AttributeError:
+            pass
+
+        data = obj._data
+        for key in self.keys:
+            try:
+                value = data[key]
+            except KeyError:
+                continue
+
+            value = None if value is None else self.convert(value)
+            break
+        else:
+            value = self.default
+
+        self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        raise AttributeError('Fast models are read only')
+
+
+class RelatedLazyField(LazyField):
+    """
+    Fast model related field descriptor. When field is not set, related object bound to fast model is returned.
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str, **kwargs):
+        super(RelatedLazyField, self).__init__(**kwargs)
+        self.name = name
+
+    def __get__(self, obj, cls=None):
+        value = super(RelatedLazyField, self).__get__(obj, cls)
+        if value is None:
+            return get_bound_related(obj, self.name)
+        return value
+
+
+def _build_converter(field: BaseField) -> Callable[[Any], Any]:
+    if isinstance(field, ModelField):
+        model_class = field.model_class
+
+        def convert_model(value):
+            if isinstance(value, dict):
+                return map_fast_model(model_class, value)
+            return None
+
+        return convert_model
+
+    if isinstance(field, ArrayField):
+        convert_item = _build_converter(field.field_type)
+
+        def convert_array(value):
+            return [None if v is None else convert_item(v) for v in value]
+
+        return convert_array
+
+    def convert_value(value):
+        if field.check_value(value):
+            return value
+        if field.can_use_value(value):
+            return field.convert_value(value)
+        return None
+
+    return convert_value
+
+
+def fast_model_class(model_class: Type[BaseModel]) -> Type[FastModel]:
+    """
+    Get fast model class for a model class. It is generated on first use.
+
+    :param model_class: Model class.
+    :return: Fast model class.
+    """
+    try:
+        return _FAST_MODEL_CLASSES[model_class]
+    except KeyError:
+        pass
+
+    structure = model_class.get_structure()
+    slots = tuple('_f_{}'.format(name) for name in structure)
+
+    cls = type('Fast{}'.format(model_class.__name__),
+               (FastModel,),
+               {'__slots__': slots,
+                '__model_class__': model_class,
+                '__module__': model_class.__module__,
+                '__doc__': model_class.__doc__})
+
+    for name, field in structure.items():
+        # Structure could keep a field overridden by a mixin, so actual field is used.
+        field = model_class.get_field_obj(name) or field
+        keys = [name] + list(field.alias or [])
+        kwargs = {'keys': keys,
+                  'default': model_class.__default_data__.get(name),
+                  'convert': _build_converter(field),
+                  'slot': getattr(cls, '_f_{}'.format(name))}
+
+        if isinstance(field, RelatedModelField):
+            lazy_field = RelatedLazyField(name=name, **kwargs)
+        else:
+            lazy_field = LazyField(**kwargs)
+
+        for key in keys:
+            setattr(cls, key, lazy_field)
+
+    _FAST_MODEL_CLASSES[model_class] = cls
+    return cls
+
+
+def is_model_instance(obj: Any, model_class: Type[BaseModel]) -> bool:
+    """
+    Check whether an object is an instance of a model class. Fast models are checked using
+    their regular model class.
+
+    :param obj: Model, fast model or any other object.
+    :param model_class: Model class (or tuple of model classes).
+    :return: Whether object is a model class instance.
+    """
+    if isinstance(obj, FastModel):
+        return issubclass(obj.get_model_class(), model_class)
+    return isinstance(obj, model_class)
+
+
+def map_fast_model(model_class: Type[BaseModel], data: Optional[Dict[str, Any]]) -> Optional[FastModel]:
+    """
+    Build a fast model from data. If model class defines `resolve_model_class`
+    (like messages do), it will be used to get actual model class.
+
+    :param model_class: Model class.
+    :param data: Model data.
+    :return: Fast model.
+    """
+    if data is None:
+        return None
+
+    resolve_model_class = getattr(model_class, 'resolve_model_class', None)
+    if resolve_model_class is not None:
+        model_class = resolve_model_class(data)
+
+    return fast_model_class(model_class)(data)
@@ -0,0 +1,223 @@
+"""
+Declarative filters. They are evaluated on browser before items are mapped, so only matching items
+are sent to Python.
+
+Field names are model field names. Related model fields could be used with dotted paths (identifiers
+are compared using their serialized form). Datetimes are compared as timestamps.
+
+.. code-block:: python
+
+    from whalesong.filters import Eq, Gte, In
+
+    where = Eq('chat.id', chat_id) & In('type', ['chat', 'image']) & Gte('timestamp', since)
+
+    async for msg in whalesong.messages.monitor_new(where=where):
+        ...
+
+Filters could be combined using ``&``, ``|`` and ``~`` operators, or using :class:`And`, :class:`Or`
+and :class:`Not` classes.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable, List, Type
+
+from dirty_models.utils import underscore_to_camel
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .managers import BaseModelManager
+
+
+def get_field_path(model_manager_class: Type['BaseModelManager'], field: str) -> str:
+    """
+    Get scriptlet field path from a model field path.
+
+    :param model_manager_class: Model manager class of filtered items.
+    :param field: Model field name or dotted path.
+    :return: Scriptlet field path.
+    """
+    name, *path = field.split('.')
+    return '.'.join([model_manager_class.get_scriptlet_field_name(name)] +
+                    [underscore_to_camel(part) for part in path])
+
+
+def convert_value(value: Any) -> Any:
+    """
+    Convert a value to its scriptlet form.
+
+    :param value: Python value.
+    :return: Scriptlet value.
+    """
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class Filter(ABC):
+    """
+    Base filter.
+    """
+
+    @abstractmethod
+    def to_data(self, model_manager_class: Type['BaseModelManager']) -> List[Any]:
+        """
+        Build scriptlet filter.
+
+        :param model_manager_class: Model manager class of filtered items.
+        :return: Scriptlet filter.
+        """
+        pass
+
+    def __and__(self, other: 'Filter') -> 'Filter':
+        return And(self, other)
+
+    def __or__(self, other: 'Filter') -> 'Filter':
+        return Or(self, other)
+
+    def __invert__(self) -> 'Filter':
+        return Not(self)
+
+
+class FieldFilter(Filter):
+    """
+    Base field filter.
+
+    :param field: Model field name or dotted path.
+    :param value: Value to compare.
+    """
+
+    OPERATOR: ClassVar[str]
+
+    def __init__(self, field: str, value: Any):
+        self.field = field
+        self.value = value
+
+    def to_data(self, model_manager_class: Type['BaseModelManager']) -> List[Any]:
+        return [self.OPERATOR, get_field_path(model_manager_class, self.field), convert_value(self.value)]
+
+    def __repr__(self):
+        return '{}({!r}, {!r})'.format(type(self).__name__, self.field, self.value)
+
+
+class Eq(FieldFilter):
+    """
+    Field is equal to value.
+    """
+
+    OPERATOR = 'eq'
+
+
+class Ne(FieldFilter):
+    """
+    Field is not equal to value.
+    """
+
+    OPERATOR = 'ne'
+
+
+class In(FieldFilter):
+    """
+    Field is equal to any of values.
+    """
+
+    OPERATOR = 'in'
+
+    def __init__(self, field: str, value: Iterable[Any]):
+        super(In, self).__init__(field, list(value))
+
+    def to_data(self, model_manager_class: Type['BaseModelManager']) -> List[Any]:
+        return [self.OPERATOR,
+                get_field_path(model_manager_class, self.field),
+                [convert_value(v) for v in self.value]]
+
+
+class Gt(FieldFilter):
+    """
+    Field is greater than value. Items without value never match.
+    """
+
+    OPERATOR = 'gt'
+
+
+class Gte(FieldFilter):
+    """
+    Field is greater than or equal to value. Items without value never match.
+    """
+
+    OPERATOR = 'gte'
+
+
+class Lt(FieldFilter):
+    """
+    Field is lower than value. Items without value never match.
+    """
+
+    OPERATOR = 'lt'
+
+
+class Lte(FieldFilter):
+    """
+    Field is lower than or equal to value. Items without value never match.
+    """
+
+    OPERATOR = 'lte'
+
+
+class CompoundFilter(Filter):
+    """
+    Base filter which combines many filters.
+
+    :param filters: Filters to combine.
+    """
+
+    OPERATOR: ClassVar[str]
+
+    def __init__(self, *filters: Filter):
+        self.filters = filters
+
+    def to_data(self, model_manager_class: Type['BaseModelManager']) -> List[Any]:
+        return [self.OPERATOR, [f.to_data(model_manager_class) for f in self.filters]]
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(repr(f) for f in self.filters))
+
+
+class And(CompoundFilter):
+    """
+    All filters match.
+    """
+
+    OPERATOR = 'and'
+
+    def __and__(self, other: Filter) -> Filter:
+        # Chained conditions are kept flat.
+        return And(*self.filters, other)
+
+
+class Or(CompoundFilter):
+    """
+    Any filter matches.
+    """
+
+    OPERATOR = 'or'
+
+    def __or__(self, other: Filter) -> Filter:
+        # Chained conditions are kept flat.
+        return Or(*self.filters, other)
+
+
+class Not(Filter):
+    """
+    Filter does not match.
+    """
+
+    def __init__(self, filter: Filter):
+        self.filter = filter
+
+    def to_data(self, model_manager_class: Type['BaseModelManager']) -> List[Any]:
+        return ['not', self.filter.to_data(model_manager_class)]
+
+    def __repr__(self):
+        return 'Not({!r})'.format(self.filter)
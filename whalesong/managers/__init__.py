@@ -1,14 +1,22 @@
-from typing import Any, ClassVar, Dict, Generic, List, Type, TypeVar, Union, cast
+from collections import OrderedDict
+from typing import Any, ClassVar, Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar, Union, cast
 
 from functools import partial
 
+from dirty_models.utils import underscore_to_camel
+
 from ..driver import BaseWhalesongDriver
 from ..errors import ManagerNotFound
+from ..fast_models import map_fast_model
+from ..filters import Filter
 from ..models import BaseModel
 from ..results import IteratorResult, MonitorResult, Result
 
 COMMAND_SEPARATOR = '|'
 
+#: Maximum number of model managers kept by a collection manager.
+MODEL_MANAGERS_CACHE_SIZE = 128
+
 
 class BaseManager:
     """
@@ -24,6 +32,7 @@ class BaseManager:
         self._driver = driver
         self._manager_path = manager_path
         self._submanagers: Dict[str, 'BaseManager'] = {}
+        self._lazy_submanagers: Dict[str, Tuple[Type['BaseManager'], str]] = {}
 
     def _build_command(self, command):
         if self._manager_path:
@@ -50,16 +59,24 @@ class BaseManager:
         """
         self._submanagers[name] = submanager
 
+    def add_lazy_submanager(self, name: str, submanager_class: Type['BaseManager'], manager_path: str):
+        """
+        Add a submanager which will be built on first access.
+
+        :param name: Field where manager will be stored.
+        :param submanager_class: Submanager class.
+        :param manager_path: Submanager path, relative to current manager.
+        """
+        self._lazy_submanagers[name] = (submanager_class, manager_path)
+
     def remove_submanager(self, name: str) -> Result:
         """
         Remove a submanager.
 
         :param name: Field where submanager was stored.
         """
-        try:
-            del self._submanagers[name]
-        except KeyError:
-            pass
+        self._submanagers.pop(name, None)
+        self._lazy_submanagers.pop(name, None)
         return self._execute_command('removeSubmanager', {'name': name})
 
     def get_submanager(self, name: str) -> 'BaseManager':
@@ -70,9 +87,18 @@ class BaseManager:
         """
         try:
             return self._submanagers[name]
+        except KeyError:
+            pass
+
+        try:
+            submanager_class, manager_path = self._lazy_submanagers.pop(name)
         except KeyError:
             raise ManagerNotFound('Manager {} not found'.format(name))
 
+        submanager = submanager_class(driver=self._driver, manager_path=self._build_command(manager_path))
+        self._submanagers[name] = submanager
+        return submanager
+
     __getattr__ = get_submanager
 
     __getitem__ = get_submanager
@@ -88,10 +114,96 @@ class BaseModelManager(BaseManager, Generic[MODEL_TYPE]):
 
     MODEL_CLASS: ClassVar[Type[BaseModel]]
 
+    #: Fields always requested on field projections.
+    REQUIRED_FIELDS: ClassVar[Tuple[str, ...]] = ('id',)
+
+    @classmethod
+    def get_projection(cls, fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+        """
+        Get scriptlet field names of a field projection. Required fields are always included.
+
+        :param fields: Model field names. If it is None, there is no projection.
+        :return: Scriptlet field names.
+        """
+        if fields is None:
+            return None
+
+        projection = []
+        for name in list(cls.REQUIRED_FIELDS) + list(fields):
+            field = cls.MODEL_CLASS.get_field_obj(name)
+            if field is None:
+                # It could be a field of a model subclass.
+                keys = [underscore_to_camel(name)]
+            else:
+                # Underscore-style aliases are never used by scriptlet.
+                keys = [field.name] + [alias for alias in field.alias or [] if '_' not in alias]
+
+            for key in keys:
+                if key not in projection:
+                    projection.append(key)
+
+        return projection
+
+    @classmethod
+    def get_scriptlet_field_name(cls, name: str) -> str:
+        """
+        Get scriptlet model field name. Aliases are names used by scriptlet models.
+
+        :param name: Model field name.
+        :return: Scriptlet field name.
+        """
+        field = cls.MODEL_CLASS.get_field_obj(name)
+        if field is None:
+            return underscore_to_camel(name)
+
+        aliases = [alias for alias in field.alias or [] if '_' not in alias]
+        return aliases[0] if aliases else field.name
+
+    @classmethod
+    def get_order_by(cls, order_by: Optional[Union[str, Iterable[str]]]) -> Optional[List[str]]:
+        """
+        Get scriptlet order fields. Descending fields start with `-`.
+
+        :param order_by: Model field name or names.
+        :return: Scriptlet order fields.
+        """
+        if order_by is None:
+            return None
+
+        if isinstance(order_by, str):
+            order_by = [order_by]
+
+        return [('-' + cls.get_scriptlet_field_name(name[1:])) if name.startswith('-')
+                else cls.get_scriptlet_field_name(name)
+                for name in order_by]
+
+    @classmethod
+    def build_read_params(cls, fields: Optional[Iterable[str]] = None,
+                          where: Optional[Filter] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Build read and monitor command parameters.
+
+        :param fields: Model field names projection.
+        :param where: Items filter.
+        :return: Command parameters.
+        """
+        projection = cls.get_projection(fields)
+        if projection is not None:
+            kwargs['fields'] = projection
+
+        if where is not None:
+            kwargs['where'] = where.to_data(cls)
+
+        return kwargs
+
     @classmethod
     def map_model(cls, data) -> MODEL_TYPE:
         return cls.MODEL_CLASS(data)
 
+    @classmethod
+    def map_fast_model(cls, data) -> MODEL_TYPE:
+        return map_fast_model(cls.MODEL_CLASS, data)
+
     @classmethod
     def get_model_result_class(cls) -> Result[MODEL_TYPE]:
         return cast(Result[MODEL_TYPE], partial(Result, fn_map=cls.map_model))
@@ -114,22 +226,26 @@ class BaseModelManager(BaseManager, Generic[MODEL_TYPE]):
 
         return cast(MonitorResult[Dict[str, Any]], partial(MonitorResult, fn_map=map))
 
-    def get_model(self) -> Result[MODEL_TYPE]:
+    def get_model(self, fields: Optional[Iterable[str]] = None) -> Result[MODEL_TYPE]:
         """
         Get model object
 
+        :param fields: Fields to get. By default, all fields. Model will be partial.
         :return: Model object
         """
         return self._execute_command('getModel',
+                                     self.build_read_params(fields),
                                      result_class=self.get_model_result_class())
 
-    def monitor_model(self) -> MonitorResult[MODEL_TYPE]:
+    def monitor_model(self, fields: Optional[Iterable[str]] = None) -> MonitorResult[MODEL_TYPE]:
         """
         Monitor any change on model.
 
+        :param fields: Fields to get. By default, all fields. Model will be partial.
         :return: Model monitor
         """
         return self._execute_command('monitorModel',
+                                     self.build_read_params(fields),
                                      result_class=self.get_monitor_result_class())
 
     def monitor_field(self, field: str) -> MonitorResult[Dict[str, Any]]:
@@ -154,28 +270,88 @@ class BaseCollectionManager(BaseManager, Generic[MODEL_MANAGER_TYPE]):
 
     MODEL_MANAGER_CLASS: ClassVar[Type[BaseModelManager]]
 
+    def __init__(self, driver: BaseWhalesongDriver, manager_path: str = ''):
+        super(BaseCollectionManager, self).__init__(driver=driver, manager_path=manager_path)
+        self._model_managers: 'OrderedDict[str, MODEL_MANAGER_TYPE]' = OrderedDict()
+
     @classmethod
-    def get_monitor_result_class(cls) -> MonitorResult[MODEL_TYPE]:
+    def get_monitor_result_class(cls, fast: bool = False) -> MonitorResult[MODEL_TYPE]:
+        map_model = cls.MODEL_MANAGER_CLASS.map_fast_model if fast else cls.MODEL_MANAGER_CLASS.map_model
         return cast(MonitorResult[MODEL_TYPE],
-                    partial(MonitorResult[MODEL_TYPE],
-                            fn_map=lambda evt: cls.MODEL_MANAGER_CLASS.map_model(evt['item'])))
+                    partial(MonitorResult,
+                            fn_map=lambda evt: map_model(evt['item'])))
 
     @classmethod
-    def get_iterator_result_class(cls) -> IteratorResult[MODEL_TYPE]:
+    def get_iterator_result_class(cls, fast: bool = False) -> IteratorResult[MODEL_TYPE]:
+        map_model = cls.MODEL_MANAGER_CLASS.map_fast_model if fast else cls.MODEL_MANAGER_CLASS.map_model
         return cast(IteratorResult[MODEL_TYPE],
-                    partial(IteratorResult[MODEL_TYPE], fn_map=cls.MODEL_MANAGER_CLASS.map_model))
+                    partial(IteratorResult, fn_map=map_model))
 
     @classmethod
     def get_item_result_class(cls) -> Result[MODEL_TYPE]:
         return cls.MODEL_MANAGER_CLASS.get_model_result_class()
 
-    def get_items(self) -> IteratorResult[MODEL_TYPE]:
+    def build_read_params(self, fields: Optional[Iterable[str]] = None,
+                          where: Optional[Filter] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Build read and monitor command parameters.
+
+        :param fields: Model field names projection.
+        :param where: Items filter.
+        :return: Command parameters.
+        """
+        return self.MODEL_MANAGER_CLASS.build_read_params(fields, where, **kwargs)
+
+    def get_items(self, fast: bool = False,
+                  fields: Optional[Iterable[str]] = None,
+                  where: Optional[Filter] = None,
+                  limit: Optional[int] = None,
+                  offset: Optional[int] = None,
+                  order_by: Optional[Union[str, Iterable[str]]] = None,
+                  after_cursor: Optional[str] = None) -> IteratorResult[MODEL_TYPE]:
         """
-        Get all items on collection.
+        Get items on collection. Sorting and slicing are done on browser, so only requested
+        items are sent.
 
+        When there are more items, iterator's ``cursor`` attribute is set when iteration finishes.
+        It could be used as ``after_cursor`` in order to get next page using same order.
+
+        .. code-block:: python3
+
+            it = whalesong.chats[chat_id].msgs.get_items(limit=50, order_by='-timestamp')
+            async for msg in it:
+                ...
+
+            async for msg in whalesong.chats[chat_id].msgs.get_items(limit=50, order_by='-timestamp',
+                                                                     after_cursor=it.cursor):
+                ...
+
+        :param fast: Whether items must be mapped to fast models (see :mod:`whalesong.fast_models`).
+                     Fast models are not instances of model classes (see
+                     :func:`~whalesong.fast_models.is_model_instance`).
+        :param fields: Fields to get. By default, all fields. Models will be partial.
+        :param where: Items filter (see :mod:`whalesong.filters`). It is applied before sorting and slicing.
+        :param limit: Maximum number of items. By default, all items.
+        :param offset: Number of items to skip.
+        :param order_by: Field name or names to sort items. Descending fields start with `-`.
+                         By default, collection order.
+        :param after_cursor: Cursor of previous page.
         :return: Async iterator
         """
-        return self._execute_command('getItems', result_class=self.get_iterator_result_class())
+        params = self.build_read_params(fields, where)
+
+        if limit is not None:
+            params['limit'] = limit
+        if offset is not None:
+            params['offset'] = offset
+        if order_by is not None:
+            params['orderBy'] = self.MODEL_MANAGER_CLASS.get_order_by(order_by)
+        if after_cursor is not None:
+            params['afterCursor'] = after_cursor
+
+        return self._execute_command('getItems',
+                                     params,
+                                     result_class=self.get_iterator_result_class(fast=fast))
 
     def get_length(self) -> Result[int]:
         """
@@ -185,26 +361,28 @@ class BaseCollectionManager(BaseManager, Generic[MODEL_MANAGER_TYPE]):
         """
         return self._execute_command('getLength')
 
-    def get_item_by_id(self, item_id: str) -> Result[MODEL_TYPE]:
+    def get_item_by_id(self, item_id: str, fields: Optional[Iterable[str]] = None) -> Result[MODEL_TYPE]:
         """
         Get model by identifier.
 
         :param item_id: Model identifier.
+        :param fields: Fields to get. By default, all fields. Model will be partial.
         :return: Model object.
         """
         return self._execute_command('getItemById',
-                                     {'id': item_id},
+                                     self.build_read_params(fields, id=item_id),
                                      result_class=self.get_item_result_class())
 
-    def find_item_by_id(self, item_id: str) -> Result[MODEL_TYPE]:
+    def find_item_by_id(self, item_id: str, fields: Optional[Iterable[str]] = None) -> Result[MODEL_TYPE]:
         """
         Find model by identifier. If item is not in collection it will try to load it.
 
         :param item_id: Model identifier.
+        :param fields: Fields to get. By default, all fields. Model will be partial.
         :return: Model object.
         """
         return self._execute_command('findItemById',
-                                     {'id': item_id},
+                                     self.build_read_params(fields, id=item_id),
                                      result_class=self.get_item_result_class())
 
     def remove_item_by_id(self, item_id: str) -> Result[None]:
@@ -216,50 +394,72 @@ class BaseCollectionManager(BaseManager, Generic[MODEL_MANAGER_TYPE]):
         return self._execute_command('removeItemById',
                                      {'id': item_id})
 
-    def get_first(self) -> Result[MODEL_TYPE]:
+    def get_first(self, fields: Optional[Iterable[str]] = None) -> Result[MODEL_TYPE]:
         """
         Get first item in collection.
 
+        :param fields: Fields to get. By default, all fields. Model will be partial.
         :return: Model object.
         """
         return self._execute_command('getFirst',
+                                     self.build_read_params(fields),
                                      result_class=self.get_item_result_class())
 
-    def get_last(self) -> Result[MODEL_TYPE]:
+    def get_last(self, fields: Optional[Iterable[str]] = None) -> Result[MODEL_TYPE]:
         """
         Get last item in collection.
 
+        :param fields: Fields to get. By default, all fields. Model will be partial.
         :return: Model object.
         """
         return self._execute_command('getLast',
+                                     self.build_read_params(fields),
                                      result_class=self.get_item_result_class())
 
-    def monitor_add(self) -> MonitorResult[MODEL_TYPE]:
+    def monitor_add(self, fast: bool = False,
+                    fields: Optional[Iterable[str]] = None,
+                    where: Optional[Filter] = None) -> MonitorResult[MODEL_TYPE]:
         """
         Monitor add item collection. Iterate each time a item is added to collection.
 
+        :param fast: Whether items must be mapped to fast models. They are not instances of model classes.
+        :param fields: Fields to get. By default, all fields. Models will be partial.
+        :param where: Items filter (see :mod:`whalesong.filters`).
         :return: Model object iterator
         """
         return self._execute_command('monitorAdd',
-                                     result_class=self.get_monitor_result_class())
+                                     self.build_read_params(fields, where),
+                                     result_class=self.get_monitor_result_class(fast=fast))
 
-    def monitor_remove(self) -> MonitorResult[MODEL_TYPE]:
+    def monitor_remove(self, fast: bool = False,
+                       fields: Optional[Iterable[str]] = None,
+                       where: Optional[Filter] = None) -> MonitorResult[MODEL_TYPE]:
         """
         Monitor remove item collection. Iterate each time a item is removed from collection.
 
+        :param fast: Whether items must be mapped to fast models. They are not instances of model classes.
+        :param fields: Fields to get. By default, all fields. Models will be partial.
+        :param where: Items filter (see :mod:`whalesong.filters`).
         :return: Model object iterator
         """
         return self._execute_command('monitorRemove',
-                                     result_class=self.get_monitor_result_class())
+                                     self.build_read_params(fields, where),
+                                     result_class=self.get_monitor_result_class(fast=fast))
 
-    def monitor_change(self) -> MonitorResult[MODEL_TYPE]:
+    def monitor_change(self, fast: bool = False,
+                       fields: Optional[Iterable[str]] = None,
+                       where: Optional[Filter] = None) -> MonitorResult[MODEL_TYPE]:
         """
         Monitor change item collection. Iterate each time a item change in collection.
 
+        :param fast: Whether items must be mapped to fast models. They are not instances of model classes.
+        :param fields: Fields to get. By default, all fields. Models will be partial.
+        :param where: Items filter (see :mod:`whalesong.filters`).
         :return: Model object iterator
         """
         return self._execute_command('monitorChange',
-                                     result_class=self.get_monitor_result_class())
+                                     self.build_read_params(fields, where),
+                                     result_class=self.get_monitor_result_class(fast=fast))
 
     def monitor_field(self, field: str) -> MonitorResult[Dict[str, Any]]:
         """
@@ -274,15 +474,29 @@ class BaseCollectionManager(BaseManager, Generic[MODEL_MANAGER_TYPE]):
     def get_submanager(self, name: str) -> Union[BaseManager, MODEL_MANAGER_TYPE]:
         """
         Get a submanager. It could be a explicit submanager or contained model manager.
+        Last used model managers are kept, so they are not built on each access.
 
         :param name: Field where submanager was stored.
         """
 
-        try:
+        if name in self._submanagers or name in self._lazy_submanagers:
             return super(BaseCollectionManager, self).get_submanager(name)
-        except ManagerNotFound:
-            return self.MODEL_MANAGER_CLASS(driver=self._driver,
-                                            manager_path=self._build_command(name))
+
+        try:
+            manager = self._model_managers[name]
+            self._model_managers.move_to_end(name)
+            return manager
+        except KeyError:
+            pass
+
+        manager = self.MODEL_MANAGER_CLASS(driver=self._driver,
+                                           manager_path=self._build_command(name))
+        self._model_managers[name] = manager
+
+        if len(self._model_managers) > MODEL_MANAGERS_CACHE_SIZE:
+            self._model_managers.popitem(last=False)
+
+        return manager
 
     __getattr__ = get_submanager
 
@@ -1,3 +1,4 @@
+from asyncio import ensure_future
 from base64 import b64encode
 from io import BytesIO
 from typing import Any, Dict, List, Optional
@@ -9,6 +10,7 @@ from .contact import Contact, ContactManager
 from .group_metadata import GroupMetadata, GroupMetadataManager
 from .mute import Mute, MuteManager
 from .presence import PresenceManager
+from .upload import DEFAULT_CHUNK_SIZE, MediaSource, UploadManager
 from ..driver import BaseWhalesongDriver
 from ..models import BaseModel, DateTimeField
 from ..results import Result
@@ -189,27 +191,20 @@ class ChatManager(BaseModelManager[Chat]):
         super(ChatManager, self).__init__(driver=driver, manager_path=manager_path)
 
         from .message import MessageCollectionManager
-        self.add_submanager('msgs', MessageCollectionManager(driver=self._driver,
-                                                             manager_path=self._build_command('msgs')))
+        self.add_lazy_submanager('msgs', MessageCollectionManager, 'msgs')
 
-        self.add_submanager('msg_load_state', MsgLoadStateManager(driver=self._driver,
-                                                                  manager_path=self._build_command('msgLoadState')))
+        self.add_lazy_submanager('msg_load_state', MsgLoadStateManager, 'msgLoadState')
 
-        self.add_submanager('metadata', GroupMetadataManager(driver=self._driver,
-                                                             manager_path=self._build_command('metadata')))
+        self.add_lazy_submanager('metadata', GroupMetadataManager, 'metadata')
 
-        self.add_submanager('presence', PresenceManager(driver=self._driver,
-                                                        manager_path=self._build_command('presence')))
+        self.add_lazy_submanager('presence', PresenceManager, 'presence')
 
-        self.add_submanager('contact', ContactManager(driver=self._driver,
-                                                      manager_path=self._build_command('contact')))
+        self.add_lazy_submanager('contact', ContactManager, 'contact')
 
         from .live_location import LiveLocationManager
-        self.add_submanager('live_location', LiveLocationManager(driver=self._driver,
-                                                                 manager_path=self._build_command('liveLocation')))
+        self.add_lazy_submanager('live_location', LiveLocationManager, 'liveLocation')
 
-        self.add_submanager('mute', MuteManager(driver=self._driver,
-                                                manager_path=self._build_command('mute')))
+        self.add_lazy_submanager('mute', MuteManager, 'mute')
 
     def send_text(self, text: str,
                   quoted_msg_id: Optional[str] = None,
@@ -271,40 +266,60 @@ class ChatManager(BaseModelManager[Chat]):
 
         return self._execute_command('sendContactPhone', params)
 
-    def send_media(self, media_data: BytesIO,
+    def send_media(self, media_data: MediaSource,
                    content_type: Optional[str] = None, filename: Optional[str] = None,
                    caption: Optional[str] = None,
-                   quoted_msg_id: Optional[str] = None, mentions: Optional[List[str]] = None) -> Result[str]:
+                   quoted_msg_id: Optional[str] = None, mentions: Optional[List[str]] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Result[str]:
         """
-        Send media file to current chat.
+        Send media file to current chat. File is uploaded to browser in chunks, so it is not
+        loaded in memory at once.
 
-        :param media_data: io.ByteIO
+        :param media_data: File path, binary stream (:class:`io.BytesIO`, file object...) or async iterator of bytes.
         :param content_type: File content type. It is used by Whatsapp to known how to render it.
         :param filename: File name.
         :param caption: Media caption.
         :param quoted_msg_id: Quoted message's identifier.
         :param mentions: List of user ids mentioned.
+        :param chunk_size: Upload chunk size in bytes.
         :return: New message's identifier
         """
 
-        params: Dict[str, Any] = {'mediaData': b64encode(media_data.read()).decode()}
+        result = Result(self._driver.result_manager.get_next_id())
 
-        if content_type:
-            params['contentType'] = content_type
+        async def send():
+            try:
+                upload_manager = UploadManager(self._driver, manager_path='uploads')
+                params: Dict[str, Any] = {'uploadId': await upload_manager.upload(media_data,
+                                                                                  chunk_size=chunk_size)}
 
-        if filename:
-            params['filename'] = filename
+                if content_type:
+                    params['contentType'] = content_type
 
-        if caption:
-            params['caption'] = caption
+                if filename:
+                    params['filename'] = filename
 
-        if quoted_msg_id:
-            params['quotedMsgId'] = quoted_msg_id
+                if caption:
+                    params['caption'] = caption
 
-        if mentions:
-            params['mentions'] = mentions
+                if quoted_msg_id:
+                    params['quotedMsgId'] = quoted_msg_id
+
+                if mentions:
+                    params['mentions'] = mentions
+
+                msg_id = await self._execute_command('sendMedia', params)
+            except Exception as ex:
+                if not result.done():
+                    result.set_exception(ex)
+            else:
+                if not result.done():
+                    result.set_result(msg_id)
 
-        return self._execute_command('sendMedia', params)
+        task = ensure_future(send(), loop=self._driver.loop)
+        # Cancelling result stops upload.
+        result.add_done_callback(lambda fut: task.cancel() if fut.cancelled() else None)
+        return result
 
     def leave_group(self) -> Result[None]:
         """
@@ -168,10 +168,7 @@ class ContactManager(BaseModelManager[Contact]):
     def __init__(self, driver: BaseWhalesongDriver, manager_path: str = ''):
         super(ContactManager, self).__init__(driver=driver, manager_path=manager_path)
 
-        self.add_submanager('profile_pic_thumb', ProfilePictureManager(
-            driver=self._driver,
-            manager_path=self._build_command('profilePicThumb')
-        ))
+        self.add_lazy_submanager('profile_pic_thumb', ProfilePictureManager, 'profilePicThumb')
 
     def block(self) -> Result[None]:
         """
@@ -131,10 +131,7 @@ class GroupMetadataManager(BaseModelManager[GroupMetadata]):
     def __init__(self, driver, manager_path=''):
         super(GroupMetadataManager, self).__init__(driver=driver, manager_path=manager_path)
 
-        self.add_submanager('participants', ParticipantCollectionManager(
-            driver=self._driver,
-            manager_path=self._build_command('participants')
-        ))
+        self.add_lazy_submanager('participants', ParticipantCollectionManager, 'participants')
 
     def group_invite_code(self) -> Result[None]:
         return self._execute_command('groupInviteCode')
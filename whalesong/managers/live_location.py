@@ -116,10 +116,7 @@ class LiveLocationManager(BaseModelManager[LiveLocation]):
     def __init__(self, driver, manager_path=''):
         super(LiveLocationManager, self).__init__(driver=driver, manager_path=manager_path)
 
-        self.add_submanager('participants', ParticipantCollectionManager(
-            driver=self._driver,
-            manager_path=self._build_command('participants')
-        ))
+        self.add_lazy_submanager('participants', ParticipantCollectionManager, 'participants')
 
     def subscribe(self) -> Result[None]:
         """
@@ -1,12 +1,18 @@
 import binascii
+from asyncio import Queue, TimeoutError, ensure_future, sleep
 from base64 import b64decode
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from functools import lru_cache
 from io import BytesIO
-from typing import Dict, Type, cast
+from os import PathLike, remove
+from typing import AsyncIterator, BinaryIO, Dict, Iterable, Optional, Tuple, Type, Union, cast
 
+from aiohttp import ClientError, ClientResponseError
 from axolotl.kdf.hkdfv3 import HKDFv3
 from axolotl.util.byteutil import ByteUtil
 from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import constant_time, hashes, hmac, padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from dirty_models import ArrayField, BooleanField, EnumField, FloatField, IntegerField, ModelField, \
     StringIdField, TimedeltaField
@@ -16,7 +22,10 @@ from . import BaseCollectionManager, BaseModelManager
 from .chat import Chat
 from .contact import Contact
 from ..driver import BaseWhalesongDriver
-from ..models import Base64Field, BaseModel, DateTimeField
+from ..errors import MediaIntegrityError
+from ..filters import Filter
+from ..media_cache import MediaCacheWriter
+from ..models import Base64Field, BaseModel, DateTimeField, RelatedModelField
 from ..results import MonitorResult, Result
 
 
@@ -75,15 +84,43 @@ class MessageMetaclass(CamelCaseMeta):
     Message metaclass. It will build message model according to type.
     """
 
-    __message_classes__: Dict[str, Type['BaseMessage']] = {}
+    #: Message classes by type. Each class is registered using both type enum and its raw value.
+    __message_classes__: Dict[Union[MessageTypes, str], Type['BaseMessage']] = {}
 
     def __init__(cls, name, bases, classdict):
         super(MessageMetaclass, cls).__init__(name, bases, classdict)
 
         try:
-            cls.__message_classes__[cls.__default_data__['type']] = cls
+            message_type = cls.__default_data__['type']
         except KeyError:
-            pass
+            return
+
+        cls.__message_classes__[message_type] = cls
+        cls.__message_classes__[message_type.value] = cls
+
+    def get_message_class(cls, message_type: Union[MessageTypes, str]) -> Type['BaseMessage']:
+        """
+        Get message class for a message type.
+
+        :param message_type: Message type (enum or raw value).
+        :return: Message class. If there is no message class for given type, current class is returned.
+        """
+        return cls.__message_classes__.get(message_type, cls)
+
+    def resolve_model_class(cls, data) -> Type['BaseMessage']:
+        """
+        Get message class for message data.
+
+        :param data: Message data.
+        :return: Message class.
+        """
+        if 'type' in cls.__default_data__:
+            return cls
+
+        try:
+            return cls.get_message_class(data['type'])
+        except (TypeError, KeyError):
+            raise RuntimeError('Message with no type')
 
     def __call__(cls, data=None, *args, **kwargs):
         if 'type' in cls.__default_data__:
@@ -97,13 +134,10 @@ class MessageMetaclass(CamelCaseMeta):
             except KeyError:
                 raise RuntimeError('Message with no type')
 
-        try:
-            return cls.__message_classes__[t](data=data, *args, **kwargs)
-        except KeyError:
-            try:
-                return cls.__message_classes__[MessageTypes(t)](data=data, *args, **kwargs)
-            except KeyError:
-                return super(MessageMetaclass, cls).__call__(data=data, *args, **kwargs)
+        message_class = cls.get_message_class(t)
+        if message_class is cls:
+            return super(MessageMetaclass, cls).__call__(data=data, *args, **kwargs)
+        return message_class(data=data, *args, **kwargs)
 
 
 class BaseMessage(BaseModel, metaclass=MessageMetaclass):
@@ -156,9 +190,14 @@ class BaseMessage(BaseModel, metaclass=MessageMetaclass):
     Sender's contact identifier.
     """
 
-    sender_obj = ModelField(model_class=Contact)
+    sender_obj = RelatedModelField(model_class=Contact, id_field='sender_id', kind='contacts')
     """
-    Sender's contact object.
+    Sender's contact object. On normalized payloads it is shared between messages.
+    """
+
+    sender_id = StringIdField()
+    """
+    Sender's contact identifier. It is only set on normalized payloads.
     """
 
     self = StringIdField(default='in')
@@ -196,9 +235,14 @@ class BaseMessage(BaseModel, metaclass=MessageMetaclass):
     List of links of message.
     """
 
-    chat = ModelField(model_class=Chat)
+    chat = RelatedModelField(model_class=Chat, id_field='chat_id', kind='chats')
     """
-    Chat object where message was sent.
+    Chat object where message was sent. On normalized payloads it is shared between messages.
+    """
+
+    chat_id = StringIdField()
+    """
+    Chat identifier. It is only set on normalized payloads.
     """
 
     is_group_msg = BooleanField(default=False)
@@ -555,6 +599,40 @@ CRYPT_KEYS = {MessageTypes.DOCUMENT: '576861747341707020446f63756d656e74204b6579
               MessageTypes.AUDIO: '576861747341707020417564696f204b657973',
               MessageTypes.STICKER: '576861747341707020496d616765204b657973'}
 
+#: Media MAC size in bytes. It is appended to encrypted media files.
+MEDIA_MAC_SIZE = 10
+
+#: Default chunk size in bytes used to download media streams.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+#: Maximum number of derived media keys kept in memory.
+MEDIA_KEYS_CACHE_SIZE = 256
+
+#: Default number of media files downloaded at same time.
+DEFAULT_DOWNLOAD_CONCURRENCY = 4
+
+#: Default number of retries when a media file download fails.
+DEFAULT_DOWNLOAD_RETRIES = 2
+
+#: Default delay in seconds before first retry. It is doubled on each retry.
+DEFAULT_DOWNLOAD_BACKOFF = 0.5
+
+#: HTTP statuses which are not server errors but could be retried.
+RETRY_STATUSES = frozenset([408, 429])
+
+
+def is_retryable_error(ex: Exception) -> bool:
+    """
+    Check whether a download error could be retried: network errors, timeouts, server
+    errors (5xx) and throttling. Other HTTP errors (4xx) are not retried.
+
+    :param ex: Download error.
+    :return: Whether download could be retried.
+    """
+    if isinstance(ex, ClientResponseError):
+        return ex.status >= 500 or ex.status in RETRY_STATUSES
+    return isinstance(ex, (ClientError, TimeoutError))
+
 
 class MessageAck(BaseModel):
     """
@@ -652,14 +730,11 @@ class MessageInfoManager(BaseModelManager[MessageInfo]):
     def __init__(self, driver: BaseWhalesongDriver, manager_path: str = ''):
         super(MessageInfoManager, self).__init__(driver=driver, manager_path=manager_path)
 
-        self.add_submanager('delivery', MessageAckCollectionManager(driver=self._driver,
-                                                                    manager_path=self._build_command('delivery')))
+        self.add_lazy_submanager('delivery', MessageAckCollectionManager, 'delivery')
 
-        self.add_submanager('read', MessageAckCollectionManager(driver=self._driver,
-                                                                manager_path=self._build_command('read')))
+        self.add_lazy_submanager('read', MessageAckCollectionManager, 'read')
 
-        self.add_submanager('played', MessageAckCollectionManager(driver=self._driver,
-                                                                  manager_path=self._build_command('played')))
+        self.add_lazy_submanager('played', MessageAckCollectionManager, 'played')
 
 
 class MessageManager(BaseModelManager[BaseMessage]):
@@ -675,11 +750,13 @@ class MessageManager(BaseModelManager[BaseMessage]):
 
     MODEL_CLASS = BaseMessage
 
+    # Message type is needed to choose message class.
+    REQUIRED_FIELDS = ('id', 'type')
+
     def __init__(self, driver: BaseWhalesongDriver, manager_path: str = ''):
         super(MessageManager, self).__init__(driver=driver, manager_path=manager_path)
 
-        self.add_submanager('info', MessageInfoManager(driver=self._driver,
-                                                       manager_path=self._build_command('msgInfo')))
+        self.add_lazy_submanager('info', MessageInfoManager, 'msgInfo')
 
     async def download_media(self) -> BytesIO:
         """
@@ -691,6 +768,32 @@ class MessageManager(BaseModelManager[BaseMessage]):
 
         return await download_media(self._driver, cast(MediaMixin, model))
 
+    async def download_media_stream(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Download message's attached media file as a stream of decrypted chunks.
+        Media file is never loaded in memory at once.
+
+        :param chunk_size: Download chunk size in bytes.
+        :return: Async iterator of decrypted chunks.
+        """
+        model = await self.get_model()
+
+        async for chunk in download_media_stream(self._driver, cast(MediaMixin, model), chunk_size=chunk_size):
+            yield chunk
+
+    async def download_media_to_file(self, file: Union[str, PathLike, BinaryIO],
+                                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Download message's attached media file and write it decrypted to a file.
+
+        :param file: File path or binary writable stream.
+        :param chunk_size: Download chunk size in bytes.
+        :return: Written bytes.
+        """
+        model = await self.get_model()
+
+        return await download_media_to_file(self._driver, cast(MediaMixin, model), file, chunk_size=chunk_size)
+
     def fetch_info(self) -> Result[MessageInfo]:
         """
         Fetch message information. It must fetch before try to use message information manager.
@@ -741,14 +844,22 @@ class MessageCollectionManager(BaseCollectionManager[MessageManager]):
 
     MODEL_MANAGER_CLASS = MessageManager
 
-    def monitor_new(self) -> MonitorResult[BaseMessage]:
+    def monitor_new(self, fast: bool = False,
+                    fields: Optional[Iterable[str]] = None,
+                    where: Optional[Filter] = None) -> MonitorResult[BaseMessage]:
         """
         Monitor new messages.
 
+        :param fast: Whether messages must be mapped to fast models. They are not instances of message
+                     classes.
+        :param fields: Fields to get. By default, all fields. Messages will be partial.
+        :param where: Messages filter (see :mod:`whalesong.filters`).
         :return: New message monitor.
         """
 
-        return self._execute_command('monitorNew', result_class=self.get_monitor_result_class())
+        return self._execute_command('monitorNew',
+                                     self.build_read_params(fields, where),
+                                     result_class=self.get_monitor_result_class(fast=fast))
 
     async def download_media(self, model: MediaMixin) -> BytesIO:
         """
@@ -759,6 +870,106 @@ class MessageCollectionManager(BaseCollectionManager[MessageManager]):
         """
         return await download_media(self._driver, model)
 
+    def download_media_stream(self, model: MediaMixin,
+                              chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Download message's attached media file as a stream of decrypted chunks.
+        Media file is never loaded in memory at once.
+
+        :param model: MediaMixin
+        :param chunk_size: Download chunk size in bytes.
+        :return: Async iterator of decrypted chunks.
+        """
+        return download_media_stream(self._driver, model, chunk_size=chunk_size)
+
+    async def download_media_to_file(self, model: MediaMixin, file: Union[str, PathLike, BinaryIO],
+                                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Download message's attached media file and write it decrypted to a file.
+
+        :param model: MediaMixin
+        :param file: File path or binary writable stream.
+        :param chunk_size: Download chunk size in bytes.
+        :return: Written bytes.
+        """
+        return await download_media_to_file(self._driver, model, file, chunk_size=chunk_size)
+
+    def download_media_many(self, models: Iterable[MediaMixin],
+                            concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+                            retries: int = DEFAULT_DOWNLOAD_RETRIES,
+                            backoff: float = DEFAULT_DOWNLOAD_BACKOFF) \
+            -> AsyncIterator[Tuple[str, Union[BytesIO, Exception]]]:
+        """
+        Download many messages' attached media files concurrently.
+
+        .. code-block:: python
+
+            async for msg_id, media in whalesong.messages.download_media_many(messages, concurrency=8):
+                if isinstance(media, Exception):
+                    continue
+                ...
+
+        :param models: Iterable of MediaMixin.
+        :param concurrency: Maximum number of media files downloaded at same time.
+        :param retries: Maximum number of retries on network errors, server errors (5xx) and throttling (429).
+        :param backoff: Delay in seconds before first retry. It is doubled on each retry.
+        :return: Async iterator of tuples of message identifier and media stream (or error), in completion order.
+        """
+        return download_media_many(self._driver, models,
+                                   concurrency=concurrency,
+                                   retries=retries,
+                                   backoff=backoff)
+
+
+@lru_cache(maxsize=MEDIA_KEYS_CACHE_SIZE)
+def derive_media_keys(media_key: str, media_type: MessageTypes) -> Tuple[bytes, bytes, bytes]:
+    """
+    Derive media keys. Results are cached, so keys are not derived again when
+    same media is downloaded again.
+
+    :param media_key: Base64 media key.
+    :param media_type: Message type.
+    :return: Initialization vector, cipher key and MAC key.
+    """
+    try:
+        key = b64decode(media_key)
+    except Exception:
+        key = b64decode(media_key + ('=' * (len(media_key) % 3)))
+
+    try:
+        derivative = HKDFv3().deriveSecrets(key,
+                                            binascii.unhexlify(CRYPT_KEYS[media_type]),
+                                            112)
+    except KeyError:
+        raise ValueError('Invalid message type')
+
+    iv, cipher_key, mac_key = ByteUtil.split(derivative, 16, 32, 32)
+    return iv, cipher_key, mac_key
+
+
+def get_media_keys(model: MediaMixin) -> Tuple[bytes, bytes, bytes]:
+    """
+    Derive media keys using key on message object.
+
+    :param model: MediaMixin
+    :return: Initialization vector, cipher key and MAC key.
+    """
+    return derive_media_keys(model.media_key, model.type)
+
+
+def decrypt_media(iv: bytes, cipher_key: bytes, data: bytes) -> bytes:
+    """
+    Decrypt a whole media file. It is a module level function, so it could be run in a process pool.
+
+    :param iv: Initialization vector.
+    :param cipher_key: Cipher key.
+    :param data: Encrypted data (without MAC).
+    :return: Decrypted data.
+    """
+    decryptor = Cipher(algorithms.AES(cipher_key), modes.CBC(iv), backend=default_backend()).decryptor()
+    unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+    return unpadder.update(decryptor.update(data) + decryptor.finalize()) + unpadder.finalize()
+
 
 async def download_media(driver: BaseWhalesongDriver, model: MediaMixin) -> BytesIO:
     """
@@ -768,25 +979,220 @@ async def download_media(driver: BaseWhalesongDriver, model: MediaMixin) -> Byte
     :param model: MediaMixin
     :return: Media stream.
     """
+    cache = driver.media_cache if model.filehash else None
+
+    if cache is not None:
+        data = await driver.loop.run_in_executor(None, cache.get, model.filehash)
+        if data is not None:
+            return BytesIO(data)
+
     file_data = (await driver.download_file(model.client_url)).read()
 
-    try:
-        media_key = b64decode(model.media_key)
-    except Exception:
-        media_key = b64decode(model.media_key + ('=' * (len(model.media_key) % 3)))
+    iv, cipher_key, _ = get_media_keys(model)
+
+    data = await driver.loop.run_in_executor(driver.crypto_executor,
+                                             decrypt_media,
+                                             iv,
+                                             cipher_key,
+                                             file_data[:-MEDIA_MAC_SIZE])
+
+    if cache is not None:
+        await driver.loop.run_in_executor(None, cache.put, model.filehash, data)
+
+    return BytesIO(data)
+
+
+async def download_media_stream(driver: BaseWhalesongDriver, model: MediaMixin,
+                                chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Download message's attached media file as a stream of decrypted chunks. Media file is decrypted
+    while it is downloaded and its MAC is checked at the end.
+
+    :param driver:
+    :param model: MediaMixin
+    :param chunk_size: Download chunk size in bytes.
+    :return: Async iterator of decrypted chunks.
+    :raises MediaIntegrityError: When media MAC does not match.
+    """
+    cache = driver.media_cache if model.filehash else None
+    cache_writer = None
+
+    if cache is not None:
+        f = await driver.loop.run_in_executor(None, cache.open, model.filehash)
+        if f is not None:
+            try:
+                while True:
+                    chunk = await driver.loop.run_in_executor(None, f.read, chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                f.close()
+            return
+
+        cache_writer = await driver.loop.run_in_executor(None, cache.open_writer, model.filehash)
 
     try:
-        derivative = HKDFv3().deriveSecrets(media_key,
-                                            binascii.unhexlify(CRYPT_KEYS[model.type]),
-                                            112)
-    except KeyError:
-        raise ValueError('Invalid message type')
+        async for chunk in _download_media_stream(driver, model, chunk_size, cache_writer):
+            yield chunk
+    except BaseException:
+        if cache_writer is not None:
+            cache_writer.abort()
+        raise
+
+    if cache_writer is not None:
+        await driver.loop.run_in_executor(None, cache_writer.commit)
+
+
+async def _download_media_stream(driver: BaseWhalesongDriver, model: MediaMixin,
+                                 chunk_size: int, cache_writer: Optional[MediaCacheWriter]) -> AsyncIterator[bytes]:
+    iv, cipher_key, mac_key = get_media_keys(model)
+
+    decryptor = Cipher(algorithms.AES(cipher_key), modes.CBC(iv), backend=default_backend()).decryptor()
+    unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+    mac = hmac.HMAC(mac_key, hashes.SHA256(), backend=default_backend())
+    mac.update(iv)
+
+    def decrypt_chunk(data: bytes) -> bytes:
+        mac.update(data)
+        decrypted = unpadder.update(decryptor.update(data))
+        if cache_writer is not None:
+            cache_writer.write(decrypted)
+        return decrypted
+
+    # Cipher contexts could not be sent to other processes, so chunks are always decrypted in threads.
+    executor = driver.crypto_executor
+    if isinstance(executor, ProcessPoolExecutor):
+        executor = None
+
+    # Last bytes are the MAC, so they must be held back until the end of file.
+    tail = b''
+    async for chunk in driver.download_file_stream(model.client_url, chunk_size=chunk_size):
+        data = tail + chunk
+        tail = data[-MEDIA_MAC_SIZE:]
+        data = data[:-MEDIA_MAC_SIZE]
+
+        if not data:
+            continue
 
-    parts = ByteUtil.split(derivative, 16, 32)
-    iv = parts[0]
-    cipher_key = parts[1]
-    e_file = file_data[:-10]
+        decrypted = await driver.loop.run_in_executor(executor, decrypt_chunk, data)
+        if decrypted:
+            yield decrypted
 
-    cr_obj = Cipher(algorithms.AES(cipher_key), modes.CBC(iv), backend=default_backend())
-    decryptor = cr_obj.decryptor()
-    return BytesIO(decryptor.update(e_file) + decryptor.finalize())
+    if not constant_time.bytes_eq(mac.finalize()[:MEDIA_MAC_SIZE], tail):
+        raise MediaIntegrityError('Media file MAC does not match')
+
+    decrypted = unpadder.update(decryptor.finalize()) + unpadder.finalize()
+    if cache_writer is not None:
+        cache_writer.write(decrypted)
+    yield decrypted
+
+
+async def download_media_to_file(driver: BaseWhalesongDriver, model: MediaMixin,
+                                 file: Union[str, PathLike, BinaryIO],
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Download message's attached media file and write it decrypted to a file. If a file path is
+    used and download fails, file will be removed. Files are written out of event loop.
+
+    :param driver:
+    :param model: MediaMixin
+    :param file: File path or binary writable stream.
+    :param chunk_size: Download chunk size in bytes.
+    :return: Written bytes.
+    """
+    if not hasattr(file, 'write'):
+        try:
+            f = await driver.loop.run_in_executor(None, open, file, 'wb')
+            try:
+                return await download_media_to_file(driver, model, f, chunk_size=chunk_size)
+            finally:
+                await driver.loop.run_in_executor(None, f.close)
+        except BaseException:
+            try:
+                await driver.loop.run_in_executor(None, remove, file)
+            except FileNotFoundError:
+                pass
+            raise
+
+    size = 0
+    async for chunk in download_media_stream(driver, model, chunk_size=chunk_size):
+        if isinstance(file, BytesIO):
+            # In memory streams do not block.
+            file.write(chunk)
+        else:
+            await driver.loop.run_in_executor(None, file.write, chunk)
+        size += len(chunk)
+
+    return size
+
+
+async def download_media_many(driver: BaseWhalesongDriver, models: Iterable[MediaMixin],
+                              concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+                              retries: int = DEFAULT_DOWNLOAD_RETRIES,
+                              backoff: float = DEFAULT_DOWNLOAD_BACKOFF) \
+        -> AsyncIterator[Tuple[str, Union[BytesIO, Exception]]]:
+    """
+    Download many messages' attached media files using a bounded set of workers. Downloads
+    failed by network errors, server errors (5xx) or throttling (429) are retried with exponential
+    backoff. Other errors (like 4xx HTTP statuses) are not retried.
+
+    :param driver:
+    :param models: Iterable of MediaMixin.
+    :param concurrency: Maximum number of media files downloaded at same time.
+    :param retries: Maximum number of retries on network errors, server errors (5xx) and throttling (429).
+    :param backoff: Delay in seconds before first retry. It is doubled on each retry.
+    :return: Async iterator of tuples of message identifier and media stream (or error), in completion order.
+    """
+    if concurrency < 1:
+        raise ValueError('Concurrency must be greater than 0')
+
+    models = iter(models)
+    # Bounded queue, so workers wait for consumer instead of keeping all files in memory.
+    results = Queue(maxsize=concurrency)
+
+    async def download(model: MediaMixin) -> BytesIO:
+        attempt = 0
+        while True:
+            try:
+                return await download_media(driver, model)
+            except Exception as ex:
+                if attempt >= retries or not is_retryable_error(ex):
+                    raise
+                await sleep(backoff * (2 ** attempt))
+                attempt += 1
+
+    stopped = False
+
+    async def worker():
+        try:
+            for model in models:
+                try:
+                    result = await download(model)
+                except Exception as ex:
+                    result = ex
+
+                await results.put((model.id, result))
+        finally:
+            if not stopped:
+                await results.put(None)
+
+    workers = [ensure_future(worker(), loop=driver.loop) for _ in range(concurrency)]
+
+    try:
+        running = len(workers)
+        while running:
+            item = await results.get()
+            if item is None:
+                running -= 1
+                continue
+            yield item
+
+        # Errors iterating over models must not be lost.
+        for w in workers:
+            if w.exception() is not None:
+                raise w.exception()
+    finally:
+        stopped = True
+        for w in workers:
+            w.cancel()
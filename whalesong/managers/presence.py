@@ -70,10 +70,8 @@ class PresenceManager(BaseModelManager[Presence]):
     def __init__(self, driver: BaseWhalesongDriver, manager_path: str = ''):
         super(PresenceManager, self).__init__(driver=driver, manager_path=manager_path)
 
-        self.add_submanager('chat_states', ChatStateCollectionManager(driver=self._driver,
-                                                                      manager_path=self._build_command('chatStates')))
-        self.add_submanager('chat_state', ChatStateManager(driver=self._driver,
-                                                           manager_path=self._build_command('chatState')))
+        self.add_lazy_submanager('chat_states', ChatStateCollectionManager, 'chatStates')
+        self.add_lazy_submanager('chat_state', ChatStateManager, 'chatState')
 
     def subscribe(self) -> Result[Presence]:
         return self._execute_command('subscribe',
@@ -54,11 +54,9 @@ class StatusV3Manager(BaseModelManager[StatusV3]):
         super(StatusV3Manager, self).__init__(driver=driver, manager_path=manager_path)
 
         from .message import MessageCollectionManager
-        self.add_submanager('msgs', MessageCollectionManager(driver=self._driver,
-                                                             manager_path=self._build_command('msgs')))
+        self.add_lazy_submanager('msgs', MessageCollectionManager, 'msgs')
 
-        self.add_submanager('contact', ContactManager(driver=self._driver,
-                                                      manager_path=self._build_command('contact')))
+        self.add_lazy_submanager('contact', ContactManager, 'contact')
 
     def send_read_status(self, message_id: str) -> Result[bool]:
         """
@@ -91,10 +91,7 @@ class StickerPackManager(BaseModelManager[StickerPack]):
     def __init__(self, driver: BaseWhalesongDriver, manager_path: str = ''):
         super(StickerPackManager, self).__init__(driver=driver, manager_path=manager_path)
 
-        self.add_submanager('stickers', StickerCollectionManager(
-            driver=self._driver,
-            manager_path=self._build_command('stickers')
-        ))
+        self.add_lazy_submanager('stickers', StickerCollectionManager, 'stickers')
 
 
 class StickerPackCollectionManager(BaseCollectionManager[StickerPackManager]):
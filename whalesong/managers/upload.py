@@ -0,0 +1,125 @@
+from asyncio import get_event_loop
+from base64 import b64encode
+from collections import deque
+from io import BytesIO
+from os import PathLike
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Deque, Union
+
+from . import BaseManager
+from ..results import Result
+
+#: Default upload chunk size in bytes.
+DEFAULT_CHUNK_SIZE = 512 * 1024
+
+#: Default number of chunks sent to browser without waiting for their responses.
+DEFAULT_UPLOAD_WINDOW = 4
+
+MediaSource = Union[str, PathLike, BinaryIO, AsyncIterable[bytes]]
+
+
+async def iter_chunks(media_data: MediaSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Iterate over a media source in chunks. Files and streams are read out of event loop.
+
+    :param media_data: File path, binary stream (:class:`io.BytesIO`, file object...) or async iterator of bytes.
+    :param chunk_size: Maximum chunk size in bytes.
+    :return: Async iterator of chunks.
+    """
+    loop = get_event_loop()
+
+    if isinstance(media_data, (str, PathLike)):
+        f = await loop.run_in_executor(None, open, media_data, 'rb')
+        try:
+            async for chunk in iter_chunks(f, chunk_size):
+                yield chunk
+        finally:
+            await loop.run_in_executor(None, f.close)
+        return
+
+    if isinstance(media_data, BytesIO):
+        # In memory streams do not block.
+        while True:
+            chunk = media_data.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        return
+
+    if hasattr(media_data, 'read'):
+        while True:
+            chunk = await loop.run_in_executor(None, media_data.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        return
+
+    async for data in media_data:
+        for idx in range(0, len(data), chunk_size):
+            yield data[idx:idx + chunk_size]
+
+
+class UploadManager(BaseManager):
+    """
+    Upload manager. It allows to send large files to browser in chunks, so
+    memory usage does not depend on file size and other commands are not blocked.
+    """
+
+    def create_upload(self) -> Result[str]:
+        """
+        Create a new upload on browser.
+
+        :return: Upload identifier.
+        """
+        return self._execute_command('createUpload')
+
+    def append_chunk(self, upload_id: str, data: bytes) -> Result[int]:
+        """
+        Append a chunk of data to an upload.
+
+        :param upload_id: Upload identifier.
+        :param data: Chunk data.
+        :return: Current upload size.
+        """
+        return self._execute_command('appendChunk', {'uploadId': upload_id,
+                                                     'data': b64encode(data).decode()})
+
+    def cancel_upload(self, upload_id: str) -> Result[None]:
+        """
+        Cancel an upload. Data already sent will be released.
+
+        :param upload_id: Upload identifier.
+        """
+        return self._execute_command('cancelUpload', {'uploadId': upload_id})
+
+    async def upload(self, media_data: MediaSource, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     window: int = DEFAULT_UPLOAD_WINDOW) -> str:
+        """
+        Upload a file to browser in chunks. Chunks are appended in order, and up to `window`
+        chunks are sent without waiting for their responses.
+
+        :param media_data: File path, binary stream (:class:`io.BytesIO`, file object...) or async iterator of bytes.
+        :param chunk_size: Chunk size in bytes.
+        :param window: Maximum number of chunks waiting for response.
+        :return: Upload identifier. It could be used to send media to a chat.
+        """
+        if window < 1:
+            raise ValueError('Window must be greater than 0')
+
+        upload_id = await self.create_upload()
+        pending: Deque[Result[int]] = deque()
+
+        try:
+            async for chunk in iter_chunks(media_data, chunk_size):
+                pending.append(self.append_chunk(upload_id, chunk))
+                if len(pending) >= window:
+                    await pending.popleft()
+
+            while pending:
+                await pending.popleft()
+        except BaseException:
+            for result in pending:
+                result.cancel()
+            self.cancel_upload(upload_id)
+            raise
+
+        return upload_id
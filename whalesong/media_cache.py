@@ -0,0 +1,306 @@
+"""
+Content-addressed media cache. Decrypted media files are stored on disk using their file hash
+(SHA256 of decrypted content) as key, so same media is never downloaded and decrypted twice.
+
+.. code-block:: python
+
+    from whalesong import Whalesong
+    from whalesong.media_cache import MediaCache
+
+    whalesong = Whalesong(profile='/path/to/profile',
+                          media_cache=MediaCache('/path/to/cache', max_size=1024 * 1024 * 1024))
+
+Cache operations are blocking, so they should be run in an executor.
+"""
+import json
+from base64 import b64decode
+from binascii import hexlify
+from collections import OrderedDict
+from hashlib import sha256
+from logging import getLogger
+from os import fdopen, listdir, makedirs, path, remove, replace
+from tempfile import mkstemp
+from threading import Lock
+from typing import BinaryIO, Optional
+
+#: Default maximum cache size in bytes.
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+INDEX_FILENAME = 'index.json'
+TEMP_SUFFIX = '.tmp'
+
+logger = getLogger('whalesong.media_cache')
+
+
+class MediaCacheWriter:
+    """
+    Media cache writer. Data is written to a temporary file, which is moved to cache
+    only when it is committed and its content matches file hash.
+    """
+
+    def __init__(self, cache: 'MediaCache', key: str, file: BinaryIO, temp_path: str):
+        self._cache = cache
+        self._file = file
+        self._hash = sha256()
+
+        self.key = key
+        self.temp_path = temp_path
+        self.size = 0
+
+    def write(self, data: bytes):
+        """
+        Write data to cache file.
+
+        :param data: Decrypted data.
+        """
+        self._file.write(data)
+        self._hash.update(data)
+        self.size += len(data)
+
+    def commit(self) -> bool:
+        """
+        Store written data in cache.
+
+        :return: Whether data was stored.
+        """
+        self._file.close()
+
+        if self._hash.hexdigest() != self.key:
+            logger.warning('Media content does not match file hash {}'.format(self.key))
+            self.abort()
+            return False
+
+        try:
+            return self._cache._commit(self.key, self.temp_path, self.size)
+        except OSError as ex:
+            logger.warning(ex)
+            self.abort()
+            return False
+
+    def abort(self):
+        """
+        Discard written data.
+        """
+        self._file.close()
+
+        try:
+            remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class MediaCache:
+    """
+    Size bounded on-disk media cache. When cache is full, least recently used files are evicted.
+
+    It is thread safe, but a cache directory must not be shared by different processes.
+
+    :param path: Cache directory. It will be created if it does not exist.
+    :param max_size: Maximum cache size in bytes.
+    """
+
+    def __init__(self, path: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+
+        #: Current cache size in bytes.
+        self.size = 0
+
+        self._lock = Lock()
+        self._index: 'OrderedDict[str, int]' = OrderedDict()
+
+        makedirs(self.path, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def get_key(filehash: str) -> str:
+        """
+        Get cache key from a file hash.
+
+        :param filehash: Base64 file hash.
+        :return: Hexadecimal file hash.
+        """
+        try:
+            return hexlify(b64decode(filehash)).decode()
+        except Exception:
+            return hexlify(b64decode(filehash + ('=' * (len(filehash) % 3)))).decode()
+
+    def _get_file_path(self, key: str) -> str:
+        return path.join(self.path, key)
+
+    def __contains__(self, filehash: str) -> bool:
+        return self.get_key(filehash) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def open(self, filehash: str) -> Optional[BinaryIO]:
+        """
+        Open a cached media file.
+
+        :param filehash: Base64 file hash.
+        :return: Binary stream or None if media is not cached.
+        """
+        key = self.get_key(filehash)
+
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+
+        try:
+            return open(self._get_file_path(key), 'rb')
+        except FileNotFoundError:
+            with self._lock:
+                self.size -= self._index.pop(key, 0)
+            return None
+
+    def get(self, filehash: str) -> Optional[bytes]:
+        """
+        Get cached media data.
+
+        :param filehash: Base64 file hash.
+        :return: Media data or None if media is not cached.
+        """
+        f = self.open(filehash)
+
+        if f is None:
+            return None
+
+        with f:
+            return f.read()
+
+    def open_writer(self, filehash: str) -> Optional[MediaCacheWriter]:
+        """
+        Open a writer in order to store media in cache by chunks.
+
+        :param filehash: Base64 file hash.
+        :return: Media cache writer or None if it could not be created.
+        """
+        key = self.get_key(filehash)
+
+        try:
+            fd, temp_path = mkstemp(suffix=TEMP_SUFFIX, dir=self.path)
+        except OSError as ex:
+            logger.warning(ex)
+            return None
+
+        return MediaCacheWriter(self, key, fdopen(fd, 'wb'), temp_path)
+
+    def put(self, filehash: str, data: bytes) -> bool:
+        """
+        Store media data in cache.
+
+        :param filehash: Base64 file hash.
+        :param data: Decrypted media data.
+        :return: Whether data was stored.
+        """
+        writer = self.open_writer(filehash)
+
+        if writer is None:
+            return False
+
+        try:
+            writer.write(data)
+        except OSError as ex:
+            logger.warning(ex)
+            writer.abort()
+            return False
+
+        return writer.commit()
+
+    def remove(self, filehash: str):
+        """
+        Remove media from cache.
+
+        :param filehash: Base64 file hash.
+        """
+        key = self.get_key(filehash)
+
+        with self._lock:
+            if key not in self._index:
+                return
+
+            self.size -= self._index.pop(key)
+            self._remove_file(key)
+            self._save_index()
+
+    def clear(self):
+        """
+        Remove all media from cache.
+        """
+        with self._lock:
+            for key in self._index:
+                self._remove_file(key)
+
+            self._index.clear()
+            self.size = 0
+            self._save_index()
+
+    def _commit(self, key: str, temp_path: str, size: int) -> bool:
+        if size > self.max_size:
+            remove(temp_path)
+            return False
+
+        with self._lock:
+            replace(temp_path, self._get_file_path(key))
+
+            self.size -= self._index.pop(key, 0)
+            self._index[key] = size
+            self.size += size
+
+            self._evict()
+            self._save_index()
+
+        return True
+
+    def _evict(self):
+        while self.size > self.max_size:
+            key, size = self._index.popitem(last=False)
+            self.size -= size
+            self._remove_file(key)
+
+    def _remove_file(self, key: str):
+        try:
+            remove(self._get_file_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _save_index(self):
+        fd, temp_path = mkstemp(suffix=TEMP_SUFFIX, dir=self.path)
+        with fdopen(fd, 'w') as f:
+            json.dump([[key, size] for key, size in self._index.items()], f)
+
+        replace(temp_path, path.join(self.path, INDEX_FILENAME))
+
+    def _load_index(self):
+        entries = []
+        try:
+            with open(path.join(self.path, INDEX_FILENAME)) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            logger.warning('Invalid media cache index. It will be rebuilt.')
+
+        files = {}
+        for filename in listdir(self.path):
+            filepath = path.join(self.path, filename)
+            if filename.endswith(TEMP_SUFFIX):
+                # Leftover of an interrupted write
+                remove(filepath)
+            elif filename != INDEX_FILENAME:
+                files[filename] = path.getsize(filepath)
+
+        # Indexed files keep their order, files not indexed are considered the least recently used ones.
+        indexed = {key for key, _ in entries}
+        for key in files:
+            if key not in indexed:
+                self._index[key] = files[key]
+        for key, _ in entries:
+            if key in files:
+                self._index[key] = files[key]
+
+        self.size = sum(self._index.values())
+        self._evict()
+        self._save_index()
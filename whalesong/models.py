@@ -1,7 +1,9 @@
 from base64 import b64decode, b64encode
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Type
 
 from dirty_models import BaseModel as DirtyBaseModel, StringIdField
-from dirty_models.fields import BytesField, DateTimeField as BaseDateTimeField
+from dirty_models.fields import BytesField, DateTimeField as BaseDateTimeField, ModelField
 from dirty_models.models import CamelCaseMeta
 from dirty_models.utils import JSONEncoder as BaseJSONEncoder, ModelFormatterIter as BaseModelFormatterIter
 
@@ -32,6 +34,82 @@ class DateTimeField(BaseDateTimeField):
                 raise ex
 
 
+class RelatedModelField(ModelField):
+    """
+    Model field which is referenced by identifier on normalized payloads. When field is not set,
+    related object bound to model is returned (see :func:`bind_related`).
+
+    Related objects are shared between models, so they are not stored on model data: they are
+    not parented, exported nor dirty-tracked by models which reference them.
+    """
+
+    def __init__(self, id_field: str, kind: str, **kwargs):
+        """
+        :param id_field: Name of field with related object identifier.
+        :param kind: Related object kind.
+        """
+        super(RelatedModelField, self).__init__(**kwargs)
+        self.id_field = id_field
+        self.kind = kind
+
+    def __get__(self, obj, cls=None):
+        value = super(RelatedModelField, self).__get__(obj, cls)
+        if value is None:
+            return get_bound_related(obj, self.name)
+        return value
+
+
+@lru_cache(maxsize=None)
+def get_related_fields(model_class: Type[DirtyBaseModel]) -> Dict[str, RelatedModelField]:
+    """
+    Get related fields of a model class.
+
+    :param model_class: Model class.
+    :return: Related fields by name.
+    """
+    fields = {}
+    for name in model_class.get_structure():
+        field = model_class.get_field_obj(name)
+        if isinstance(field, RelatedModelField):
+            fields[name] = field
+    return fields
+
+
+def bind_related(obj: Any, get_related: Callable[[str, str], Optional[DirtyBaseModel]]):
+    """
+    Bind related objects to a model (or a fast model) using identifiers of its related fields.
+
+    :param obj: Model or fast model. Any other object is ignored.
+    :param get_related: Function to get a related object by kind and identifier.
+    """
+    model_class = getattr(obj, '__model_class__', None) or type(obj)
+    if not issubclass(model_class, DirtyBaseModel):
+        return
+
+    related = {}
+    for name, field in get_related_fields(model_class).items():
+        related_id = getattr(obj, field.id_field)
+        if related_id is not None:
+            related[name] = get_related(field.kind, related_id)
+
+    if related:
+        obj._related = related
+
+
+def get_bound_related(obj: Any, name: str) -> Optional[DirtyBaseModel]:
+    """
+    Get a related object bound to a model (or a fast model).
+
+    :param obj: Model or fast model.
+    :param name: Related field name.
+    :return: Related object or `None`.
+    """
+    try:
+        return obj._related.get(name)
+    except AttributeError:
+        return None
+
+
 class BaseModel(DirtyBaseModel, metaclass=CamelCaseMeta):
     """
     Base model which convert field name from underscore-style to camelCase-style automatically.
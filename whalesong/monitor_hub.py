@@ -0,0 +1,141 @@
+"""
+Shared monitor subscriptions. Identical monitors (same command and parameters) are registered only once
+on browser, and their events are sent to every local monitor. So, many subsystems could listen to same
+events without mapping and sending them more than once.
+
+It is enabled using ``share_monitors`` option:
+
+.. code-block:: python
+
+    whalesong = Whalesong(profile='/path/to/profile', share_monitors=True)
+
+    new_messages_1 = whalesong.messages.monitor_new()
+    new_messages_2 = whalesong.messages.monitor_new()  # It uses same browser monitor
+
+    await whalesong.stop_monitor(new_messages_1)  # Browser monitor keeps running
+
+.. warning::
+
+    Events produced before a monitor subscribes are not replayed. For example, a field monitor sends
+    field's current value only to the first subscriber.
+"""
+import json
+from asyncio import ensure_future
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from .results import MonitorResult, Result, SharedMonitorResult
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .driver import BaseWhalesongDriver
+
+
+def is_monitor_result_class(result_class: Any) -> bool:
+    """
+    Check whether a result class builds monitor results.
+
+    :param result_class: Result class or partial result class.
+    :return: Whether it is a monitor result class.
+    """
+    while isinstance(result_class, partial):
+        result_class = result_class.func
+
+    # Parametrized generics (like ``MonitorResult[Message]``) are not classes.
+    result_class = getattr(result_class, '__origin__', None) or result_class
+
+    try:
+        return issubclass(result_class, MonitorResult)
+    except TypeError:
+        return False
+
+
+class MonitorHub:
+    """
+    Monitor subscriptions hub. It keeps one browser monitor for each command and parameters,
+    and it stops it when its last subscriber is stopped.
+
+    :param driver: Whalesong driver.
+    """
+
+    def __init__(self, driver: 'BaseWhalesongDriver'):
+        self._driver = driver
+        self._monitors: Dict[str, SharedMonitorResult] = {}
+        self._subscriptions: Dict[str, SharedMonitorResult] = {}
+
+    @staticmethod
+    def get_key(command: str, params: Optional[Dict[str, Any]]) -> str:
+        """
+        Get subscription key.
+
+        :param command: Command path.
+        :param params: Command parameters.
+        :return: Subscription key.
+        """
+        return '{}:{}'.format(command, json.dumps(params or {}, sort_keys=True))
+
+    def __len__(self) -> int:
+        return len(self._monitors)
+
+    def __contains__(self, monitor: MonitorResult) -> bool:
+        return monitor.result_id in self._subscriptions
+
+    def _remove_monitor(self, shared: SharedMonitorResult, key: str):
+        if self._monitors.get(key) is shared:
+            del self._monitors[key]
+
+        for subscriber in shared.subscribers:
+            self._subscriptions.pop(subscriber.result_id, None)
+
+    def subscribe(self, command: str, params: Optional[Dict[str, Any]], result_class: Any) -> MonitorResult:
+        """
+        Subscribe to a monitor. Browser monitor is only registered if there is no other
+        subscriber with same command and parameters.
+
+        :param command: Monitor command path.
+        :param params: Command parameters.
+        :param result_class: Monitor result class.
+        :return: Local monitor.
+        """
+        key = self.get_key(command, params)
+
+        try:
+            shared = self._monitors[key]
+        except KeyError:
+            shared = self._driver.execute_command(command, params,
+                                                  result_class=partial(SharedMonitorResult,
+                                                                       on_finish=partial(self._remove_monitor,
+                                                                                         key=key)))
+            self._monitors[key] = shared
+
+        monitor = result_class(self._driver.result_manager.get_next_id())
+        # Holding browser monitor would hold it for every subscriber.
+        self._driver.result_manager.configure_result(monitor, flow_control=False)
+        self._driver.configure_related(monitor)
+        shared.subscribers.append(monitor)
+        self._subscriptions[monitor.result_id] = shared
+        return monitor
+
+    def unsubscribe(self, monitor: MonitorResult) -> Result[bool]:
+        """
+        Stop a local monitor. Browser monitor is stopped when there are no more subscribers.
+
+        :param monitor: Local monitor.
+        :return: Whether monitor was stopped.
+        """
+        shared = self._subscriptions.pop(monitor.result_id)
+
+        if len(shared.subscribers) == 1:
+            # New subscribers must not join a stopping monitor.
+            for key in [k for k, v in self._monitors.items() if v is shared]:
+                del self._monitors[key]
+
+            # Last subscriber gets monitor end from browser.
+            return self._driver.execute_command('stopMonitor', {'monitorId': shared.result_id})
+
+        shared.subscribers.remove(monitor)
+
+        ensure_future(monitor.set_error_result({'name': 'StopMonitor'}))
+
+        result = Result(monitor.result_id)
+        result.set_result(True)
+        return result
@@ -0,0 +1,198 @@
+"""
+Whalesong pool. It allows to run many WhatsApp accounts in one process.
+
+All sessions share the same HTTP connector (so connections to media servers are reused),
+the same media decryption executor and, optionally, the same media cache. Browser launches
+are staggered and limited, so starting many accounts does not exhaust CPU.
+
+.. code-block:: python
+
+    from whalesong.pool import WhalesongPool
+
+    pool = WhalesongPool(headless=True, max_concurrent_launches=2)
+
+    await asyncio.gather(*[pool.add_account(account_id, profile=path.join(PROFILES_DIR, account_id))
+                           for account_id in ACCOUNTS])
+
+    async for chat in pool['account_1'].chats.get_items():
+        ...
+
+    await pool.stop()
+
+"""
+from asyncio import AbstractEventLoop, Semaphore, gather, get_event_loop, sleep
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Type
+
+from aiohttp import BaseConnector, TCPConnector
+
+from . import Whalesong
+from .driver import DEFAULT_CONNECTOR_OPTIONS, BaseWhalesongDriver
+
+#: Default maximum number of browsers launching at same time.
+DEFAULT_MAX_CONCURRENT_LAUNCHES = 2
+
+#: Default minimum delay in seconds between two browser launches.
+DEFAULT_START_DELAY = 2.0
+
+
+class WhalesongPool:
+    """
+    Whalesong session pool. Each session is identified by an account identifier.
+
+    :param driver_class: Driver class used to build sessions' drivers. By default, Firefox driver.
+    :param max_concurrent_launches: Maximum number of browsers launching at same time.
+    :param start_delay: Minimum delay in seconds between two browser launches.
+    :param http_connector: HTTP connector shared by all sessions. If it is not set, a new one is built
+                           using `connector_options` and it will be closed when pool stops.
+    :param connector_options: Options used to build HTTP connector. See :class:`aiohttp.TCPConnector`.
+    :param crypto_executor: Executor shared by all sessions to decrypt media files. If it is not set,
+                            a thread pool is built and it will be shut down when pool stops.
+    :param loop: Event loop.
+    :param kwargs: Default options for every session. See :class:`~whalesong.Whalesong`.
+    """
+
+    def __init__(self, *,
+                 driver_class: Optional[Type[BaseWhalesongDriver]] = None,
+                 max_concurrent_launches: int = DEFAULT_MAX_CONCURRENT_LAUNCHES,
+                 start_delay: float = DEFAULT_START_DELAY,
+                 http_connector: Optional[BaseConnector] = None,
+                 connector_options: Optional[Dict[str, Any]] = None,
+                 crypto_executor: Optional[Executor] = None,
+                 loop: Optional[AbstractEventLoop] = None,
+                 **kwargs):
+        self.loop = loop or get_event_loop()
+        self.driver_class = driver_class
+        self.start_delay = start_delay
+        self.session_options = kwargs
+
+        self.connector_options = DEFAULT_CONNECTOR_OPTIONS.copy()
+        self.connector_options.update(connector_options or {})
+
+        self._http_connector = http_connector
+        self._own_http_connector = http_connector is None
+
+        self._crypto_executor = crypto_executor
+        self._own_crypto_executor = crypto_executor is None
+
+        self._launch_semaphore = Semaphore(max_concurrent_launches)
+        self._next_launch = 0
+
+        self._sessions: Dict[str, Whalesong] = {}
+
+    @property
+    def http_connector(self) -> BaseConnector:
+        """
+        HTTP connector shared by all sessions.
+        """
+        if self._http_connector is None:
+            self._http_connector = TCPConnector(**self.connector_options)
+
+        return self._http_connector
+
+    @property
+    def crypto_executor(self) -> Executor:
+        """
+        Media decryption executor shared by all sessions.
+        """
+        if self._crypto_executor is None:
+            self._crypto_executor = ThreadPoolExecutor()
+
+        return self._crypto_executor
+
+    def __getitem__(self, account_id: str) -> Whalesong:
+        return self._sessions[account_id]
+
+    def __contains__(self, account_id: str) -> bool:
+        return account_id in self._sessions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sessions)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _build_session(self, profile: Optional[str], **kwargs) -> Whalesong:
+        options = self.session_options.copy()
+        options.update(kwargs)
+        options.update({'autostart': False,
+                        'http_connector': self.http_connector,
+                        'crypto_executor': self.crypto_executor,
+                        'loop': self.loop})
+
+        if self.driver_class is not None and 'driver' not in options:
+            options['driver'] = self.driver_class(profile=profile, **options)
+
+        return Whalesong(profile=profile, **options)
+
+    async def _launch(self, session: Whalesong):
+        async with self._launch_semaphore:
+            now = self.loop.time()
+            delay = max(self._next_launch - now, 0)
+            self._next_launch = now + delay + self.start_delay
+
+            if delay:
+                await sleep(delay)
+
+            await session.start()
+
+    async def add_account(self, account_id: str, profile: Optional[str] = None, *,
+                          start: bool = True, **kwargs) -> Whalesong:
+        """
+        Add an account to pool.
+
+        :param account_id: Account identifier. It is used to get session from pool.
+        :param profile: Path to browser profile.
+        :param start: Whether session must be started. Sessions are started when a launch slot is free.
+        :param kwargs: Session options. They override pool default options.
+        :return: Whalesong session.
+        """
+        if account_id in self._sessions:
+            raise KeyError('Account {} already exists'.format(account_id))
+
+        session = self._build_session(profile, **kwargs)
+        self._sessions[account_id] = session
+
+        if start:
+            try:
+                await self._launch(session)
+            except BaseException:
+                del self._sessions[account_id]
+                await gather(session.stop(), return_exceptions=True)
+                raise
+
+        return session
+
+    async def start_account(self, account_id: str):
+        """
+        Start an account's session. It waits for a free launch slot.
+
+        :param account_id: Account identifier.
+        """
+        await self._launch(self._sessions[account_id])
+
+    async def remove_account(self, account_id: str):
+        """
+        Stop an account's session and remove it from pool.
+
+        :param account_id: Account identifier.
+        """
+        session = self._sessions.pop(account_id)
+        await session.stop()
+
+    async def stop(self):
+        """
+        Stop all sessions and release shared resources.
+        """
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+
+        await gather(*[session.stop() for session in sessions], return_exceptions=True)
+
+        if self._own_http_connector and self._http_connector is not None:
+            await self._http_connector.close()
+            self._http_connector = None
+
+        if self._own_crypto_executor and self._crypto_executor is not None:
+            self._crypto_executor.shutdown(wait=False)
+            self._crypto_executor = None
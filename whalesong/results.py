@@ -1,7 +1,9 @@
-from asyncio import Future, Queue, ensure_future
+from asyncio import Event, Future, Queue, QueueEmpty, TimeoutError, ensure_future, gather, get_event_loop, wait_for
+from collections import deque
+from enum import Enum
 from logging import getLogger
-from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Type, TypeVar, Union, \
-    cast
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Generic, Hashable, List, \
+    Optional, Tuple, Type, TypeVar, Union, cast
 
 from abc import ABC, abstractmethod
 
@@ -11,6 +13,14 @@ logger = getLogger(__name__)
 
 T = TypeVar('T')
 
+#: Default number of workers of a monitor callback.
+DEFAULT_CALLBACK_CONCURRENCY = 8
+
+#: Maximum number of pending events by callback worker queue.
+CALLBACK_QUEUE_SIZE = 100
+
+_STOP_WORKER = object()
+
 
 class BaseResultMixin(ABC, Awaitable[T]):
     """
@@ -98,15 +108,158 @@ class Result(BaseResultMixin[T], Future):
         self.set_exception(ex)
 
 
+class OverflowPolicy(Enum):
+    """
+    What to do when a result queue is full.
+    """
+
+    #: Keep items and ask browser to hold next results until queue is half empty. Browser holds a bounded
+    #: number of results (oldest ones are dropped), and it releases them when execution finishes. Results
+    #: sent before browser holds them are kept up to twice maximum size, then oldest pending item is dropped.
+    #: If result could not hold browser results (like shared monitors), oldest pending item is dropped.
+    #: Dropped items (on browser or not) are counted on ``dropped`` attribute.
+    #:
+    #: .. warning::
+    #:
+    #:     Iterators which send every item at once (like ``get_items``) are not held by browser, so
+    #:     items over twice maximum size are dropped. Use pagination (``limit``) in order to bound them.
+    BLOCK = 'block'
+
+    #: Drop oldest pending item.
+    DROP_OLDEST = 'drop_oldest'
+
+    #: Drop new item.
+    DROP_NEWEST = 'drop_newest'
+
+    #: Replace pending item with same key (see ``coalesce_key``). If there is no pending item
+    #: with same key and queue is full, oldest pending item is dropped.
+    COALESCE = 'coalesce'
+
+
+_NO_KEY = object()
+
+
 class BasePartialResult(BaseResultMixin[T], AsyncIterable[T]):
 
     def __init__(self, result_id: str, *, fn_map: Optional[Callable[[dict], T]] = None):
         super(BasePartialResult, self).__init__(result_id, fn_map=fn_map)
-        self._queue: Queue = Queue()
+        self._queue: Deque[List[Any]] = deque()
+        self._ready: Event = Event()
+        self._pending_keys: Dict[Any, List[Any]] = {}
+        self._paused = False
         self._fut: Future = Future()
 
+        #: Maximum number of pending items. Zero means unbounded.
+        self.max_size = 0
+
+        #: What to do when queue is full.
+        self.overflow_policy = OverflowPolicy.BLOCK
+
+        #: Function to get key of items to coalesce.
+        self.coalesce_key: Optional[Callable[[T], Hashable]] = None
+
+        #: Function to hold or release browser results: ``flow_control(result_id, paused)``.
+        self.flow_control: Optional[Callable[[str, bool], Any]] = None
+
+        #: Number of dropped items.
+        self.dropped = 0
+
+        #: Number of items replaced by a newer one with same key.
+        self.coalesced = 0
+
+    def configure(self, *,
+                  max_size: Optional[int] = None,
+                  overflow_policy: Optional[OverflowPolicy] = None,
+                  coalesce_key: Optional[Callable[[T], Hashable]] = None) -> 'BasePartialResult[T]':
+        """
+        Configure pending items queue.
+
+        .. code-block:: python3
+
+            monitor = whalesong.messages.monitor_field('ack')
+            monitor.configure(max_size=1000,
+                              overflow_policy=OverflowPolicy.COALESCE,
+                              coalesce_key=lambda evt: evt['itemId'])
+
+        :param max_size: Maximum number of pending items. Zero means unbounded.
+        :param overflow_policy: What to do when queue is full. With :attr:`OverflowPolicy.BLOCK`, browser holds
+                                results when it is possible (shared monitors never hold results).
+        :param coalesce_key: Function to get item key. It is required by :attr:`OverflowPolicy.COALESCE`.
+        :return: Same result.
+        """
+        if max_size is not None:
+            self.max_size = max_size
+        if overflow_policy is not None:
+            self.overflow_policy = overflow_policy
+        if coalesce_key is not None:
+            self.coalesce_key = coalesce_key
+
+        if self.overflow_policy == OverflowPolicy.COALESCE and self.coalesce_key is None:
+            raise ValueError('Coalesce overflow policy needs a coalesce key function')
+
+        return self
+
+    def _set_paused(self, paused: bool):
+        if self._paused == paused or self.flow_control is None:
+            return
+
+        self._paused = paused
+        self.flow_control(self.result_id, paused)
+
+    def _drop_oldest(self):
+        entry = self._queue.popleft()
+        self._forget_key(entry)
+        self.dropped += 1
+
+    def _forget_key(self, entry: List[Any]):
+        if entry[0] is not _NO_KEY and self._pending_keys.get(entry[0]) is entry:
+            del self._pending_keys[entry[0]]
+
     async def _set_result(self, data: Union[T, Exception]):
-        await self._queue.put(data)
+        key = _NO_KEY
+
+        # Exceptions finish iteration, so they are never dropped.
+        if not isinstance(data, BaseException):
+            if self.overflow_policy == OverflowPolicy.COALESCE:
+                key = self.coalesce_key(data)
+                try:
+                    self._pending_keys[key][1] = data
+                    self.coalesced += 1
+                    return
+                except KeyError:
+                    pass
+
+            if self.max_size and len(self._queue) >= self.max_size:
+                if self.overflow_policy == OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                elif self.overflow_policy == OverflowPolicy.BLOCK and self.flow_control is not None:
+                    self._set_paused(True)
+                    # Results sent before browser holds them are kept up to a limit.
+                    if len(self._queue) >= self.max_size * 2:
+                        self._drop_oldest()
+                else:
+                    self._drop_oldest()
+
+        entry = [key, data]
+        self._queue.append(entry)
+        if key is not _NO_KEY:
+            self._pending_keys[key] = entry
+
+        self._ready.set()
+
+    async def _get(self) -> Union[T, Exception]:
+        while not self._queue:
+            self._ready.clear()
+            await self._ready.wait()
+
+        entry = self._queue.popleft()
+        self._forget_key(entry)
+
+        if self._paused and len(self._queue) <= self.max_size // 2:
+            self._set_paused(False)
+
+        return entry[1]
 
     async def _set_exception(self, ex: Exception):
         await self._set_result(ex)
@@ -117,7 +270,22 @@ class BasePartialResult(BaseResultMixin[T], AsyncIterable[T]):
     def __await__(self):
         return self._fut.__await__()
 
+    def resume(self):
+        """
+        Ask browser to release held results, if any.
+        """
+        self._set_paused(False)
+
+    def add_dropped(self, count: int):
+        """
+        Count items dropped by browser while they were held.
+
+        :param count: Number of dropped items.
+        """
+        self.dropped += count
+
     def cancel(self):
+        self.resume()
         ensure_future(self._set_exception(StopAsyncIteration()))
 
 
@@ -130,7 +298,7 @@ class BaseIteratorResult(BasePartialResult[T]):
         return self
 
     async def __anext__(self) -> T:
-        item = await self._queue.get()
+        item = await self._get()
 
         if isinstance(item, Exception):
             self._fut.set_exception(item)
@@ -156,9 +324,153 @@ class IteratorResult(BaseIteratorResult[T]):
 
     """
 
+    def __init__(self, result_id: str, *, fn_map: Optional[Callable[[dict], T]] = None):
+        super(IteratorResult, self).__init__(result_id, fn_map=fn_map)
+
+        #: Opaque cursor to get next page. It is set when iteration finishes, if there are
+        #: more items (see :meth:`~whalesong.managers.BaseCollectionManager.get_items`).
+        self.cursor: Optional[str] = None
+
     def map(self, data) -> T:
         return super(IteratorResult, self).map(data['item'])
 
+    async def set_partial_result(self, data: dict):
+        if 'item' not in data and 'cursor' in data:
+            self.cursor = data['cursor']
+            return
+
+        await super(IteratorResult, self).set_partial_result(data)
+
+
+class CallbackWorkers(Generic[T]):
+    """
+    Run a monitor callback on a fixed set of workers, instead of a task per event.
+
+    Errors raised by callback are logged and they do not stop workers.
+
+    :param fn: Callback coroutine function. It receives an event or, if batching is enabled, a list of events.
+    :param concurrency: Number of workers.
+    :param key: Function to get event key. Events with same key are handled by same worker in order.
+    :param batch_size: Maximum number of events by batch.
+    :param batch_timeout: Maximum time in seconds to wait for a batch to be filled, since its first event.
+                          When batching, each worker fills its own batch.
+    """
+
+    def __init__(self, fn: Callable[[Any], Awaitable[Any]], *,
+                 concurrency: int = DEFAULT_CALLBACK_CONCURRENCY,
+                 key: Optional[Callable[[T], Hashable]] = None,
+                 batch_size: Optional[int] = None,
+                 batch_timeout: Optional[float] = None):
+        if concurrency < 1:
+            raise ValueError('Concurrency must be greater than zero')
+
+        self.fn = fn
+        self.concurrency = concurrency
+        self.key = key
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+
+        #: Number of callback errors.
+        self.errors = 0
+
+        self._queues: List[Queue] = []
+        self._workers: List[Future] = []
+
+    def _start(self):
+        # Ordered events need a queue per worker.
+        queue_count = self.concurrency if self.key is not None else 1
+        self._queues = [Queue(CALLBACK_QUEUE_SIZE) for _ in range(queue_count)]
+        self._workers = [ensure_future(self._work(self._queues[i % queue_count]))
+                         for i in range(self.concurrency)]
+
+    async def submit(self, evt: T):
+        """
+        Send an event to workers. It waits while workers' queue is full.
+
+        :param evt: Monitor event.
+        """
+        if not self._workers:
+            self._start()
+
+        if self.key is None:
+            queue = self._queues[0]
+        else:
+            queue = self._queues[hash(self.key(evt)) % len(self._queues)]
+
+        await queue.put(evt)
+
+    async def close(self):
+        """
+        Stop workers when pending events are handled.
+        """
+        if not self._workers:
+            return
+
+        for i in range(self.concurrency):
+            await self._queues[i % len(self._queues)].put(_STOP_WORKER)
+
+        await gather(*self._workers)
+        self._workers = []
+
+    async def _call(self, arg: Any):
+        try:
+            await self.fn(arg)
+        except Exception:
+            self.errors += 1
+            logger.exception('Error on monitor callback')
+
+    async def _get_batch(self, queue: Queue, first: T) -> Tuple[List[T], bool]:
+        loop = get_event_loop()
+        batch = [first]
+        deadline = None if self.batch_timeout is None else loop.time() + self.batch_timeout
+
+        while self.batch_size is None or len(batch) < self.batch_size:
+            # Pending events are taken at once, so workers do not split bursts.
+            try:
+                item = queue.get_nowait()
+            except QueueEmpty:
+                pass
+            else:
+                if item is _STOP_WORKER:
+                    return batch, True
+                batch.append(item)
+                continue
+
+            if deadline is None:
+                item = await queue.get()
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await wait_for(queue.get(), timeout)
+                except TimeoutError:
+                    break
+
+            if item is _STOP_WORKER:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    async def _work(self, queue: Queue):
+        batching = self.batch_size is not None or self.batch_timeout is not None
+
+        while True:
+            item = await queue.get()
+            if item is _STOP_WORKER:
+                return
+
+            if not batching:
+                await self._call(item)
+                continue
+
+            batch, stop = await self._get_batch(queue, item)
+            await self._call(batch)
+
+            if stop:
+                return
+
 
 class MonitorResult(BaseIteratorResult[T]):
     """
@@ -181,19 +493,49 @@ class MonitorResult(BaseIteratorResult[T]):
     def __init__(self, result_id: str, *, fn_map: Optional[Callable[[dict], T]] = None):
         super(MonitorResult, self).__init__(result_id, fn_map=fn_map)
 
-        self._callbacks: List[Callable[[Any], Awaitable[Any]]] = []
+        self._callbacks: List[CallbackWorkers[T]] = []
 
-    def add_callback(self, fn: Callable[[T], Awaitable[Any]]):
+    def add_callback(self, fn: Callable[[Any], Awaitable[Any]], *,
+                     concurrency: int = DEFAULT_CALLBACK_CONCURRENCY,
+                     key: Optional[Callable[[T], Hashable]] = None,
+                     batch_size: Optional[int] = None,
+                     batch_timeout: Optional[float] = None) -> CallbackWorkers[T]:
         """
-        Add a callback to be called each time object or field change.
-
-        :param fn: Callback function
+        Add a callback to be called each time object or field change. Callback runs on a fixed set of
+        workers, which are stopped when monitor finishes.
+
+        .. code-block:: python3
+
+            monitor = whalesong.messages.monitor_field('ack')
+            # Acks of a message are handled in order, and 100 acks are stored at once
+            monitor.add_callback(store_acks, concurrency=4, key=lambda evt: evt['itemId'],
+                                 batch_size=100, batch_timeout=0.5)
+            monitor.start_monitor()
+
+        :param fn: Callback function. It receives an event or, if batching is enabled, a list of events.
+        :param concurrency: Maximum number of concurrent callback calls.
+        :param key: Function to get event key. Events with same key are handled in order.
+        :param batch_size: Maximum number of events by call.
+        :param batch_timeout: Maximum time in seconds to wait for a batch to be filled.
+        :return: Callback workers.
         """
-        self._callbacks.append(fn)
+        workers = CallbackWorkers(fn,
+                                  concurrency=concurrency,
+                                  key=key,
+                                  batch_size=batch_size,
+                                  batch_timeout=batch_timeout)
+        self._callbacks.append(workers)
+        return workers
 
     async def __anext__(self) -> T:
-        evt: T = await super(MonitorResult, self).__anext__()
-        [ensure_future(cb(evt)) for cb in self._callbacks]
+        try:
+            evt: T = await super(MonitorResult, self).__anext__()
+        except BaseException:
+            await gather(*[cb.close() for cb in self._callbacks])
+            raise
+
+        for cb in self._callbacks:
+            await cb.submit(evt)
         return evt
 
     async def _monitor(self):
@@ -207,17 +549,98 @@ class MonitorResult(BaseIteratorResult[T]):
         ensure_future(self._monitor())
 
 
+class SharedMonitorResult(BaseResultMixin[Any]):
+    """
+    Browser monitor shared by many local monitors (see :class:`~whalesong.monitor_hub.MonitorHub`).
+    Events are sent to every subscriber, which maps them using its own mapping function.
+    """
+
+    def __init__(self, result_id: str, *, on_finish: Optional[Callable[['SharedMonitorResult'], Any]] = None):
+        super(SharedMonitorResult, self).__init__(result_id)
+        self._fut: Future = Future()
+        self._on_finish = on_finish
+
+        #: Local monitors.
+        self.subscribers: List[MonitorResult] = []
+
+    def __await__(self):
+        return self._fut.__await__()
+
+    def _finish(self):
+        if self._on_finish is not None:
+            self._on_finish(self)
+        if not self._fut.done():
+            self._fut.set_result(None)
+
+    async def set_partial_result(self, data: dict):
+        for subscriber in list(self.subscribers):
+            await subscriber.set_partial_result(data)
+
+    async def set_final_result(self, data: dict):
+        self._finish()
+        for subscriber in list(self.subscribers):
+            await subscriber.set_final_result(data)
+
+    async def set_error_result(self, data: dict):
+        self._finish()
+        for subscriber in list(self.subscribers):
+            await subscriber.set_error_result(data)
+
+    async def _set_result(self, data: Any):  # pragma: no cover
+        pass
+
+    async def _set_exception(self, ex: Exception):  # pragma: no cover
+        pass
+
+    def cancel(self):
+        self._finish()
+        for subscriber in list(self.subscribers):
+            subscriber.cancel()
+
+
 TypeResult = TypeVar('TypeResult', Result, IteratorResult, MonitorResult)
 UnionResultType = Union[Type[Result], Type[IteratorResult], Type[MonitorResult]]
 UnionResult = Union[Result, IteratorResult, MonitorResult]
 
 
 class ResultManager:
+    """
+    Pending results manager.
+
+    :param max_size: Default maximum number of pending items of partial results. Zero means unbounded.
+    :param overflow_policy: Default overflow policy of partial results.
+    :param flow_control: Function to hold or release browser results: ``flow_control(result_id, paused)``.
+    """
+
+    def __init__(self, *,
+                 max_size: int = 0,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                 flow_control: Optional[Callable[[str, bool], Any]] = None):
+        if overflow_policy == OverflowPolicy.COALESCE:
+            raise ValueError('Coalesce overflow policy needs a coalesce key function, so it must be set by result')
 
-    def __init__(self):
         self._pendant: Dict[str, UnionResult] = {}
         self._next_id = 1
 
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.flow_control = flow_control
+
+    def configure_result(self, result: Any, flow_control: bool = True):
+        """
+        Apply default queue options to a partial result.
+
+        :param result: Result.
+        :param flow_control: Whether result could hold browser results.
+        """
+        if not isinstance(result, BasePartialResult):
+            return
+
+        result.max_size = self.max_size
+        result.overflow_policy = self.overflow_policy
+        if flow_control:
+            result.flow_control = self.flow_control
+
     def get_next_id(self) -> str:
         v = self._next_id
         self._next_id += 1
@@ -241,6 +664,7 @@ class ResultManager:
     def request_result(self, result_class: Type[TypeResult]) -> TypeResult:
         result_id = self.get_next_id()
         result = result_class(result_id)
+        self.configure_result(result)
         self._pendant[result_id] = result
         ensure_future(self._autoclean_result(result))
         return result
@@ -281,8 +705,14 @@ class ResultManager:
         except (KeyError, AttributeError):
             pass
 
+    def add_dropped(self, result_id: str, count: int):
+        try:
+            cast(BasePartialResult, self._pendant[result_id]).add_dropped(count)
+        except (KeyError, AttributeError):
+            pass
+
     def get_iterators(self) -> List[IteratorResult]:
         return [it for it in self._pendant.values() if isinstance(it, IteratorResult)]
 
-    def get_monitors(self) -> List[MonitorResult]:
-        return [it for it in self._pendant.values() if isinstance(it, MonitorResult)]
+    def get_monitors(self) -> List[Union[MonitorResult, SharedMonitorResult]]:
+        return [it for it in self._pendant.values() if isinstance(it, (MonitorResult, SharedMonitorResult))]